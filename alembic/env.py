@@ -6,7 +6,7 @@ from sqlalchemy import pool
 from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from app.database import Base
-from app.models import User, Board, FeedbackItem, Vote
+from app.models import User, Board, FeedbackItem, Vote, Voter, ArchivedFeedbackItem, ArchivedVote, Job, JobSchedule, Webhook, WebhookDelivery
 
 config = context.config
 if config.config_file_name is not None:
@@ -0,0 +1,199 @@
+"""Compact vote storage: integer vote ids and a voters dictionary
+
+Revision ID: 5b7e2f9c41d3
+Revises: 80bf1dc38320
+Create Date: 2026-10-19 02:05:41.118203
+"""
+from typing import Sequence, Union
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e2f9c41d3'
+down_revision: Union[str, None] = '80bf1dc38320'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+
+
+# Frozen copies of app.models.voter.encode_identity/decode_identity
+def _encode(voter_id: str) -> bytes:
+    try:
+        parsed = uuid.UUID(voter_id)
+    except ValueError:
+        return b"\x02" + voter_id.encode()
+    if str(parsed) != voter_id:
+        return b"\x02" + voter_id.encode()
+    return b"\x01" + parsed.bytes
+
+
+def _decode(identity: bytes) -> str:
+    if identity[:1] == b"\x01":
+        return str(uuid.UUID(bytes=identity[1:]))
+    return identity[1:].decode()
+
+
+def _batches(bind, query: str, last: int = 0):
+    """Walk a table by rowid in bounded batches so memory stays flat on large tables."""
+    while True:
+        rows = bind.execute(sa.text(query), {"last": last, "limit": BATCH_SIZE}).all()
+        if not rows:
+            return
+        yield rows
+        last = rows[-1][0]
+
+
+def _compact(bind, source: str, target: str, after: int = 0) -> int:
+    """Copy rows with rowid > `after`; returns the last rowid copied."""
+    last = after
+    for rows in _batches(
+        bind,
+        f"SELECT rowid, feedback_item_id, voter_id, voter_email, created_at FROM {source} "
+        "WHERE rowid > :last ORDER BY rowid LIMIT :limit",
+        after,
+    ):
+        last = rows[-1][0]
+        identities = {}
+        for row in rows:
+            identity = _encode(row.voter_id)
+            if row.voter_email or identity not in identities:
+                identities[identity] = row.voter_email
+        bind.execute(
+            sa.text(
+                "INSERT INTO voters (identity, email, created_at) VALUES (:identity, :email, CURRENT_TIMESTAMP) "
+                "ON CONFLICT (identity) DO UPDATE SET email = coalesce(excluded.email, voters.email)"
+            ),
+            [{"identity": identity, "email": email} for identity, email in identities.items()],
+        )
+        keys = dict(
+            bind.execute(
+                sa.select(sa.column("identity"), sa.column("id"))
+                .select_from(sa.table("voters"))
+                .where(sa.column("identity").in_(list(identities)))
+            ).all()
+        )
+        bind.execute(
+            sa.text(
+                f"INSERT INTO {target} (feedback_item_id, voter_key, created_at) "
+                "VALUES (:feedback_item_id, :voter_key, :created_at)"
+            ),
+            [
+                {
+                    "feedback_item_id": row.feedback_item_id,
+                    "voter_key": keys[_encode(row.voter_id)],
+                    "created_at": row.created_at,
+                }
+                for row in rows
+            ],
+        )
+    return last
+
+
+def _expand(bind, source: str, target: str) -> None:
+    for rows in _batches(
+        bind,
+        f"SELECT {source}.id, feedback_item_id, identity, email, {source}.created_at FROM {source} "
+        f"JOIN voters ON voters.id = {source}.voter_key WHERE {source}.id > :last ORDER BY {source}.id LIMIT :limit",
+    ):
+        bind.execute(
+            sa.text(
+                f"INSERT INTO {target} (id, feedback_item_id, voter_id, voter_email, created_at) "
+                "VALUES (:id, :feedback_item_id, :voter_id, :voter_email, :created_at)"
+            ),
+            [
+                {
+                    "id": str(uuid.uuid4()),
+                    "feedback_item_id": row.feedback_item_id,
+                    "voter_id": _decode(row.identity),
+                    "voter_email": row.email,
+                    "created_at": row.created_at,
+                }
+                for row in rows
+            ],
+        )
+
+
+def upgrade() -> None:
+    op.create_table('voters',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('identity', sa.LargeBinary(length=256), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('identity')
+    )
+    # Build the compact tables next to the old ones, copy in batches, then swap
+    op.create_table('votes_compact',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('feedback_item_id', sa.String(length=36), nullable=False),
+    sa.Column('voter_key', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['feedback_item_id'], ['feedback_items.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['voter_key'], ['voters.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('feedback_item_id', 'voter_key', name='uq_vote_per_voter')
+    )
+    op.create_table('votes_archive_compact',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('feedback_item_id', sa.String(length=36), nullable=False),
+    sa.Column('voter_key', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    bind = op.get_bind()
+    copied = {'votes': _compact(bind, 'votes', 'votes_compact')}
+    copied['votes_archive'] = _compact(bind, 'votes_archive', 'votes_archive_compact')
+
+    # Catch-up pass just before the swap, in the same transaction: votes appended
+    # while the batches ran get copied too. Votes removed meanwhile are not
+    # noticed; on SQLite none can be, since the copy holds the write lock from
+    # its first batch (see "Database Migrations" in the README)
+    _compact(bind, 'votes', 'votes_compact', copied['votes'])
+    _compact(bind, 'votes_archive', 'votes_archive_compact', copied['votes_archive'])
+
+    op.drop_index(op.f('ix_votes_voter_id'), table_name='votes')
+    op.drop_table('votes')
+    op.rename_table('votes_compact', 'votes')
+    op.create_index('ix_votes_voter_key', 'votes', ['voter_key'], unique=False)
+    op.drop_index(op.f('ix_votes_archive_feedback_item_id'), table_name='votes_archive')
+    op.drop_table('votes_archive')
+    op.rename_table('votes_archive_compact', 'votes_archive')
+    op.create_index(op.f('ix_votes_archive_feedback_item_id'), 'votes_archive', ['feedback_item_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.create_table('votes_wide',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('feedback_item_id', sa.String(length=36), nullable=False),
+    sa.Column('voter_id', sa.String(length=255), nullable=False),
+    sa.Column('voter_email', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['feedback_item_id'], ['feedback_items.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('feedback_item_id', 'voter_id', name='uq_vote_per_voter')
+    )
+    op.create_table('votes_archive_wide',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('feedback_item_id', sa.String(length=36), nullable=False),
+    sa.Column('voter_id', sa.String(length=255), nullable=False),
+    sa.Column('voter_email', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    bind = op.get_bind()
+    _expand(bind, 'votes', 'votes_wide')
+    _expand(bind, 'votes_archive', 'votes_archive_wide')
+
+    op.drop_index('ix_votes_voter_key', table_name='votes')
+    op.drop_table('votes')
+    op.rename_table('votes_wide', 'votes')
+    op.create_index(op.f('ix_votes_voter_id'), 'votes', ['voter_id'], unique=False)
+    op.drop_index(op.f('ix_votes_archive_feedback_item_id'), table_name='votes_archive')
+    op.drop_table('votes_archive')
+    op.rename_table('votes_archive_wide', 'votes_archive')
+    op.create_index(op.f('ix_votes_archive_feedback_item_id'), 'votes_archive', ['feedback_item_id'], unique=False)
+    op.drop_table('voters')
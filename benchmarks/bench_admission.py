@@ -0,0 +1,110 @@
+"""Public reads during a write flood, with and without admission control.
+
+Seeds a throwaway SQLite board, then fires a burst of concurrent votes (each
+from a new voter) alongside a steady stream of widget feed and board page
+reads, all in-process. Reports read latency and how the writes fared.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_admission.py [--writers 400] [--readers 200]
+"""
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app import admission, ratelimit
+from app.admission import AdmissionController, parse_class_limits
+from app.config import get_settings
+from app.database import Base, get_db
+from app.main import app
+from app.models import Board, FeedbackItem, User
+
+settings = get_settings()
+
+
+async def seed(session_factory) -> tuple[str, list[str]]:
+    async with session_factory() as db:
+        user = User(email="bench@example.com", username="bench", hashed_password="x")
+        db.add(user)
+        await db.flush()
+        board = Board(name="Bench", slug="bench", owner_id=user.id)
+        db.add(board)
+        await db.flush()
+        items = [
+            FeedbackItem(title=f"Idea {i}", description="", board_id=board.id, author_name="Someone")
+            for i in range(50)
+        ]
+        db.add_all(items)
+        await db.commit()
+        return board.slug, [item.id for item in items]
+
+
+async def timed(coro) -> tuple[float, int]:
+    started = time.perf_counter()
+    response = await coro
+    return time.perf_counter() - started, response.status_code
+
+
+async def flood(client: AsyncClient, slug: str, item_ids: list[str], n_writers: int, n_readers: int):
+    async def vote(i: int):
+        cookies = {"voter_id": str(uuid.uuid4())}
+        return await timed(client.post(f"/b/{slug}/vote/{item_ids[i % len(item_ids)]}", cookies=cookies))
+
+    async def read(i: int):
+        await asyncio.sleep(i * 0.002)  # spread over the flood
+        path = f"/b/{slug}/widget.json" if i % 2 else f"/b/{slug}"
+        return await timed(client.get(path))
+
+    results = await asyncio.gather(*(vote(i) for i in range(n_writers)), *(read(i) for i in range(n_readers)))
+    return results[:n_writers], results[n_writers:]
+
+
+def percentile(values: list[float], q: float) -> float:
+    return statistics.quantiles(values, n=100)[q - 1] if len(values) > 1 else values[0]
+
+
+async def main(n_writers: int, n_readers: int) -> None:
+    ratelimit.ROUTE_LIMITS["vote"] = {}
+    print(f"{n_writers} concurrent votes + {n_readers} reads (widget feed and board page)\n")
+    print(f"{'admission':<12}{'read p50 ms':>12}{'read p99 ms':>12}{'reads ok':>10}"
+          f"{'votes ok':>10}{'votes 503':>11}{'vote p99 ms':>13}")
+    for label, spec in (("off", ""), ("on", settings.admission_limits)):
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+            session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            slug, item_ids = await seed(session_factory)
+
+            async def bench_db():
+                async with session_factory() as session:
+                    yield session
+                    await session.commit()
+
+            app.dependency_overrides[get_db] = bench_db
+            admission.controller = AdmissionController(parse_class_limits(spec), settings.admission_queue_timeout)
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+                await client.get(f"/b/{slug}/widget.json")  # warm the feed cache
+                writes, reads = await flood(client, slug, item_ids, n_writers, n_readers)
+            app.dependency_overrides.clear()
+            await engine.dispose()
+
+        read_times = [t for t, status in reads if status == 200]
+        vote_times = [t for t, status in writes if status == 302]
+        print(f"{label:<12}{percentile(read_times, 50) * 1000:>12.1f}{percentile(read_times, 99) * 1000:>12.1f}"
+              f"{len(read_times):>10}{len(vote_times):>10}{sum(s == 503 for _, s in writes):>11}"
+              f"{percentile(vote_times, 99) * 1000:>13.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=400)
+    parser.add_argument("--readers", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.writers, args.readers))
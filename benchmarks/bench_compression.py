@@ -0,0 +1,103 @@
+"""CPU cost vs bytes saved for each available response encoding.
+
+Renders a public board page and a JSON item list of the given size, then times
+one-shot compression per encoder and the digest lookup a cached hit costs.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_compression.py [--items 2000] [--repeat 20]
+"""
+import argparse
+import hashlib
+import json
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from jinja2 import Environment, FileSystemLoader
+
+from app.compression import ENCODERS
+from app.models.feedback import FeedbackCategory, FeedbackStatus
+from app.services.feedback import FeedbackRow
+from app.streaming import TEMPLATES_DIR
+from app.templating import register_globals
+
+
+def make_rows(n_items: int) -> list[FeedbackRow]:
+    rng = random.Random(7)
+    start = datetime(2026, 1, 1)
+    return [
+        FeedbackRow(
+            id=f"{i:08d}-0000-4000-8000-000000000000",
+            title=f"Feedback item {i}",
+            description="lorem ipsum dolor sit amet " * rng.randint(2, 10),
+            status=rng.choice(list(FeedbackStatus)),
+            category=rng.choice(list(FeedbackCategory)),
+            vote_count=rng.randint(0, 500),
+            author_name="Someone",
+            author_email=None,
+            created_at=start + timedelta(hours=i),
+        )
+        for i in range(n_items)
+    ]
+
+
+def render_board(rows: list[FeedbackRow]) -> bytes:
+    env = Environment(loader=FileSystemLoader(str(TEMPLATES_DIR)), autoescape=True)
+    register_globals(env)
+    board = SimpleNamespace(id="b", name="Bench", slug="bench", description="", accent_color="#4F46E5")
+    html = env.get_template("public/board.html").render(
+        board=board,
+        items=rows,
+        item_count=len(rows),
+        voted_items=set(),
+        statuses=FeedbackStatus,
+        categories=FeedbackCategory,
+        sort="votes",
+    )
+    return html.encode()
+
+
+def render_json(rows: list[FeedbackRow]) -> bytes:
+    return json.dumps(
+        [
+            {"id": r.id, "title": r.title, "status": r.status.value, "vote_count": r.vote_count}
+            for r in rows
+        ]
+    ).encode()
+
+
+def timed(fn, payload: bytes, repeat: int) -> tuple[float, bytes]:
+    timings = []
+    out = b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        out = fn(payload)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), out
+
+
+def main(n_items: int, repeat: int) -> None:
+    rows = make_rows(n_items)
+    digest = lambda body: hashlib.blake2b(body, digest_size=16).digest()  # noqa: E731
+    print(f"{'payload':<8}{'encoding':<10}{'bytes':>12}{'ratio':>8}{'ms':>10}{'MB/s':>10}")
+    for name, payload in (("html", render_board(rows)), ("json", render_json(rows))):
+        print(f"{name:<8}{'identity':<10}{len(payload):>12}{1.0:>8.2f}{0.0:>10.2f}{'':>10}")
+        for encoding, (compress, _) in ENCODERS.items():
+            seconds, out = timed(compress, payload, repeat)
+            throughput = len(payload) / seconds / 2**20
+            print(
+                f"{name:<8}{encoding:<10}{len(out):>12}{len(payload) / len(out):>8.2f}"
+                f"{seconds * 1000:>10.2f}{throughput:>10.1f}"
+            )
+        seconds, _ = timed(digest, payload, repeat)
+        print(f"{name:<8}{'cache hit':<10}{'':>12}{'':>8}{seconds * 1000:>10.2f}{'':>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    main(args.items, args.repeat)
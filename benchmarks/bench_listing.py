@@ -0,0 +1,88 @@
+"""Compare the ORM listing path with the projected row path on a large board.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_listing.py [--items 20000] [--repeat 5]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import Base
+from app.models import Board, FeedbackItem, User
+from app.models.feedback import FeedbackCategory, FeedbackStatus
+from app.services.feedback import get_feedback_for_board, list_feedback_rows
+
+
+async def seed(session_factory, n_items: int) -> str:
+    async with session_factory() as db:
+        user = User(email="bench@example.com", username="bench", hashed_password="x")
+        db.add(user)
+        await db.flush()
+        board = Board(name="Bench", slug="bench", owner_id=user.id)
+        db.add(board)
+        await db.flush()
+        rng = random.Random(42)
+        rows = [
+            {
+                "title": f"Feedback item {i}",
+                "description": "lorem ipsum dolor sit amet " * rng.randint(5, 80),
+                "status": rng.choice(list(FeedbackStatus)),
+                "category": rng.choice(list(FeedbackCategory)),
+                "vote_count": rng.randint(0, 500),
+                "author_name": "Someone",
+                "board_id": board.id,
+            }
+            for i in range(n_items)
+        ]
+        for start in range(0, len(rows), 5000):
+            await db.execute(insert(FeedbackItem), rows[start:start + 5000])
+        await db.commit()
+        return board.id
+
+
+async def measure(session_factory, fn, board_id: str, repeat: int) -> tuple[float, float, int]:
+    timings = []
+    peak = 0
+    count = 0
+    for _ in range(repeat):
+        async with session_factory() as db:
+            tracemalloc.start()
+            started = time.perf_counter()
+            items = await fn(db, board_id)
+            timings.append(time.perf_counter() - started)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            count = len(items)
+    return statistics.median(timings), peak, count
+
+
+async def main(n_items: int, repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        board_id = await seed(session_factory, n_items)
+
+        print(f"{n_items} items, median of {repeat} runs")
+        print(f"{'path':<12}{'latency ms':>12}{'peak MiB':>12}{'rows':>8}")
+        for name, fn in (("orm", get_feedback_for_board), ("projected", list_feedback_rows)):
+            latency, peak, count = await measure(session_factory, fn, board_id, repeat)
+            print(f"{name:<12}{latency * 1000:>12.1f}{peak / 2**20:>12.1f}{count:>8}")
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.items, args.repeat))
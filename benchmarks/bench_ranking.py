@@ -0,0 +1,123 @@
+"""Point-in-time vote counts and ranks: full log replay vs nearest snapshot plus deltas.
+
+Seeds a throwaway SQLite board whose event log holds `--events` votes spread
+over 30 days, then writes hourly ranking snapshots the way the
+snapshot-rankings job would have. Times "count and rank as of T" and a
+30-day rank history for one item, with and without the snapshots.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_ranking.py [--events 1000000] [--items 2000] [--queries 50]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import Base
+from app.models.event import BoardEvent, RankingSnapshot
+from app.services.events import ITEM_CREATED, VOTE_ADDED, VOTE_REMOVED
+from app.services.ranking import apply_event, get_item_history, get_item_standing_at, rank_items
+
+DAYS = 30
+
+
+def make_events(board_id: str, n_items: int, n_events: int, start: datetime) -> list[dict]:
+    rng = random.Random(7)
+    item_ids = [str(uuid.uuid4()) for _ in range(n_items)]
+    events = [
+        {"board_id": board_id, "item_id": item_id, "kind": ITEM_CREATED, "data": {"status": "open"}, "created_at": start}
+        for item_id in item_ids
+    ]
+    step = timedelta(days=DAYS) / n_events
+    counts = dict.fromkeys(item_ids, 0)
+    weights = [1 / (i + 1) for i in range(n_items)]  # a few popular items, a long tail
+    for n, item_id in enumerate(rng.choices(item_ids, weights, k=n_events)):
+        kind = VOTE_REMOVED if counts[item_id] and rng.random() < 0.1 else VOTE_ADDED
+        counts[item_id] += 1 if kind == VOTE_ADDED else -1
+        events.append({"board_id": board_id, "item_id": item_id, "kind": kind, "data": None,
+                       "created_at": start + step * (n + 1)})
+    return events
+
+
+def hourly_snapshots(board_id: str, events: list[dict]) -> list[dict]:
+    """What the hourly job would have stored, folded directly from the seeded events."""
+    snapshots, counts = [], {}
+    next_hour = events[0]["created_at"] + timedelta(hours=1)
+    for event_id, event in enumerate(events, start=1):
+        while event["created_at"] >= next_hour:
+            ranks = rank_items(counts)
+            snapshots.append({"board_id": board_id, "taken_at": next_hour, "last_event_id": event_id - 1,
+                              "item_ids": list(counts), "votes": list(counts.values()),
+                              "ranks": [ranks[i] for i in counts]})
+            next_hour += timedelta(hours=1)
+        apply_event(counts, argparse.Namespace(id=event_id, **event))
+    return snapshots
+
+
+def ms(values: list[float]) -> str:
+    p99 = statistics.quantiles(values, n=100)[98] if len(values) > 1 else values[0]
+    return f"{statistics.median(values) * 1000:>10.1f}{p99 * 1000:>10.1f}"
+
+
+async def time_queries(session_factory, board_id: str, item_id: str, moments: list[datetime]) -> tuple[list, list]:
+    standing, history = [], []
+    async with session_factory() as db:
+        for at in moments:
+            started = time.perf_counter()
+            await get_item_standing_at(db, board_id, item_id, at)
+            standing.append(time.perf_counter() - started)
+        for at in moments[:5]:
+            started = time.perf_counter()
+            await get_item_history(db, board_id, item_id, at - timedelta(days=DAYS), at)
+            history.append(time.perf_counter() - started)
+    return standing, history
+
+
+async def main(n_events: int, n_items: int, n_queries: int) -> None:
+    board_id = str(uuid.uuid4())
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    events = make_events(board_id, n_items, n_events, start)
+    snapshots = hourly_snapshots(board_id, events)
+    rng = random.Random(11)
+    moments = [start + timedelta(seconds=rng.uniform(3600, DAYS * 86400)) for _ in range(n_queries)]
+    item_id = events[0]["item_id"]  # the most popular
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with session_factory() as db:
+            for i in range(0, len(events), 50_000):
+                await db.execute(insert(BoardEvent), events[i : i + 50_000])
+            await db.execute(insert(RankingSnapshot), snapshots)
+            await db.commit()
+
+        print(f"{n_events:,} vote events on {n_items:,} items over {DAYS} days, {len(snapshots)} hourly snapshots\n")
+        print(f"{'':<16}{'as-of p50 ms':>12}{'p99 ms':>10}   {'30-day history (100 points) p50 ms':>34}{'p99 ms':>10}")
+        standing, history = await time_queries(session_factory, board_id, item_id, moments)
+        print(f"{'snapshots':<16}{ms(standing)}   {ms(history):>44}")
+
+        async with session_factory() as db:
+            await db.execute(delete(RankingSnapshot))
+            await db.commit()
+        standing, _ = await time_queries(session_factory, board_id, item_id, moments[:5])
+        print(f"{'log replay only':<16}{ms(standing)}")
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.events, args.items, args.queries))
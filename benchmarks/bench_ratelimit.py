@@ -0,0 +1,109 @@
+"""Cost of the rate limiter on the happy path.
+
+Times RateLimiter.hit() on its own (three buckets per request, as the vote
+route checks) across many distinct clients, then compares in-process vote
+requests against a throwaway SQLite database with limiting on and off.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_ratelimit.py [--clients 100000] [--requests 2000]
+"""
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app import ratelimit
+from app.database import Base, get_db
+from app.main import app
+from app.models import Board, FeedbackItem, User
+from app.ratelimit import Limit, RateLimiter, parse_limits
+
+GENEROUS = "ip=1000000/second, voter=1000000/second, board=1000000/second"
+
+
+def bench_hit(n_clients: int, max_keys: int) -> float:
+    limiter = RateLimiter(max_keys=max_keys)
+    limit = Limit(60, 60)
+    checks = [
+        [(("vote", "ip", f"10.0.{i // 256 % 256}.{i % 256}"), limit),
+         (("vote", "voter", f"voter-{i}"), limit),
+         (("vote", "board", "bench"), Limit(10**9, 60))]
+        for i in range(n_clients)
+    ]
+    started = time.perf_counter()
+    for request_checks in checks:
+        limiter.hit(request_checks)
+    return (time.perf_counter() - started) / n_clients
+
+
+async def seed(session_factory) -> tuple[str, str]:
+    async with session_factory() as db:
+        user = User(email="bench@example.com", username="bench", hashed_password="x")
+        db.add(user)
+        await db.flush()
+        board = Board(name="Bench", slug="bench", owner_id=user.id)
+        db.add(board)
+        await db.flush()
+        item = FeedbackItem(title="Vote on me", description="", board_id=board.id, author_name="Someone")
+        db.add(item)
+        await db.commit()
+        return board.slug, item.id
+
+
+async def bench_votes(client: AsyncClient, slug: str, item_id: str, n_requests: int) -> float:
+    timings = []
+    for _ in range(n_requests):
+        client.cookies.set("voter_id", str(uuid.uuid4()))
+        started = time.perf_counter()
+        response = await client.post(f"/b/{slug}/vote/{item_id}", follow_redirects=False)
+        timings.append(time.perf_counter() - started)
+        assert response.status_code == 302, response.status_code
+    return statistics.median(timings)
+
+
+async def main(n_clients: int, n_requests: int) -> None:
+    print(f"{'limiter.hit (3 buckets)':<36}{'ns/request':>12}")
+    for label, max_keys in (("all buckets tracked", n_clients * 3), ("LRU evicting (1/10 fit)", n_clients * 3 // 10)):
+        print(f"  {label:<34}{bench_hit(n_clients, max_keys) * 1e9:>12.0f}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        slug, item_id = await seed(session_factory)
+
+        async def bench_db():
+            async with session_factory() as session:
+                yield session
+                await session.commit()
+
+        app.dependency_overrides[get_db] = bench_db
+        results = {}
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+            for label, spec in (("off", ""), ("on", GENEROUS), ("off", ""), ("on", GENEROUS)):
+                ratelimit.ROUTE_LIMITS["vote"] = parse_limits(spec)
+                results.setdefault(label, []).append(await bench_votes(client, slug, item_id, n_requests))
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+    off, on = min(results["off"]), min(results["on"])
+    print(f"\nPOST /b/:slug/vote/:id, median of {n_requests} requests (best of 2 rounds)")
+    print(f"{'limiting':<12}{'latency ms':>12}")
+    print(f"{'off':<12}{off * 1000:>12.3f}")
+    print(f"{'on':<12}{on * 1000:>12.3f}")
+    print(f"overhead: {(on - off) * 1e6:+.1f} us ({(on - off) / off:+.1%})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.clients, args.requests))
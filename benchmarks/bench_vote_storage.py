@@ -0,0 +1,156 @@
+"""Compare the legacy vote layout (UUID keys, string voter ids) with the compact one.
+
+Reports on-disk bytes per vote (table plus indexes, after VACUUM) and the latency
+of the two lookups board pages make: "has this voter voted on this item" and
+"which of these 50 items has this voter voted on".
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_vote_storage.py [--votes 200000] [--lookups 2000]
+"""
+import argparse
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from app.models.voter import encode_identity
+
+LEGACY_SCHEMA = """
+CREATE TABLE votes (
+    id VARCHAR(36) NOT NULL PRIMARY KEY,
+    feedback_item_id VARCHAR(36) NOT NULL,
+    voter_id VARCHAR(255) NOT NULL,
+    voter_email VARCHAR(255),
+    created_at DATETIME NOT NULL,
+    CONSTRAINT uq_vote_per_voter UNIQUE (feedback_item_id, voter_id)
+);
+CREATE INDEX ix_votes_voter_id ON votes (voter_id);
+"""
+
+COMPACT_SCHEMA = """
+CREATE TABLE voters (
+    id INTEGER NOT NULL PRIMARY KEY,
+    identity BLOB NOT NULL UNIQUE,
+    email VARCHAR(255),
+    created_at DATETIME NOT NULL
+);
+CREATE TABLE votes (
+    id INTEGER NOT NULL PRIMARY KEY,
+    feedback_item_id VARCHAR(36) NOT NULL,
+    voter_key INTEGER NOT NULL,
+    created_at DATETIME NOT NULL,
+    CONSTRAINT uq_vote_per_voter UNIQUE (feedback_item_id, voter_key)
+);
+CREATE INDEX ix_votes_voter_key ON votes (voter_key);
+"""
+
+LEGACY_HAS_VOTED = "SELECT 1 FROM votes WHERE feedback_item_id = ? AND voter_id = ?"
+COMPACT_HAS_VOTED = (
+    "SELECT 1 FROM votes WHERE feedback_item_id = ? AND voter_key = (SELECT id FROM voters WHERE identity = ?)"
+)
+LEGACY_VOTED_ON_PAGE = "SELECT feedback_item_id FROM votes WHERE voter_id = ? AND feedback_item_id IN ({})"
+COMPACT_VOTED_ON_PAGE = (
+    "SELECT feedback_item_id FROM votes WHERE voter_key = (SELECT id FROM voters WHERE identity = ?) "
+    "AND feedback_item_id IN ({})"
+)
+
+CREATED_AT = "2026-01-01 00:00:00.000000"
+
+
+def generate(n_votes: int, rng: random.Random) -> tuple[list[str], list[str], list[tuple[str, str]]]:
+    items = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(max(n_votes // 200, 50))]
+    voters = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(max(n_votes // 8, 1))]
+    votes = set()
+    while len(votes) < n_votes:
+        votes.add((rng.choice(items), rng.choice(voters)))
+    return items, voters, sorted(votes, key=lambda _: rng.random())
+
+
+def build_legacy(path: Path, votes: list[tuple[str, str]]) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.executescript(LEGACY_SCHEMA)
+    conn.executemany(
+        "INSERT INTO votes VALUES (?, ?, ?, NULL, ?)",
+        ((str(uuid.uuid4()), item, voter, CREATED_AT) for item, voter in votes),
+    )
+    conn.commit()
+    return conn
+
+
+def build_compact(path: Path, voters: list[str], votes: list[tuple[str, str]]) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.executescript(COMPACT_SCHEMA)
+    conn.executemany(
+        "INSERT INTO voters (id, identity, created_at) VALUES (?, ?, ?)",
+        ((key, encode_identity(voter), CREATED_AT) for key, voter in enumerate(voters, start=1)),
+    )
+    keys = {voter: key for key, voter in enumerate(voters, start=1)}
+    conn.executemany(
+        "INSERT INTO votes (feedback_item_id, voter_key, created_at) VALUES (?, ?, ?)",
+        ((item, keys[voter], CREATED_AT) for item, voter in votes),
+    )
+    conn.commit()
+    return conn
+
+
+def bytes_on_disk(conn: sqlite3.Connection) -> int:
+    conn.execute("VACUUM")
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    return page_size * page_count
+
+
+def median_us(conn: sqlite3.Connection, sql: str, params: list[tuple]) -> float:
+    timings = []
+    for args in params:
+        started = time.perf_counter()
+        conn.execute(sql, args).fetchall()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1e6
+
+
+def main(n_votes: int, n_lookups: int) -> None:
+    rng = random.Random(42)
+    items, voters, votes = generate(n_votes, rng)
+    probes = [(rng.choice(items), rng.choice(voters)) for _ in range(n_lookups)]
+    pages = [(rng.choice(voters), rng.sample(items, 50)) for _ in range(n_lookups)]
+    placeholders = ", ".join("?" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = build_legacy(Path(tmp) / "legacy.db", votes)
+        compact = build_compact(Path(tmp) / "compact.db", voters, votes)
+        layouts = (
+            (
+                "legacy",
+                legacy,
+                median_us(legacy, LEGACY_HAS_VOTED, probes),
+                median_us(legacy, LEGACY_VOTED_ON_PAGE.format(placeholders), [(v, *page) for v, page in pages]),
+            ),
+            (
+                "compact",
+                compact,
+                median_us(compact, COMPACT_HAS_VOTED, [(item, encode_identity(v)) for item, v in probes]),
+                median_us(
+                    compact,
+                    COMPACT_VOTED_ON_PAGE.format(placeholders),
+                    [(encode_identity(v), *page) for v, page in pages],
+                ),
+            ),
+        )
+
+        print(f"{n_votes} votes from {len(voters)} voters on {len(items)} items, median of {n_lookups} lookups")
+        print(f"{'layout':<10}{'bytes/vote':>12}{'has_voted us':>15}{'page of 50 us':>16}")
+        for name, conn, has_voted, page in layouts:
+            print(f"{name:<10}{bytes_on_disk(conn) / n_votes:>12.1f}{has_voted:>15.1f}{page:>16.1f}")
+            conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--votes", type=int, default=200000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+    main(args.votes, args.lookups)
@@ -0,0 +1,159 @@
+"""Startup time and read throughput of `python -m app.serve` with 1, 2, 4 and 8 workers.
+
+Seeds a board in a throwaway SQLite file (or uses --database-url, e.g. a
+Postgres database already at `alembic upgrade head` with a board whose slug
+is "bench"), then for each worker count starts the server, times how long
+until it answers /health and until every worker is up, and drives it with
+closed-loop clients from separate processes for --duration seconds. Half
+the requests are the board page, half the widget feed.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_workers.py [--workers 1,2,4,8] [--clients 4] [--concurrency 16]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import Base
+from app.models import Board, FeedbackItem, User
+
+SLUG = "bench"
+
+
+async def seed(database_url: str) -> None:
+    engine = create_async_engine(database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, class_=AsyncSession)() as db:
+        user = User(email="bench@example.com", username="bench", hashed_password="x")
+        db.add(user)
+        await db.flush()
+        board = Board(name="Bench", slug=SLUG, owner_id=user.id)
+        db.add(board)
+        await db.flush()
+        db.add_all(
+            FeedbackItem(title=f"Idea {i}", description="Details " * 20, board_id=board.id, author_name="Someone",
+                         vote_count=i % 37)
+            for i in range(100)
+        )
+        await db.commit()
+    await engine.dispose()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def worker_pids(pid: int) -> list[int]:
+    try:
+        return Path(f"/proc/{pid}/task/{pid}/children").read_text().split()
+    except FileNotFoundError:
+        return []
+
+
+def start_server(workers: int, port: int, env: dict) -> tuple[subprocess.Popen, float, float]:
+    """Returns the server, seconds until /health answered and seconds until every worker served it."""
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.serve", "--workers", str(workers), "--host", "127.0.0.1", "--port", str(port),
+         "--no-access-log"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    first = None
+    while time.perf_counter() - started < 60:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                first = first or time.perf_counter() - started
+                # Every worker is up once each has run its lifespan startup; /proc shows they exist,
+                # and a burst of fresh connections spreads across them
+                if len(worker_pids(server.pid)) >= workers:
+                    with httpx.Client(base_url=f"http://127.0.0.1:{port}") as client:
+                        for _ in range(workers * 4):
+                            client.get("/health", headers={"Connection": "close"})
+                    return server, first, time.perf_counter() - started
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.02)
+    server.kill()
+    raise RuntimeError("server did not start")
+
+
+def run_client(port: int, concurrency: int, duration: float) -> list[tuple[float, int]]:
+    async def loop(client: httpx.AsyncClient, i: int, stop: float, results: list) -> None:
+        n = i
+        while time.perf_counter() < stop:
+            path = f"/b/{SLUG}" if n % 2 else f"/b/{SLUG}/widget.json"
+            n += 1
+            t = time.perf_counter()
+            response = await client.get(path)
+            results.append((time.perf_counter() - t, response.status_code))
+
+    async def main() -> list:
+        results: list = []
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=30) as client:
+            stop = time.perf_counter() + duration
+            await asyncio.gather(*(loop(client, i, stop, results) for i in range(concurrency)))
+        return results
+
+    return asyncio.run(main())
+
+
+def percentile(values: list[float], q: int) -> float:
+    return statistics.quantiles(values, n=100)[q - 1] if len(values) > 1 else values[0]
+
+
+def main(worker_counts: list[int], clients: int, concurrency: int, duration: float, database_url: str | None) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        if database_url is None:
+            database_url = f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}"
+            asyncio.run(seed(database_url))
+        env = {
+            **os.environ,
+            "DATABASE_URL": database_url,
+            "ENVIRONMENT": "bench",
+            "EVENT_BUS_PATH": str(Path(tmp) / "bus.db"),
+            "CREATE_TABLES_ON_STARTUP": "false",
+            "ADMISSION_ENABLED": "false",
+        }
+        print(f"{os.cpu_count()} CPUs; {clients} client processes x {concurrency} connections for {duration:.0f}s\n")
+        print(f"{'workers':>8}{'first ok s':>12}{'all up s':>10}{'req/s':>10}{'p50 ms':>9}{'p99 ms':>9}{'errors':>8}")
+        for workers in worker_counts:
+            port = free_port()
+            server, first, all_up = start_server(workers, port, env)
+            try:
+                with multiprocessing.Pool(clients) as pool:
+                    runs = pool.starmap(run_client, [(port, concurrency, duration)] * clients)
+            finally:
+                server.send_signal(signal.SIGTERM)
+                server.wait(timeout=60)
+            results = [r for run in runs for r in run]
+            times = [t for t, status in results if status == 200]
+            errors = len(results) - len(times)
+            print(f"{workers:>8}{first:>12.2f}{all_up:>10.2f}{len(times) / duration:>10.0f}"
+                  f"{percentile(times, 50) * 1000:>9.1f}{percentile(times, 99) * 1000:>9.1f}{errors:>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", default="1,2,4,8", help="Comma-separated worker counts")
+    parser.add_argument("--clients", type=int, default=4, help="Load-generating processes")
+    parser.add_argument("--concurrency", type=int, default=16, help="Connections per client process")
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--database-url", help="Benchmark against this database instead of a fresh SQLite file")
+    args = parser.parse_args()
+    main([int(n) for n in args.workers.split(",")], args.clients, args.concurrency, args.duration, args.database_url)
@@ -0,0 +1,236 @@
+import asyncio
+import re
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import get_settings
+
+settings = get_settings()
+
+CLASSES = ("read", "write", "dashboard", "auth")
+
+# Never queued or shed: liveness checks and scrapes must answer during overload,
+# and CORS preflights do no work.
+EXEMPT_PATHS = frozenset({"/health", "/metrics"})
+SAFE_METHODS = frozenset({"GET", "HEAD"})
+
+_DASHBOARD_PREFIXES = ("/dashboard", "/admin", "/api/boards", "/api/admin")
+_AUTH_PREFIXES = ("/login", "/register", "/logout", "/api/auth")
+
+_LIMIT_RE = re.compile(r"^\s*(\w+)\s*=\s*(\d+)\s*/\s*(\d+)\s*$")
+
+RETRY_AFTER = "1"
+BUSY_JSON = b'{"detail":"Server is busy, please retry shortly"}'
+BUSY_HTML = (
+    b"<!doctype html><title>Busy</title>"
+    b"<p>We're getting a lot of visitors right now. Please try again in a moment.</p>"
+)
+
+
+@dataclass(slots=True, frozen=True)
+class ClassLimit:
+    """At most `in_flight` requests running, `queue` more waiting for a slot."""
+
+    in_flight: int
+    queue: int
+
+
+def parse_class_limits(spec: str) -> dict[str, ClassLimit]:
+    """Parse "read=64/256, write=4/16" (in flight/queued per class; unlisted classes are not limited)."""
+    limits = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        match = _LIMIT_RE.match(part)
+        if not match or match.group(1) not in CLASSES or int(match.group(2)) < 1:
+            raise ValueError(f"Bad admission limit {part!r}: expected <{'|'.join(CLASSES)}>=<in flight>/<queued>")
+        name, in_flight, queue = match.groups()
+        limits[name] = ClassLimit(int(in_flight), int(queue))
+    return limits
+
+
+def route_class(method: str, path: str) -> str | None:
+    """The admission class for a request, or None if it bypasses admission control."""
+    if method == "OPTIONS" or path in EXEMPT_PATHS:
+        return None
+    if path.startswith(_DASHBOARD_PREFIXES):
+        return "dashboard"
+    if path.startswith(_AUTH_PREFIXES):
+        return "auth"
+    return "read" if method in SAFE_METHODS else "write"
+
+
+class Gate:
+    """A counting semaphore with a bounded FIFO wait queue and counters.
+
+    A request that finds every slot busy waits in the queue for up to
+    `timeout` seconds; one that finds the queue full as well is turned away
+    at once. A finishing request hands its slot straight to the oldest
+    waiter, so the queue can't be starved by new arrivals.
+    """
+
+    def __init__(self, name: str, limit: ClassLimit) -> None:
+        self.name = name
+        self.limit = limit
+        self.in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.shed = 0
+        self.timed_out = 0
+        self.wait_seconds = 0.0
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, timeout: float) -> bool:
+        if self.in_flight < self.limit.in_flight and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+        if len(self._waiters) >= self.limit.queue or timeout <= 0:
+            self.shed += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except TimeoutError:
+            self._discard(waiter)
+            if not (waiter.done() and not waiter.cancelled()):
+                self.timed_out += 1
+                return False
+            # The slot arrived as the timeout fired: take it
+        except asyncio.CancelledError:
+            self._discard(waiter)
+            if waiter.done() and not waiter.cancelled():
+                # Handed a slot just as the client went away: pass it on
+                self.release()
+            raise
+        finally:
+            self.wait_seconds += time.monotonic() - started
+        self.admitted += 1
+        return True
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)  # the slot moves to the waiter, in_flight is unchanged
+                return
+        self.in_flight -= 1
+
+    def _discard(self, waiter: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+
+class AdmissionController:
+    """One gate per limited route class, shared by every request in the process."""
+
+    def __init__(self, limits: dict[str, ClassLimit], queue_timeout: float) -> None:
+        self.queue_timeout = queue_timeout
+        self.gates = {name: Gate(name, limit) for name, limit in limits.items()}
+
+    def gate_for(self, method: str, path: str) -> Gate | None:
+        name = route_class(method, path)
+        return self.gates.get(name) if name else None
+
+    def reset(self, limits: dict[str, ClassLimit] | None = None) -> None:
+        """Drop counters (and optionally swap limits). Only call with nothing in flight."""
+        limits = limits if limits is not None else {name: gate.limit for name, gate in self.gates.items()}
+        self.gates = {name: Gate(name, limit) for name, limit in limits.items()}
+
+    def stats(self) -> dict[str, dict]:
+        return {
+            name: {
+                "limit": gate.limit.in_flight,
+                "queue_limit": gate.limit.queue,
+                "in_flight": gate.in_flight,
+                "queued": gate.queued,
+                "admitted": gate.admitted,
+                "shed": gate.shed,
+                "timed_out": gate.timed_out,
+                "wait_seconds": gate.wait_seconds,
+            }
+            for name, gate in self.gates.items()
+        }
+
+    def render_metrics(self) -> str:
+        """The gates' state in the Prometheus text exposition format."""
+        stats = self.stats()
+        lines = []
+
+        def family(name: str, kind: str, help_text: str, samples: list[tuple[str, float]]) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(f"{name}{{{labels}}} {value:g}" for labels, value in samples)
+
+        family("feedbackcue_admission_limit", "gauge", "Requests allowed in flight per route class.",
+               [(f'class="{c}"', s["limit"]) for c, s in stats.items()])
+        family("feedbackcue_admission_queue_limit", "gauge", "Requests allowed to wait per route class.",
+               [(f'class="{c}"', s["queue_limit"]) for c, s in stats.items()])
+        family("feedbackcue_admission_in_flight", "gauge", "Requests currently running.",
+               [(f'class="{c}"', s["in_flight"]) for c, s in stats.items()])
+        family("feedbackcue_admission_queued", "gauge", "Requests currently waiting for a slot.",
+               [(f'class="{c}"', s["queued"]) for c, s in stats.items()])
+        family("feedbackcue_admission_requests_total", "counter", "Requests by admission outcome.",
+               [(f'class="{c}",outcome="{outcome}"', s[outcome])
+                for c, s in stats.items() for outcome in ("admitted", "shed", "timed_out")])
+        family("feedbackcue_admission_queue_wait_seconds_total", "counter", "Total time requests spent queued.",
+               [(f'class="{c}"', s["wait_seconds"]) for c, s in stats.items()])
+        return "\n".join(lines) + "\n"
+
+
+controller = AdmissionController(parse_class_limits(settings.admission_limits), settings.admission_queue_timeout)
+
+
+class AdmissionMiddleware:
+    """Caps concurrent requests per route class before any work is done.
+
+    Installed outermost, so a turned-away request costs no session, query or
+    template: it gets a bare 503 with `Retry-After`. Each class has its own
+    slots, so a pile-up of writes waiting on the SQLite lock doesn't hold up
+    public reads (most of which are served from the in-process caches).
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        gate = controller.gate_for(scope["method"], scope["path"])
+        if gate is None:
+            await self.app(scope, receive, send)
+            return
+        if not await gate.acquire(controller.queue_timeout):
+            await _send_busy(scope, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            gate.release()
+
+
+async def _send_busy(scope: Scope, send: Send) -> None:
+    html = "text/html" in Headers(scope=scope).get("accept", "")
+    body, content_type = (BUSY_HTML, b"text/html; charset=utf-8") if html else (BUSY_JSON, b"application/json")
+    await send({
+        "type": "http.response.start",
+        "status": 503,
+        "headers": [
+            (b"content-type", content_type),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", RETRY_AFTER.encode()),
+            (b"cache-control", b"no-store"),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,59 @@
+from pathlib import Path
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.templating import Jinja2Templates
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.models.user import User
+from app.api.deps import get_admin_user
+from app.services.jobs import get_queue_stats, retry_failed_job, run_schedule_now
+from app.templating import register_globals
+
+router = APIRouter(tags=["admin"])
+
+TEMPLATES_DIR = Path(__file__).parent.parent / "templates"
+templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
+register_globals(templates.env)
+
+
+@router.get("/admin/jobs", response_class=HTMLResponse)
+async def jobs_page(
+    request: Request,
+    user: User = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_db),
+):
+    stats = await get_queue_stats(db)
+    return templates.TemplateResponse(request, "admin/jobs.html", {"user": user, "stats": stats})
+
+
+@router.post("/admin/jobs/schedules/{name}/run")
+async def run_schedule(
+    name: str,
+    user: User = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_db),
+):
+    if await run_schedule_now(db, name) is None:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    return RedirectResponse("/admin/jobs", status_code=302)
+
+
+@router.post("/admin/jobs/{job_id}/retry")
+async def retry_job(
+    job_id: int,
+    user: User = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_db),
+):
+    if not await retry_failed_job(db, job_id):
+        raise HTTPException(status_code=404, detail="Failed job not found")
+    return RedirectResponse("/admin/jobs", status_code=302)
+
+
+@router.get("/api/admin/jobs")
+async def api_queue_stats(
+    window_hours: float = 24,
+    user: User = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_db),
+):
+    return await get_queue_stats(db, window_hours=window_hours)
@@ -1,26 +1,31 @@
 from pathlib import Path
 
 from fastapi import APIRouter, Depends, HTTPException, Request
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, Response
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
+from app.jobs import enqueue
 from app.schemas.auth import UserRegister, UserLogin
 from app.services.auth import (
     authenticate_user,
     create_access_token,
+    delete_user,
     get_user_by_email,
     get_user_by_username,
     register_user,
 )
 from app.api.deps import get_current_user, get_optional_user
 from app.models.user import User
+from app.tasks import PURGE_BOARDS_JOB
+from app.templating import register_globals
 
 router = APIRouter(tags=["auth"])
 
 TEMPLATES_DIR = Path(__file__).parent.parent / "templates"
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
+register_globals(templates.env)
 
 
 @router.get("/register", response_class=HTMLResponse)
@@ -130,3 +135,12 @@ async def api_login(data: UserLogin, db: AsyncSession = Depends(get_db)):
         raise HTTPException(status_code=401, detail="Invalid email or password")
     token = create_access_token(user.id)
     return {"user": {"id": user.id, "email": user.email, "username": user.username}, "token": token}
+
+
+@router.delete("/api/auth/me", status_code=204)
+async def api_delete_account(user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+    await delete_user(db, user)
+    enqueue(db, PURGE_BOARDS_JOB)
+    response = Response(status_code=204)
+    response.delete_cookie("access_token")
+    return response
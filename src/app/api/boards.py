@@ -1,11 +1,14 @@
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.database import get_db
+from app.config import get_settings
+from app.database import get_db, get_session_factory
+from app.jobs import enqueue
 from app.models.user import User
 from app.models.feedback import FeedbackStatus, FeedbackCategory
 from app.api.deps import get_current_user, get_optional_user
@@ -18,13 +21,34 @@ from app.services.board import (
     delete_board,
     get_board_stats,
 )
-from app.services.feedback import get_feedback_for_board
+from app.services.archive import get_archived_item, restore_item
+from app.services.merge import MergeError, merge_feedback, pick_merge_target
+from app.services.ranking import get_item_history, get_item_standing_at, get_ranking_at
+from app.services.feedback import bulk_moderate, get_feedback_by_id, list_feedback_rows, stream_feedback_rows, get_listing_summary
+from app.services.webhooks import create_webhook, delete_webhook, get_webhook, list_webhooks
 from app.schemas.board import BoardCreate, BoardResponse
+from app.schemas.webhook import WebhookCreate, WebhookCreated, WebhookResponse
+from app.schemas.feedback import (
+    BulkItemResult,
+    BulkModerationRequest,
+    BulkModerationResponse,
+    FeedbackResponse,
+    ItemHistoryResponse,
+    ItemStandingResponse,
+    MergeRequest,
+    RankingResponse,
+)
+from app.streaming import stream_template
+from app.tasks import PURGE_BOARDS_JOB
+from app.templating import register_globals
 
 router = APIRouter(tags=["boards"])
 
+settings = get_settings()
+
 TEMPLATES_DIR = Path(__file__).parent.parent / "templates"
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
+register_globals(templates.env)
 
 
 @router.get("/dashboard", response_class=HTMLResponse)
@@ -75,8 +99,10 @@ async def board_detail(
     status_filter: str | None = None,
     category_filter: str | None = None,
     sort: str = "votes",
+    archived: bool = False,
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
+    session_factory: async_sessionmaker = Depends(get_session_factory),
 ):
     board = await get_board_by_id(db, board_id)
     if not board or board.owner_id != user.id:
@@ -84,22 +110,32 @@ async def board_detail(
 
     status_enum = FeedbackStatus(status_filter) if status_filter else None
     category_enum = FeedbackCategory(category_filter) if category_filter else None
-    items = await get_feedback_for_board(db, board.id, status=status_enum, category=category_enum, sort_by=sort)
+    summary = await get_listing_summary(
+        db, board.id, status=status_enum, category=category_enum, include_archived=archived
+    )
+    context = {
+        "user": user,
+        "board": board,
+        "summary": summary,
+        "status_filter": status_filter,
+        "category_filter": category_filter,
+        "sort": sort,
+        "archived": archived,
+        "statuses": FeedbackStatus,
+        "categories": FeedbackCategory,
+    }
+
+    if 0 < settings.stream_min_items <= summary["item_count"]:
+        stream_db = session_factory()
+        context["items"] = stream_feedback_rows(
+            stream_db, board.id, status=status_enum, category=category_enum, sort_by=sort, include_archived=archived
+        )
+        return stream_template(request, "dashboard/board_detail.html", context, on_close=stream_db.close)
 
-    return templates.TemplateResponse(
-        request,
-        "dashboard/board_detail.html",
-        {
-            "user": user,
-            "board": board,
-            "items": items,
-            "status_filter": status_filter,
-            "category_filter": category_filter,
-            "sort": sort,
-            "statuses": FeedbackStatus,
-            "categories": FeedbackCategory,
-        },
+    context["items"] = await list_feedback_rows(
+        db, board.id, status=status_enum, category=category_enum, sort_by=sort, include_archived=archived
     )
+    return templates.TemplateResponse(request, "dashboard/board_detail.html", context)
 
 
 @router.get("/dashboard/boards/{board_id}/settings", response_class=HTMLResponse)
@@ -117,7 +153,7 @@ async def board_settings_page(
     return templates.TemplateResponse(
         request,
         "dashboard/board_settings.html",
-        {"user": user, "board": board, "saved": saved},
+        {"user": user, "board": board, "saved": saved, "public_url": settings.public_url},
     )
 
 
@@ -142,7 +178,7 @@ async def update_board_settings(
         return templates.TemplateResponse(
             request,
             "dashboard/board_settings.html",
-            {"user": user, "board": board, "errors": ["Board name is required"]},
+            {"user": user, "board": board, "errors": ["Board name is required"], "public_url": settings.public_url},
             status_code=422,
         )
 
@@ -161,6 +197,7 @@ async def delete_board_form(
         raise HTTPException(status_code=404, detail="Board not found")
 
     await delete_board(db, board)
+    enqueue(db, PURGE_BOARDS_JOB)
     return RedirectResponse("/dashboard", status_code=302)
 
 
@@ -191,6 +228,105 @@ async def update_item_status(
 
 
 # JSON API endpoints
+@router.post("/dashboard/boards/{board_id}/feedback/{item_id}/restore")
+async def restore_archived_item(
+    board_id: str,
+    item_id: str,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    board = await get_board_by_id(db, board_id)
+    if not board or board.owner_id != user.id:
+        raise HTTPException(status_code=404, detail="Board not found")
+
+    item = await get_archived_item(db, item_id)
+    if not item or item.board_id != board_id:
+        raise HTTPException(status_code=404, detail="Archived item not found")
+
+    await restore_item(db, item)
+    return RedirectResponse(f"/dashboard/boards/{board_id}?archived=true", status_code=302)
+
+
+def _parse_bulk_action(action: str) -> dict:
+    """Dashboard bulk form actions look like "status:planned", "category:bug" or "delete"."""
+    if action == "delete":
+        return {"delete_items": True}
+    kind, _, value = action.partition(":")
+    try:
+        if kind == "status":
+            return {"status": FeedbackStatus(value)}
+        if kind == "category":
+            return {"category": FeedbackCategory(value)}
+    except ValueError:
+        pass
+    raise HTTPException(status_code=422, detail="Unknown bulk action")
+
+
+@router.post("/dashboard/boards/{board_id}/feedback/bulk")
+async def bulk_moderate_form(
+    request: Request,
+    board_id: str,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    form = await request.form()
+    item_ids = form.getlist("item_ids")
+    action = form.get("action", "")
+    if action == "merge" and len(item_ids) > 1:
+        board = await get_board_by_id(db, board_id)
+        if not board or board.owner_id != user.id:
+            raise HTTPException(status_code=404, detail="Board not found")
+        try:
+            await merge_feedback(db, await pick_merge_target(db, board_id, item_ids), item_ids)
+        except MergeError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+    elif item_ids and action != "merge":
+        await bulk_moderate(db, user.id, board_id, item_ids, **_parse_bulk_action(action))
+    return RedirectResponse(f"/dashboard/boards/{board_id}", status_code=302)
+
+
+@router.post("/api/boards/{board_id}/feedback/bulk")
+async def api_bulk_moderate(
+    board_id: str,
+    data: BulkModerationRequest,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    results = await bulk_moderate(
+        db, user.id, board_id, data.item_ids, status=data.status, category=data.category, delete_items=data.delete
+    )
+    outcomes = list(results.values())
+    return BulkModerationResponse(
+        updated=outcomes.count("updated"),
+        deleted=outcomes.count("deleted"),
+        not_found=outcomes.count("not_found"),
+        results=[BulkItemResult(id=item_id, result=result) for item_id, result in results.items()],
+    )
+
+
+@router.post("/api/boards/{board_id}/feedback/{item_id}/merge")
+async def api_merge_feedback(
+    board_id: str,
+    item_id: str,
+    data: MergeRequest,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    board = await get_board_by_id(db, board_id)
+    if not board or board.owner_id != user.id:
+        raise HTTPException(status_code=404, detail="Board not found")
+
+    item = await get_feedback_by_id(db, item_id)
+    if not item or item.board_id != board_id:
+        raise HTTPException(status_code=404, detail="Feedback item not found")
+
+    try:
+        target = await merge_feedback(db, item.id, data.source_ids)
+    except MergeError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return FeedbackResponse.model_validate(target)
+
+
 @router.post("/api/boards", status_code=201)
 async def api_create_board(
     data: BoardCreate,
@@ -208,3 +344,101 @@ async def api_list_boards(
 ):
     boards = await get_boards_by_owner(db, user.id)
     return [BoardResponse.model_validate(b) for b in boards]
+
+
+async def _owned_board(db: AsyncSession, board_id: str, user: User):
+    board = await get_board_by_id(db, board_id)
+    if not board or board.owner_id != user.id:
+        raise HTTPException(status_code=404, detail="Board not found")
+    return board
+
+
+@router.post("/api/boards/{board_id}/webhooks", status_code=201)
+async def api_create_webhook(
+    board_id: str,
+    data: WebhookCreate,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    await _owned_board(db, board_id, user)
+    webhook = await create_webhook(db, board_id, str(data.url), data.events)
+    return WebhookCreated.model_validate(webhook)
+
+
+@router.get("/api/boards/{board_id}/webhooks")
+async def api_list_webhooks(
+    board_id: str,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    await _owned_board(db, board_id, user)
+    return [
+        WebhookResponse.model_validate(webhook).model_copy(update={"pending": pending, "failed": failed})
+        for webhook, pending, failed in await list_webhooks(db, board_id)
+    ]
+
+
+@router.delete("/api/boards/{board_id}/webhooks/{webhook_id}", status_code=204)
+async def api_delete_webhook(
+    board_id: str,
+    webhook_id: str,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    await _owned_board(db, board_id, user)
+    webhook = await get_webhook(db, webhook_id)
+    if not webhook or webhook.board_id != board_id:
+        raise HTTPException(status_code=404, detail="Webhook not found")
+    await delete_webhook(db, webhook)
+
+
+def _as_of(at: datetime | None) -> datetime:
+    if at is None:
+        return datetime.now(timezone.utc)
+    return at.astimezone(timezone.utc) if at.tzinfo else at.replace(tzinfo=timezone.utc)
+
+
+@router.get("/api/boards/{board_id}/ranking")
+async def api_board_ranking(
+    board_id: str,
+    at: datetime | None = None,
+    limit: int = Query(50, ge=1, le=500),
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    await _owned_board(db, board_id, user)
+    at = _as_of(at)
+    return RankingResponse(at=at, items=await get_ranking_at(db, board_id, at, limit))
+
+
+@router.get("/api/boards/{board_id}/feedback/{item_id}/votes")
+async def api_item_votes_at(
+    board_id: str,
+    item_id: str,
+    at: datetime | None = None,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    await _owned_board(db, board_id, user)
+    at = _as_of(at)
+    standing = await get_item_standing_at(db, board_id, item_id, at)
+    if standing is None:
+        raise HTTPException(status_code=404, detail="Feedback item not found at that time")
+    return ItemStandingResponse(item_id=item_id, at=at, **standing)
+
+
+@router.get("/api/boards/{board_id}/feedback/{item_id}/history")
+async def api_item_history(
+    board_id: str,
+    item_id: str,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    points: int = Query(100, ge=2, le=1000),
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    await _owned_board(db, board_id, user)
+    end = _as_of(end)
+    start = _as_of(start) if start is not None else end - timedelta(days=30)
+    series = await get_item_history(db, board_id, item_id, start, end, max_points=points)
+    return ItemHistoryResponse(item_id=item_id, points=series)
@@ -1,6 +1,7 @@
 from fastapi import Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import get_settings
 from app.database import get_db
 from app.models.user import User
 from app.services.auth import decode_access_token, get_user_by_id
@@ -33,3 +34,11 @@ async def get_optional_user(
     if not user_id:
         return None
     return await get_user_by_id(db, user_id)
+
+
+async def get_admin_user(user: User = Depends(get_current_user)) -> User:
+    """The current user, if their email is listed in ADMIN_EMAILS; 404 for everyone else."""
+    admins = {email.strip().lower() for email in get_settings().admin_emails.split(",") if email.strip()}
+    if user.email.lower() not in admins:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    return user
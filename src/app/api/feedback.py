@@ -1,27 +1,53 @@
+import hashlib
 from pathlib import Path
 import uuid
 
 from fastapi import APIRouter, Depends, HTTPException, Request
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, Response
 from fastapi.templating import Jinja2Templates
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.database import get_db
+from app import assets
+from app.config import get_settings
+from app.database import get_db, get_session_factory
+from app.idempotency import run_idempotent
+from app.ratelimit import enforce
 from app.models.feedback import FeedbackStatus, FeedbackCategory
 from app.api.deps import get_optional_user
+from app.schemas.feedback import BatchVoteRequest, BatchVoteResponse, WidgetVoteRequest, WidgetVoteResponse
 from app.services.board import get_board_by_slug
 from app.services.feedback import (
     create_feedback,
-    get_feedback_for_board,
+    list_feedback_rows,
+    stream_feedback_rows,
+    get_listing_summary,
     get_feedback_by_id,
     toggle_vote,
-    has_voted,
+    get_voted_item_ids,
+    get_voted_item_ids_for_board,
+    set_votes,
 )
+from app.services.merge import resolve_merged
+from app.services.roadmap import get_roadmap
+from app.services.widget import build_feed, cached_feed
+from app.streaming import stream_template
+from app.templating import register_globals
 
 router = APIRouter(tags=["feedback"])
 
+settings = get_settings()
+
 TEMPLATES_DIR = Path(__file__).parent.parent / "templates"
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
+register_globals(templates.env)
+
+STATIC_DIR = Path(__file__).parent.parent / "static"
+WIDGET_JS = (STATIC_DIR / "widget.js").read_bytes()
+WIDGET_JS_ETAG = f'"{hashlib.sha256(WIDGET_JS).hexdigest()[:20]}"'
+
+# The widget runs on other sites: its feed and vote endpoint are CORS-open. Votes
+# carry the widget's own voter id in the body rather than relying on cookies.
+WIDGET_CORS_HEADERS = {"Access-Control-Allow-Origin": "*"}
 
 
 def _get_or_create_voter_id(request: Request) -> tuple[str, bool]:
@@ -32,6 +58,30 @@ def _get_or_create_voter_id(request: Request) -> tuple[str, bool]:
     return str(uuid.uuid4()), True
 
 
+def _wants_fragment(request: Request) -> bool:
+    """Progressive-enhancement requests ask for a partial instead of a redirect/full page."""
+    return request.headers.get("x-fragment") == "1"
+
+
+def _set_voter_cookie(response, voter_id: str) -> None:
+    response.set_cookie("voter_id", voter_id, max_age=60 * 60 * 24 * 365, httponly=True, samesite="lax")
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match check; weak validators count (compression weakens our ETags)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return any(tag.strip().removeprefix("W/") in (etag, "*") for tag in header.split(","))
+
+
+def _cached_response(request: Request, body: bytes, etag: str, media_type: str, headers: dict) -> Response:
+    headers = {"ETag": etag, **headers}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type=media_type, headers=headers)
+
+
 @router.get("/b/{slug}", response_class=HTMLResponse)
 async def public_board(
     request: Request,
@@ -39,8 +89,10 @@ async def public_board(
     status_filter: str | None = None,
     category_filter: str | None = None,
     sort: str = "votes",
+    archived: bool = False,
     submitted: bool = False,
     db: AsyncSession = Depends(get_db),
+    session_factory: async_sessionmaker = Depends(get_session_factory),
 ):
     board = await get_board_by_slug(db, slug)
     if not board:
@@ -51,33 +103,232 @@ async def public_board(
 
     status_enum = FeedbackStatus(status_filter) if status_filter else None
     category_enum = FeedbackCategory(category_filter) if category_filter else None
-    items = await get_feedback_for_board(db, board.id, status=status_enum, category=category_enum, sort_by=sort)
+    summary = await get_listing_summary(
+        db, board.id, status=status_enum, category=category_enum, include_archived=archived
+    )
+    context = {
+        "board": board,
+        "item_count": summary["item_count"],
+        "user": user,
+        "status_filter": status_filter,
+        "category_filter": category_filter,
+        "sort": sort,
+        "archived": archived,
+        "statuses": FeedbackStatus,
+        "categories": FeedbackCategory,
+        "submitted": submitted,
+    }
+
+    if 0 < settings.stream_min_items <= summary["item_count"]:
+        # Large board: flush the header and filters now, stream items off a cursor
+        stream_db = session_factory()
+        context["voted_items"] = await get_voted_item_ids_for_board(db, board.id, voter_id)
+        context["items"] = stream_feedback_rows(
+            stream_db, board.id, status=status_enum, category=category_enum, sort_by=sort, include_archived=archived
+        )
+        response = stream_template(request, "public/board.html", context, on_close=stream_db.close)
+    else:
+        items = await list_feedback_rows(
+            db, board.id, status=status_enum, category=category_enum, sort_by=sort, include_archived=archived
+        )
+        context["items"] = items
+        context["voted_items"] = await get_voted_item_ids(db, [item.id for item in items], voter_id)
+        response = templates.TemplateResponse(request, "public/board.html", context)
+    if is_new:
+        _set_voter_cookie(response, voter_id)
+    return response
+
+
+@router.get("/b/{slug}/items", response_class=HTMLResponse)
+async def public_board_items(
+    request: Request,
+    slug: str,
+    status_filter: str | None = None,
+    category_filter: str | None = None,
+    sort: str = "votes",
+    archived: bool = False,
+    db: AsyncSession = Depends(get_db),
+):
+    """Item list fragment for filter/sort changes."""
+    board = await get_board_by_slug(db, slug)
+    if not board:
+        raise HTTPException(status_code=404, detail="Board not found")
 
-    # Check which items the current voter has voted on
-    voted_items = set()
-    for item in items:
-        if await has_voted(db, item.id, voter_id):
-            voted_items.add(item.id)
+    voter_id = request.cookies.get("voter_id")
+    status_enum = FeedbackStatus(status_filter) if status_filter else None
+    category_enum = FeedbackCategory(category_filter) if category_filter else None
+    items = await list_feedback_rows(
+        db, board.id, status=status_enum, category=category_enum, sort_by=sort, include_archived=archived
+    )
+    voted_items = await get_voted_item_ids(db, [item.id for item in items], voter_id) if voter_id else set()
 
-    response = templates.TemplateResponse(
+    return templates.TemplateResponse(
         request,
-        "public/board.html",
+        "public/_items.html",
+        {"board": board, "items": items, "item_count": len(items), "voted_items": voted_items},
+    )
+
+
+@router.get("/b/{slug}/roadmap", response_class=HTMLResponse)
+async def public_roadmap(request: Request, slug: str, db: AsyncSession = Depends(get_db)):
+    board = await get_board_by_slug(db, slug)
+    if not board:
+        raise HTTPException(status_code=404, detail="Board not found")
+
+    columns = await get_roadmap(db, board.id)
+    return templates.TemplateResponse(request, "public/roadmap.html", {"board": board, "columns": columns})
+
+
+@router.get("/b/{slug}/roadmap.json")
+async def public_roadmap_json(slug: str, db: AsyncSession = Depends(get_db)):
+    """Compact roadmap for embedding on other sites (CORS-open, briefly cacheable)."""
+    board = await get_board_by_slug(db, slug)
+    if not board:
+        raise HTTPException(status_code=404, detail="Board not found")
+
+    columns = await get_roadmap(db, board.id)
+    return JSONResponse(
         {
-            "board": board,
-            "items": items,
-            "user": user,
-            "voted_items": voted_items,
-            "status_filter": status_filter,
-            "category_filter": category_filter,
-            "sort": sort,
-            "statuses": FeedbackStatus,
-            "categories": FeedbackCategory,
-            "submitted": submitted,
+            "board": {"name": board.name, "slug": board.slug, "url": f"{settings.public_url}/b/{board.slug}"},
+            "columns": [
+                {
+                    "status": column.status.value,
+                    "total": column.total,
+                    "items": [
+                        {"id": item.id, "title": item.title, "category": item.category.value, "votes": item.vote_count}
+                        for item in column.items
+                    ],
+                }
+                for column in columns
+            ],
+        },
+        headers={
+            "Cache-Control": f"public, max-age={int(settings.roadmap_cache_ttl)}",
+            "Access-Control-Allow-Origin": "*",
         },
     )
-    if is_new:
-        response.set_cookie("voter_id", voter_id, max_age=60 * 60 * 24 * 365, httponly=True, samesite="lax")
-    return response
+
+
+@router.get("/widget.js")
+async def widget_script(request: Request):
+    return _cached_response(
+        request,
+        WIDGET_JS,
+        WIDGET_JS_ETAG,
+        "application/javascript",
+        {"Cache-Control": "public, max-age=3600", **WIDGET_CORS_HEADERS},
+    )
+
+
+@router.get("/assets/{name}")
+async def static_asset(request: Request, name: str):
+    asset = assets.get_asset(name)
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Not found")
+    return _cached_response(
+        request, asset.body, f'"{asset.digest}"', asset.content_type, {"Cache-Control": assets.IMMUTABLE}
+    )
+
+
+@router.get("/b/{slug}/theme.{digest}.css")
+async def board_theme(request: Request, slug: str, digest: str, db: AsyncSession = Depends(get_db)):
+    board = await get_board_by_slug(db, slug)
+    if not board:
+        raise HTTPException(status_code=404, detail="Board not found")
+    theme = assets.theme_css(board.accent_color)
+    if digest != theme.digest:
+        # A page rendered before the branding changed: point it at the current file
+        return RedirectResponse(assets.theme_url(board), status_code=302, headers={"Cache-Control": "no-store"})
+    return _cached_response(
+        request, theme.body, f'"{theme.digest}"', theme.content_type, {"Cache-Control": assets.IMMUTABLE}
+    )
+
+
+@router.get("/b/{slug}/widget.json")
+async def widget_feed(request: Request, slug: str, db: AsyncSession = Depends(get_db)):
+    """Compact feed for the embeddable widget, built for shared caches.
+
+    Served from the in-process cache (no query, even for the board lookup)
+    until a write to the board invalidates it. Revalidations with a matching
+    ETag get a bodiless 304.
+    """
+    feed = cached_feed(slug)
+    if feed is None:
+        board = await get_board_by_slug(db, slug)
+        if not board:
+            raise HTTPException(status_code=404, detail="Board not found")
+        feed = await build_feed(db, board)
+
+    cache_control = (
+        f"public, max-age={settings.widget_max_age}, "
+        f"stale-while-revalidate={settings.widget_stale_while_revalidate}"
+    )
+    return _cached_response(
+        request, feed.body, feed.etag, "application/json", {"Cache-Control": cache_control, **WIDGET_CORS_HEADERS}
+    )
+
+
+@router.options("/b/{slug}/widget/vote/{item_id}")
+@router.options("/b/{slug}/widget/votes")
+async def widget_vote_preflight(slug: str):
+    return Response(
+        status_code=204,
+        headers={
+            **WIDGET_CORS_HEADERS,
+            "Access-Control-Allow-Methods": "POST",
+            "Access-Control-Allow-Headers": "Content-Type, Idempotency-Key",
+            "Access-Control-Max-Age": "86400",
+        },
+    )
+
+
+@router.post("/b/{slug}/widget/vote/{item_id}", response_model=WidgetVoteResponse)
+async def widget_vote(
+    request: Request, slug: str, item_id: str, vote: WidgetVoteRequest, db: AsyncSession = Depends(get_db)
+):
+    """Toggle a vote from the widget; answers with the item's new count instead of redirecting.
+
+    Send an Idempotency-Key header to make retries safe (or use the batch endpoint).
+    """
+    enforce(request, "vote", board=slug, voter=str(vote.voter_id))
+    board = await get_board_by_slug(db, slug)
+    if not board:
+        raise HTTPException(status_code=404, detail="Board not found")
+
+    item = await resolve_merged(db, await get_feedback_by_id(db, item_id))
+    if not item or item.board_id != board.id:
+        raise HTTPException(status_code=404, detail="Feedback item not found")
+
+    async def toggle() -> Response:
+        voted = await toggle_vote(db, item.id, str(vote.voter_id))
+        return JSONResponse({"id": item.id, "voted": voted, "votes": item.vote_count}, headers=WIDGET_CORS_HEADERS)
+
+    return await run_idempotent(request, db, toggle)
+
+
+@router.post("/b/{slug}/widget/votes", response_model=BatchVoteResponse)
+async def widget_batch_vote(
+    request: Request, slug: str, batch: BatchVoteRequest, db: AsyncSession = Depends(get_db)
+):
+    """Set one voter's votes on several items at once (idempotent; unknown items are reported, not fatal)."""
+    enforce(request, "vote", board=slug, voter=str(batch.voter_id), cost=len(batch.votes))
+    board = await get_board_by_slug(db, slug)
+    if not board:
+        raise HTTPException(status_code=404, detail="Board not found")
+
+    wanted = {vote.item_id: vote.voted for vote in batch.votes}
+    states = await set_votes(db, board.id, str(batch.voter_id), wanted, batch.voter_email)
+    return JSONResponse(
+        {
+            "votes": [
+                {"item_id": item_id, "id": state.id, "voted": state.voted, "votes": state.vote_count}
+                for item_id, state in states.items()
+                if state is not None
+            ],
+            "not_found": [item_id for item_id, state in states.items() if state is None],
+        },
+        headers=WIDGET_CORS_HEADERS,
+    )
 
 
 @router.post("/b/{slug}/submit")
@@ -86,24 +337,29 @@ async def submit_feedback(
     slug: str,
     db: AsyncSession = Depends(get_db),
 ):
+    enforce(request, "submit", board=slug, voter=request.cookies.get("voter_id"))
     board = await get_board_by_slug(db, slug)
     if not board:
         raise HTTPException(status_code=404, detail="Board not found")
 
-    form = await request.form()
-    title = form.get("title", "").strip()
-    description = form.get("description", "").strip()
-    category = form.get("category", "feature")
-    author_email = form.get("author_email", "").strip() or None
-    author_name = form.get("author_name", "").strip() or "Anonymous"
+    async def submit() -> Response:
+        form = await request.form()
+        title = form.get("title", "").strip()
+        description = form.get("description", "").strip()
+        category = form.get("category", "feature")
+        author_email = form.get("author_email", "").strip() or None
+        author_name = form.get("author_name", "").strip() or "Anonymous"
 
-    if not title:
-        return RedirectResponse(f"/b/{slug}", status_code=302)
+        if not title:
+            return RedirectResponse(f"/b/{slug}", status_code=302)
 
-    await create_feedback(
-        db, board.id, title, description, FeedbackCategory(category), author_email, author_name
-    )
-    return RedirectResponse(f"/b/{slug}?submitted=true", status_code=302)
+        await create_feedback(
+            db, board.id, title, description, FeedbackCategory(category), author_email, author_name
+        )
+        return RedirectResponse(f"/b/{slug}?submitted=true", status_code=302)
+
+    # A double-submitted form (same hidden key) creates one item
+    return await run_idempotent(request, db, submit)
 
 
 @router.post("/b/{slug}/vote/{item_id}")
@@ -113,16 +369,32 @@ async def vote_on_item(
     item_id: str,
     db: AsyncSession = Depends(get_db),
 ):
+    enforce(request, "vote", board=slug, voter=request.cookies.get("voter_id"))
     board = await get_board_by_slug(db, slug)
     if not board:
         raise HTTPException(status_code=404, detail="Board not found")
 
-    voter_id, is_new = _get_or_create_voter_id(request)
-    form = await request.form()
-    voter_email = form.get("voter_email", "").strip() or None
+    async def vote() -> Response:
+        voter_id, is_new = _get_or_create_voter_id(request)
+        form = await request.form()
+        voter_email = form.get("voter_email", "").strip() or None
 
-    await toggle_vote(db, item_id, voter_id, voter_email)
-    response = RedirectResponse(f"/b/{slug}", status_code=302)
-    if is_new:
-        response.set_cookie("voter_id", voter_id, max_age=60 * 60 * 24 * 365, httponly=True, samesite="lax")
-    return response
+        if _wants_fragment(request):
+            item = await resolve_merged(db, await get_feedback_by_id(db, item_id))
+            if not item or item.board_id != board.id:
+                raise HTTPException(status_code=404, detail="Feedback item not found")
+            voted = await toggle_vote(db, item_id, voter_id, voter_email)
+            response = templates.TemplateResponse(
+                request,
+                "public/_vote_button.html",
+                {"board": board, "item": item, "voted_items": {item.id} if voted else set()},
+            )
+        else:
+            await toggle_vote(db, item_id, voter_id, voter_email)
+            response = RedirectResponse(f"/b/{slug}", status_code=302)
+        if is_new:
+            _set_voter_cookie(response, voter_id)
+        return response
+
+    # Votes toggle, so a repeated POST would take the vote back: replay the first answer instead
+    return await run_idempotent(request, db, vote)
@@ -0,0 +1,93 @@
+import hashlib
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from string import Template
+
+from jinja2 import Environment
+
+from app.models.board import Board
+
+STATIC_DIR = Path(__file__).parent / "static"
+
+# Content-hashed URLs never change meaning, so browsers and CDNs may keep them for good
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+CONTENT_TYPES = {".css": "text/css; charset=utf-8", ".js": "application/javascript"}
+
+# Served at their own stable URLs (embedding sites link to /widget.js directly)
+UNHASHED = frozenset({"widget.js"})
+
+DEFAULT_ACCENT = "#4F46E5"
+_ACCENT_RE = re.compile(r"^#(?:[0-9a-fA-F]{3}){1,2}$")
+
+# Alpha suffixes ("15", "40") are appended to the accent, so it must be #RRGGBB
+THEME_CSS = Template(
+    """.accent-bg { background-color: $accent; }
+.accent-bg-light { background-color: ${accent}15; }
+.accent-text { color: $accent; }
+.accent-border { border-color: $accent; }
+.accent-focus:focus { --tw-ring-color: ${accent}40; border-color: $accent; }
+.vote-btn:hover { background-color: ${accent}15; border-color: $accent; }
+.vote-btn.voted { background-color: ${accent}15; border-color: $accent; }
+"""
+)
+
+
+@dataclass(slots=True, frozen=True)
+class Asset:
+    body: bytes
+    digest: str
+    content_type: str
+
+
+def _digest(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()[:12]
+
+
+def _load_static() -> tuple[dict[str, Asset], dict[str, str]]:
+    """Every file in static/, keyed by its hashed name ("board.1a2b3c4d5e6f.js"), and name -> hashed name."""
+    assets, names = {}, {}
+    for path in sorted(STATIC_DIR.iterdir()):
+        if path.name in UNHASHED or path.suffix not in CONTENT_TYPES:
+            continue
+        body = path.read_bytes()
+        digest = _digest(body)
+        hashed = f"{path.stem}.{digest}{path.suffix}"
+        assets[hashed] = Asset(body, digest, CONTENT_TYPES[path.suffix])
+        names[path.name] = hashed
+    return assets, names
+
+
+STATIC_ASSETS, _HASHED_NAMES = _load_static()
+
+
+def asset_url(name: str) -> str:
+    """The immutable URL of a file in static/, for templates: asset_url("board.js")."""
+    return f"/assets/{_HASHED_NAMES[name]}"
+
+
+def get_asset(hashed_name: str) -> Asset | None:
+    return STATIC_ASSETS.get(hashed_name)
+
+
+@lru_cache(maxsize=1024)
+def theme_css(accent_color: str) -> Asset:
+    """A board's accent stylesheet; rendered once per distinct accent colour per process."""
+    accent = accent_color if _ACCENT_RE.match(accent_color or "") else DEFAULT_ACCENT
+    if len(accent) == 4:
+        accent = "#" + "".join(c * 2 for c in accent[1:])
+    body = THEME_CSS.substitute(accent=accent).encode()
+    return Asset(body, _digest(body), CONTENT_TYPES[".css"])
+
+
+def theme_url(board: Board) -> str:
+    """Changes only when the board's branding does, so the page can link it with immutable caching."""
+    return f"/b/{board.slug}/theme.{theme_css(board.accent_color).digest}.css"
+
+
+def register(env: Environment) -> None:
+    """Make asset_url() and theme_url() available to a Jinja environment's templates."""
+    env.globals["asset_url"] = asset_url
+    env.globals["theme_url"] = theme_url
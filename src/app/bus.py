@@ -0,0 +1,263 @@
+import abc
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# Topics
+BOARD_CHANGED = "board.changed"  # key: board id
+ITEM_VOTED = "item.voted"  # key: feedback item id
+WEBHOOKS_CHANGED = "webhooks.changed"  # key: board id
+ROADMAP_CHANGED = "roadmap.changed"  # key: board id; items entered, left or moved between roadmap statuses
+
+
+@dataclass(frozen=True)
+class Message:
+    topic: str
+    key: str
+    origin: str = ""
+
+
+Handler = Callable[[Message], None]
+
+
+class EventBus(abc.ABC):
+    """Broadcasts invalidation messages to every worker process.
+
+    Handlers are plain callables and must not block: they run inline when a
+    message is delivered. Messages published by this worker are dispatched
+    locally at once; backends only have to implement `_broadcast()` (send to
+    the other workers) and call `_receive()` for whatever they get back, so a
+    Redis pub/sub or any compatible local stand-in slots in the same way.
+    """
+
+    def __init__(self) -> None:
+        self.worker_id = uuid.uuid4().hex
+        self._handlers: dict[str, list[Handler]] = defaultdict(list)
+        self._outbox: asyncio.Queue[Message] | None = None
+
+    def subscribe(self, topic: str, handler: Handler) -> None:
+        """Register a handler for a topic ("*" receives every topic)."""
+        self._handlers[topic].append(handler)
+
+    def unsubscribe(self, topic: str, handler: Handler) -> None:
+        self._handlers[topic].remove(handler)
+
+    @property
+    def running(self) -> bool:
+        return self._outbox is not None
+
+    async def start(self) -> None:
+        # Set per start, not only in __init__: workers forked from a preloaded
+        # parent (app.serve) would otherwise share its id and drop each other's messages
+        self.worker_id = uuid.uuid4().hex
+        self._outbox = asyncio.Queue()
+
+    async def stop(self) -> None:
+        self._outbox = None
+
+    async def publish(self, topic: str, key: str) -> None:
+        message = Message(topic, key, self.worker_id)
+        self._dispatch(message)
+        if self.running:
+            await self._broadcast([message])
+
+    def publish_nowait(self, topic: str, key: str) -> None:
+        """Dispatch locally now and queue the broadcast for the background pump."""
+        message = Message(topic, key, self.worker_id)
+        self._dispatch(message)
+        if self._outbox is not None:
+            self._outbox.put_nowait(message)
+
+    def _drain_outbox(self) -> list[Message]:
+        messages = []
+        while self._outbox is not None and not self._outbox.empty():
+            messages.append(self._outbox.get_nowait())
+        return messages
+
+    @abc.abstractmethod
+    async def _broadcast(self, messages: list[Message]) -> None:
+        """Send messages to the other workers."""
+
+    def _receive(self, message: Message) -> None:
+        if message.origin != self.worker_id:
+            self._dispatch(message)
+
+    def _dispatch(self, message: Message) -> None:
+        for handler in (*self._handlers.get(message.topic, ()), *self._handlers.get("*", ())):
+            try:
+                handler(message)
+            except Exception as e:
+                logger.error("Event bus handler failed for %s %s: %s", message.topic, message.key, e)
+
+
+class MemoryBus(EventBus):
+    """Single-process backend: local dispatch only."""
+
+    async def _broadcast(self, messages: list[Message]) -> None:
+        return None
+
+
+class SQLiteBus(EventBus):
+    """Shared-file backend needing no external service.
+
+    Publishers append rows to a small WAL-mode SQLite table; every worker polls
+    for rows newer than the last id it has seen. Rows older than `retention`
+    seconds are pruned.
+    """
+
+    def __init__(self, path: str, poll_interval: float = 0.25, retention: int = 300) -> None:
+        super().__init__()
+        self.path = path
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self._conn: sqlite3.Connection | None = None
+        # One connection used from worker threads: calls must not overlap, and
+        # stop() must not close it under a poll that outlived its cancelled task
+        self._lock = threading.Lock()
+        self._last_id = 0
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        await super().start()
+        self._conn = await asyncio.to_thread(self._connect)
+        self._last_id = await asyncio.to_thread(self._max_id)
+        self._task = asyncio.create_task(self._pump())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        pending = self._drain_outbox()
+        if pending and self._conn:
+            await asyncio.to_thread(self._insert, pending)
+        await super().stop()
+        if self._conn:
+            await asyncio.to_thread(self._close)
+
+    async def _broadcast(self, messages: list[Message]) -> None:
+        await asyncio.to_thread(self._insert, messages)
+
+    async def _pump(self) -> None:
+        polls = 0
+        while True:
+            try:
+                pending = self._drain_outbox()
+                if pending:
+                    await asyncio.to_thread(self._insert, pending)
+                for message in await asyncio.to_thread(self._fetch):
+                    self._receive(message)
+                polls += 1
+                if polls % 100 == 0:
+                    await asyncio.to_thread(self._prune)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Event bus poll failed: %s", e)
+            await asyncio.sleep(self.poll_interval)
+
+    def _connect(self) -> sqlite3.Connection:
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS bus_messages ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, topic TEXT NOT NULL, key TEXT NOT NULL, "
+            "origin TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        return conn
+
+    def _close(self) -> None:
+        with self._lock:
+            self._conn.close()
+            self._conn = None
+
+    def _max_id(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM bus_messages").fetchone()
+        return row[0]
+
+    def _insert(self, messages: list[Message]) -> None:
+        now = time.time()
+        with self._lock:
+            if self._conn is None:
+                return
+            self._conn.executemany(
+                "INSERT INTO bus_messages (topic, key, origin, created_at) VALUES (?, ?, ?, ?)",
+                [(m.topic, m.key, m.origin, now) for m in messages],
+            )
+
+    def _fetch(self) -> list[Message]:
+        with self._lock:
+            if self._conn is None:
+                return []
+            rows = self._conn.execute(
+                "SELECT id, topic, key, origin FROM bus_messages WHERE id > ? ORDER BY id", (self._last_id,)
+            ).fetchall()
+        if rows:
+            self._last_id = rows[-1][0]
+        return [Message(topic, key, origin) for _, topic, key, origin in rows]
+
+    def _prune(self) -> None:
+        with self._lock:
+            if self._conn is None:
+                return
+            self._conn.execute("DELETE FROM bus_messages WHERE created_at < ?", (time.time() - self.retention,))
+
+
+def create_bus(backend: str) -> EventBus:
+    if backend == "memory":
+        return MemoryBus()
+    if backend == "sqlite":
+        return SQLiteBus(
+            settings.event_bus_path,
+            poll_interval=settings.event_bus_poll_interval,
+            retention=settings.event_bus_retention,
+        )
+    raise ValueError(f"Unknown event bus backend: {backend}")
+
+
+bus = create_bus(settings.event_bus_backend)
+
+
+# Writers stage messages on the session; they are only published once the
+# transaction commits, so other workers never refetch uncommitted state.
+_PENDING_KEY = "bus_pending"
+
+
+def emit(db: AsyncSession, topic: str, key: str) -> None:
+    pending = db.sync_session.info.setdefault(_PENDING_KEY, {})
+    pending[(topic, key)] = None
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        for topic, key in pending:
+            bus.publish_nowait(topic, key)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,93 @@
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable
+from typing import Any
+
+from app.bus import BOARD_CHANGED, Message, bus
+
+_MISSING = object()
+
+
+class LocalCache:
+    """Bounded in-process LRU cache with optional TTL and tag invalidation.
+
+    Entries are tagged (usually with a board id) so a single bus message can
+    drop everything derived from that board in every worker.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float | None = None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[Any, float | None, tuple]] = OrderedDict()
+        self._tags: dict[Hashable, set[Hashable]] = {}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            return default
+        value, expires_at, _ = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._remove(key)
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, tags: Iterable[Hashable] = (), ttl: float | None = None) -> None:
+        if key in self._data:
+            self._remove(key)
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        tags = tuple(tags)
+        self._data[key] = (value, expires_at, tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._data) > self.maxsize:
+            self._remove(next(iter(self._data)))
+
+    def delete(self, key: Hashable) -> None:
+        if key in self._data:
+            self._remove(key)
+
+    def invalidate(self, tag: Hashable) -> None:
+        for key in self._tags.pop(tag, set()):
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._tags.clear()
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, tags = self._data.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+_caches: dict[str, LocalCache] = {}
+
+
+def get_cache(name: str, maxsize: int = 1024, ttl: float | None = None) -> LocalCache:
+    """Return the named process-wide cache, creating it on first use."""
+    cache = _caches.get(name)
+    if cache is None:
+        cache = _caches[name] = LocalCache(maxsize=maxsize, ttl=ttl)
+    return cache
+
+
+def clear_caches() -> None:
+    for cache in _caches.values():
+        cache.clear()
+
+
+def _invalidate_board(message: Message) -> None:
+    for cache in _caches.values():
+        cache.invalidate(message.key)
+
+
+bus.subscribe(BOARD_CHANGED, _invalidate_board)
@@ -0,0 +1,164 @@
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+from app.config import get_settings
+from app.database import async_session, engine
+from app.jobs import JobWorker, enqueue_due_schedules, sync_schedules
+from app.projections import PROJECTIONS, get_board_stats, get_board_stats_at, get_daily_activity, rebuild
+from app.services.archive import archive_items, get_archived_item, restore_item
+from app.services.merge import MERGE_CHUNK_SIZE, merge_feedback_chunked
+from app.services.jobs import get_queue_stats
+from app.services.reconcile import reconcile_vote_counts
+from app.snapshots import parse_slugs, publish_boards
+from app.services import notifications  # noqa: F401  (registers its job handler)
+from app import tasks  # noqa: F401  (registers maintenance jobs and schedules)
+
+
+async def _reconcile_votes(args: argparse.Namespace) -> None:
+    report = await reconcile_vote_counts(
+        async_session, batch_size=args.batch_size, pause=args.pause, repair=not args.dry_run
+    )
+    print(json.dumps(report.as_dict(), indent=2))
+
+
+async def _archive(args: argparse.Namespace) -> None:
+    archived = await archive_items(
+        async_session, older_than_days=args.older_than, batch_size=args.batch_size, board_id=args.board
+    )
+    print(json.dumps({"archived": archived}))
+
+
+async def _restore(args: argparse.Namespace) -> None:
+    async with async_session() as db:
+        for item_id in args.item_ids:
+            item = await get_archived_item(db, item_id)
+            if item is None:
+                print(f"{item_id}: not archived", file=sys.stderr)
+                continue
+            await restore_item(db, item)
+            await db.commit()
+            print(f"{item_id}: restored")
+
+
+async def _merge(args: argparse.Namespace) -> None:
+    target = await merge_feedback_chunked(async_session, args.target, args.sources, chunk_size=args.chunk_size)
+    print(json.dumps({"target": target.id, "vote_count": target.vote_count}))
+
+
+async def _run_jobs(args: argparse.Namespace) -> None:
+    if args.schedules:
+        await sync_schedules(async_session)
+        await enqueue_due_schedules(async_session)
+    ran = await JobWorker(async_session).run_until_idle()
+    print(json.dumps({"ran": ran}))
+
+
+async def _job_stats(args: argparse.Namespace) -> None:
+    async with async_session() as db:
+        stats = await get_queue_stats(db, window_hours=args.window)
+    print(json.dumps(stats, indent=2, default=str))
+
+
+async def _rebuild_projection(args: argparse.Namespace) -> None:
+    names = list(PROJECTIONS) if args.name == "all" else [args.name]
+    for name in names:
+        report = await rebuild(
+            async_session, PROJECTIONS[name], batch_size=args.batch_size, pause=args.pause, restart=args.restart
+        )
+        print(json.dumps(report))
+
+
+def _parse_time(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    return parsed.astimezone(timezone.utc) if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+async def _board_history(args: argparse.Namespace) -> None:
+    async with async_session() as db:
+        if args.at is not None:
+            report = {"at": args.at.isoformat(), **await get_board_stats_at(db, args.board_id, args.at)}
+        else:
+            report = {**await get_board_stats(db, args.board_id), "daily": await get_daily_activity(db, args.board_id)}
+    print(json.dumps(report, indent=2))
+
+
+async def _snapshot(args: argparse.Namespace) -> None:
+    slugs = args.slugs or parse_slugs(get_settings().snapshot_boards)
+    results = await publish_boards(async_session, Path(args.dir), slugs, force=args.force)
+    print(json.dumps(results, indent=2))
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="FeedbackCue maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    reconcile = commands.add_parser("reconcile-votes", help="Recount vote_count from the votes table")
+    reconcile.add_argument("--batch-size", type=int, default=500)
+    reconcile.add_argument("--pause", type=float, default=0.05, help="Seconds to sleep between batches")
+    reconcile.add_argument("--dry-run", action="store_true", help="Report drift without repairing it")
+    reconcile.set_defaults(handler=_reconcile_votes)
+
+    settings = get_settings()
+    archive = commands.add_parser("archive", help="Move old closed/shipped items and their votes to the archive tables")
+    archive.add_argument("--older-than", type=int, default=settings.archive_after_days, help="Age in days")
+    archive.add_argument("--batch-size", type=int, default=settings.archive_batch_size)
+    archive.add_argument("--board", help="Only archive items of this board id")
+    archive.set_defaults(handler=_archive)
+
+    restore = commands.add_parser("restore", help="Move archived items back into the live tables")
+    restore.add_argument("item_ids", nargs="+", metavar="ITEM_ID")
+    restore.set_defaults(handler=_restore)
+
+    merge = commands.add_parser("merge", help="Merge duplicate items into a target, moving votes in chunks")
+    merge.add_argument("target", metavar="TARGET_ID")
+    merge.add_argument("sources", nargs="+", metavar="SOURCE_ID")
+    merge.add_argument("--chunk-size", type=int, default=MERGE_CHUNK_SIZE, help="Votes moved per transaction")
+    merge.set_defaults(handler=_merge)
+
+    run_jobs = commands.add_parser("run-jobs", help="Run every due job once, then exit")
+    run_jobs.add_argument("--schedules", action="store_true", help="Also enqueue schedules that are due")
+    run_jobs.set_defaults(handler=_run_jobs)
+
+    job_stats = commands.add_parser("job-stats", help="Print queue depth and job latency")
+    job_stats.add_argument("--window", type=float, default=24, help="Hours of finished jobs to include")
+    job_stats.set_defaults(handler=_job_stats)
+
+    rebuild_projection = commands.add_parser(
+        "rebuild-projection", help="Fold the board event log into a projection (resumes from its checkpoint)"
+    )
+    rebuild_projection.add_argument("name", choices=[*PROJECTIONS, "all"])
+    rebuild_projection.add_argument("--batch-size", type=int, default=settings.projection_batch_size)
+    rebuild_projection.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between batches")
+    rebuild_projection.add_argument("--restart", action="store_true", help="Drop the projection and replay from the start")
+    rebuild_projection.set_defaults(handler=_rebuild_projection)
+
+    board_history = commands.add_parser("board-history", help="Print a board's stats now, or as of a past moment")
+    board_history.add_argument("board_id", metavar="BOARD_ID")
+    board_history.add_argument("--at", type=_parse_time, help="ISO date/time (UTC unless given); replays the log")
+    board_history.set_defaults(handler=_board_history)
+
+    snapshot = commands.add_parser("snapshot", help="Write static snapshots of public boards for a web server")
+    snapshot.add_argument("slugs", nargs="*", metavar="SLUG", help="Boards to publish (default: SNAPSHOT_BOARDS)")
+    snapshot.add_argument("--dir", default=settings.snapshot_dir, help="Snapshot root directory")
+    snapshot.add_argument("--force", action="store_true", help="Re-render even if the content version is unchanged")
+    snapshot.set_defaults(handler=_snapshot)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
+
+    async def run() -> None:
+        try:
+            await args.handler(args)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
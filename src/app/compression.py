@@ -0,0 +1,208 @@
+import gzip
+import hashlib
+import zlib
+from collections.abc import Callable
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.cache import LocalCache
+
+try:
+    import brotli
+except ImportError:  # optional: pip install ".[compression]"
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional: pip install ".[compression]"
+    zstandard = None
+
+DEFAULT_CONTENT_TYPES = (
+    "text/html",
+    "text/css",
+    "text/plain",
+    "text/javascript",
+    "application/javascript",
+    "application/json",
+    "image/svg+xml",
+)
+
+# Bodies larger than this are still compressed, just not kept in the cache.
+MAX_CACHED_BODY = 2 * 1024 * 1024
+
+
+class _GzipStream:
+    def __init__(self) -> None:
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliStream:
+    def __init__(self) -> None:
+        self._compressor = brotli.Compressor(quality=5)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdStream:
+    def __init__(self) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=3).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+# encoding -> (one-shot compressor, streaming compressor factory), in server preference order
+ENCODERS: dict[str, tuple[Callable[[bytes], bytes], Callable[[], object]]] = {}
+if brotli is not None:
+    ENCODERS["br"] = (lambda body: brotli.compress(body, quality=5), _BrotliStream)
+if zstandard is not None:
+    ENCODERS["zstd"] = (lambda body: zstandard.ZstdCompressor(level=3).compress(body), _ZstdStream)
+ENCODERS["gzip"] = (lambda body: gzip.compress(body, compresslevel=6, mtime=0), _GzipStream)
+
+
+def choose_encoding(accept_encoding: str, available=ENCODERS) -> str | None:
+    """Pick the server-preferred encoding the client accepts (q=0 excludes)."""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name] = quality
+    for encoding in available:
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+class CompressionMiddleware:
+    """Compress text-like responses with the best encoding the client accepts.
+
+    One-shot bodies are compressed once per distinct payload: the result is
+    cached by content digest, so a hot board is recompressed only after it
+    changes. Streaming bodies are compressed incrementally with a sync flush
+    per chunk so early flushes still reach the client.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        content_types: tuple[str, ...] = DEFAULT_CONTENT_TYPES,
+        cache_entries: int = 256,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.content_types = content_types
+        self.cache = LocalCache(maxsize=cache_entries)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        # Responders run even when nothing will be encoded: a compressible response
+        # still varies by Accept-Encoding, or a shared cache could serve its identity
+        # body to clients that asked for gzip (and the reverse)
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        responder = _CompressingResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def compress_cached(self, encoding: str, body: bytes) -> bytes:
+        if len(body) > MAX_CACHED_BODY:
+            return ENCODERS[encoding][0](body)
+        key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+        compressed = self.cache.get(key)
+        if compressed is None:
+            compressed = ENCODERS[encoding][0](body)
+            self.cache.set(key, compressed)
+        return compressed
+
+    def should_compress(self, headers: Headers, status: int) -> bool:
+        if status < 200 or status in (204, 304):
+            return False
+        if "content-encoding" in headers:
+            return False
+        if "no-transform" in headers.get("cache-control", ""):
+            return False
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return content_type in self.content_types
+
+
+class _CompressingResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str | None, send: Send) -> None:
+        self.middleware = middleware
+        self.encoding = encoding
+        self.downstream = send
+        self.start: Message | None = None
+        self.active = False
+        self.stream = None
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            compressible = self.middleware.should_compress(Headers(raw=message["headers"]), message["status"])
+            if compressible:
+                MutableHeaders(raw=message["headers"]).add_vary_header("Accept-Encoding")
+            self.active = compressible and self.encoding is not None
+            if not self.active:
+                await self.downstream(message)
+            return
+
+        if message["type"] != "http.response.body" or not self.active:
+            await self.downstream(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.stream is None and not more_body:
+            # Whole body in one message
+            if len(body) < self.middleware.minimum_size:
+                await self.downstream(self.start)
+                await self.downstream(message)
+                return
+            compressed = self.middleware.compress_cached(self.encoding, body)
+            headers = self._encoded_headers()
+            headers["content-length"] = str(len(compressed))
+            await self.downstream(self.start)
+            await self.downstream({"type": "http.response.body", "body": compressed})
+            return
+
+        if self.stream is None:
+            self.stream = ENCODERS[self.encoding][1]()
+            headers = self._encoded_headers()
+            del headers["content-length"]
+            await self.downstream(self.start)
+
+        data = self.stream.compress(body) if body else b""
+        if not more_body:
+            data += self.stream.finish()
+        if data or not more_body:
+            await self.downstream({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    def _encoded_headers(self) -> MutableHeaders:
+        headers = MutableHeaders(raw=self.start["headers"])
+        headers["content-encoding"] = self.encoding
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["etag"] = f"W/{etag}"
+        return headers
@@ -18,6 +18,108 @@ class Settings(BaseSettings):
     host: str = "0.0.0.0"
     port: int = 8000
 
+    # python -m app.serve: pre-forked worker processes sharing one listening socket
+    workers: int = 1  # 0 = one per CPU
+    drain_timeout: float = 30  # seconds a worker keeps serving in-flight requests after SIGTERM
+    create_tables_on_startup: bool = True  # dev convenience; set false when Alembic manages the schema
+
+    # Board pages listing at least this many items are streamed to the client; 0 disables streaming
+    stream_min_items: int = 500
+
+    # Response compression (gzip always; brotli/zstd when the optional packages are installed)
+    compression_min_size: int = 1024  # bytes
+    compression_cache_entries: int = 256  # compressed bodies kept per worker, keyed by content digest
+
+    # Seconds between background sweeps that purge deleted boards in chunks
+    board_purge_interval: float = 60
+
+    # Vote count reconciliation: how often it runs and how gently it walks the table
+    reconcile_interval: float = 6 * 60 * 60  # seconds
+    reconcile_batch_size: int = 500
+    reconcile_pause: float = 0.05  # seconds slept between batches
+
+    # Closed/shipped items untouched for this many days move to the archive tables; <= 0 disables
+    archive_after_days: int = 365
+    archive_interval: float = 24 * 60 * 60  # seconds
+    archive_batch_size: int = 500
+
+    # Cross-worker invalidation bus: "sqlite" (shared file, no extra service) or "memory" (single process)
+    event_bus_backend: str = "sqlite"
+    event_bus_path: str = "./data/bus.db"
+    event_bus_poll_interval: float = 0.25  # seconds
+    event_bus_retention: int = 300  # seconds a broadcast message is kept for slow pollers
+
+    # Per-process token buckets for anonymous writes: "<ip|voter|board>=<count>/<second|minute|hour|day>, ..."
+    rate_limit_enabled: bool = True
+    rate_limit_max_keys: int = 100_000  # buckets tracked per process; least recently used are evicted
+    rate_limit_submit: str = "ip=10/minute, voter=5/minute, board=120/minute"
+    rate_limit_vote: str = "ip=120/minute, voter=60/minute, board=3000/minute"
+
+    # Per-process admission control: "<read|write|dashboard|auth>=<in flight>/<queued>, ..." (unlisted = unlimited)
+    admission_enabled: bool = True
+    admission_limits: str = "read=64/512, write=4/32, dashboard=16/64, auth=8/32"
+    admission_queue_timeout: float = 2.0  # seconds a queued request waits for a slot before a 503
+    metrics_token: str = ""  # bearer token for GET /metrics; empty disables the endpoint
+
+    # Idempotency-Key replay for submit/vote: "memory" (per process) or "database" (shared by all workers)
+    idempotency_backend: str = "memory"
+    idempotency_ttl: float = 24 * 60 * 60  # seconds a key's response is replayed
+    idempotency_max_keys: int = 10_000  # per process, memory backend only
+
+    # Event log projections (board_events -> projection_counters)
+    projection_batch_size: int = 5000  # events folded per transaction
+    projection_interval: float = 60  # seconds between catch-up runs of every projection
+    ranking_snapshot_interval: float = 60 * 60  # seconds between per-board vote count/rank snapshots
+    ranking_snapshot_keep_days: int = 14  # after this only the first snapshot of each day is kept
+
+    # Durable background jobs (jobs table): polling, leases and retry backoff
+    job_poll_interval: float = 1.0  # seconds
+    job_lease_seconds: float = 300  # a running job whose worker stops renewing is picked up again after this
+    job_max_attempts: int = 5
+    job_retry_base: float = 30  # seconds, doubled per failed attempt
+    job_retry_max: float = 3600
+    job_concurrency: int = 4  # jobs run at once per worker process
+    job_retention_days: float = 7  # finished jobs are pruned after this
+    # Comma-separated emails of users who can see /admin/jobs
+    admin_emails: str = ""
+
+    # Outgoing email; voter notifications are skipped while SMTP_HOST is empty
+    public_url: str = "http://localhost:8000"
+    smtp_host: str = ""
+    smtp_port: int = 25
+    smtp_username: str = ""
+    smtp_password: str = ""
+    smtp_starttls: bool = False
+    smtp_from: str = "FeedbackCue <no-reply@feedbackcue.local>"
+    smtp_pool_size: int = 4  # concurrent SMTP connections kept open
+    smtp_timeout: float = 10  # seconds
+    notify_batch_size: int = 200  # voter emails fetched and sent per batch
+
+    # Public roadmap (/b/{slug}/roadmap)
+    roadmap_items_per_status: int = 20
+    roadmap_cache_ttl: float = 30  # seconds; status changes invalidate at once, vote counts may lag this long
+
+    # Embeddable widget (/widget.js, /b/{slug}/widget.json)
+    widget_items: int = 10
+    widget_max_age: int = 60  # seconds shared caches may serve the feed without revalidating
+    widget_stale_while_revalidate: int = 3600  # seconds a stale feed may be served while refetching
+
+    # Static snapshots (board page + widget feed) of selected boards for a front web server to serve
+    snapshot_boards: str = ""  # comma-separated slugs; empty disables the publisher
+    snapshot_dir: str = "./data/snapshots"
+    snapshot_interval: float = 10  # seconds; at most one re-render pass per interval however busy a board is
+
+    # Outgoing webhooks: events collect in the webhook_deliveries outbox and are POSTed in batches
+    webhook_concurrency: int = 8  # endpoints delivered to at once (also the HTTP connection pool size)
+    webhook_batch_size: int = 100  # events per POST
+    webhook_batch_window: float = 0.5  # seconds to let events accumulate after a wakeup
+    webhook_timeout: float = 10  # seconds per request
+    webhook_max_attempts: int = 8  # attempts per event before it is marked failed
+    webhook_retry_base: float = 10  # seconds, doubled per consecutive endpoint failure
+    webhook_retry_max: float = 3600
+    webhook_poll_interval: float = 2.0  # seconds
+    webhook_lease_seconds: float = 60  # an endpoint held by a stalled worker is picked up again after this
+
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
 
 
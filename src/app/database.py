@@ -1,5 +1,7 @@
 import logging
 
+from sqlalchemy import event, make_url
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
@@ -9,12 +11,24 @@ logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
+_url = make_url(settings.database_url)
+_sqlite = _url.get_backend_name() == "sqlite"
+
 engine = create_async_engine(
     settings.database_url,
     echo=settings.environment == "development",
-    connect_args={"check_same_thread": False},
+    connect_args={"check_same_thread": False} if _sqlite else {},
 )
 
+if _sqlite and _url.database not in (None, "", ":memory:"):
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _use_wal(dbapi_connection, _record) -> None:
+        # Worker processes share the file: with WAL, readers don't wait for a writer's commit
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.close()
+
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
@@ -22,6 +36,32 @@ class Base(DeclarativeBase):
     pass
 
 
+_UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def upsert(db: AsyncSession, table):
+    """An INSERT for the session's database that supports ON CONFLICT (SQLite or PostgreSQL)."""
+    dialect = db.get_bind().dialect.name
+    try:
+        return _UPSERT_INSERTS[dialect](table)
+    except KeyError:
+        raise ValueError(f"Upserts are not supported on {dialect}") from None
+
+
+def dispose_inherited_pool() -> None:
+    """Call first thing in a forked worker: forget the parent's pooled connections without closing them.
+
+    They belong to the parent (aiosqlite's even to a thread that didn't
+    survive the fork), so the worker must open its own.
+    """
+    engine.sync_engine.dispose(close=False)
+
+
+def get_session_factory() -> async_sessionmaker:
+    """For work that outlives the request-scoped session, such as streamed responses."""
+    return async_session
+
+
 async def get_db() -> AsyncSession:
     async with async_session() as session:
         try:
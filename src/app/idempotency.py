@@ -0,0 +1,260 @@
+import abc
+import asyncio
+import hashlib
+import secrets
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from http.cookies import SimpleCookie
+
+from fastapi import HTTPException, Request, Response
+from sqlalchemy import delete, event, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.cache import get_cache
+from app.config import get_settings
+from app.database import upsert
+from app.models.idempotency import IdempotencyKey
+
+settings = get_settings()
+
+HEADER = "Idempotency-Key"
+FORM_FIELD = "idempotency_key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+# Cookies that say who is asking, in order of preference: a replay is only
+# served to the client the response was made for
+IDENTITY_COOKIES = ("voter_id", "access_token")
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def new_key() -> str:
+    """A fresh key for a rendered form (exposed to templates as `idempotency_key()`)."""
+    return secrets.token_urlsafe(16)
+
+
+@dataclass(slots=True, frozen=True)
+class StoredResponse:
+    status_code: int
+    headers: list[tuple[str, str]]
+    body: bytes
+
+    @classmethod
+    def from_response(cls, response: Response) -> "StoredResponse":
+        # Cookies are never replayed; the client that got them already has them
+        headers = [
+            (name.decode("latin-1"), value.decode("latin-1"))
+            for name, value in response.raw_headers
+            if name.lower() != b"set-cookie"
+        ]
+        return cls(response.status_code, headers, bytes(response.body))
+
+    def to_response(self) -> Response:
+        response = Response(self.body, status_code=self.status_code)
+        response.raw_headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in self.headers]
+        response.raw_headers.append((REPLAYED_HEADER.lower().encode(), b"true"))
+        return response
+
+
+class IdempotencyStore(abc.ABC):
+    """Remembers responses by key. `claim` returns the stored response for a
+    repeated key, or reserves the key for this request; `record` saves the
+    response before the request commits and `release` runs once it has.
+    """
+
+    @abc.abstractmethod
+    async def claim(self, db: AsyncSession, key: str) -> StoredResponse | None: ...
+
+    @abc.abstractmethod
+    async def record(self, db: AsyncSession, key: str, stored: StoredResponse) -> None: ...
+
+    def release(self, key: str) -> None:
+        pass
+
+
+class MemoryIdempotencyStore(IdempotencyStore):
+    """Per-process LRU with a TTL. A repeat that arrives while the first request
+    is still running waits for it and then gets its response.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._responses = get_cache("idempotency", maxsize=maxsize, ttl=ttl)
+        self._running: dict[str, asyncio.Event] = {}
+
+    async def claim(self, db: AsyncSession, key: str) -> StoredResponse | None:
+        while (running := self._running.get(key)) is not None:
+            await running.wait()
+        stored = self._responses.get(key)
+        if stored is None:
+            self._running[key] = asyncio.Event()
+        return stored
+
+    async def record(self, db: AsyncSession, key: str, stored: StoredResponse) -> None:
+        # Remembered only once the write commits
+        db.sync_session.info.setdefault(_RECORDED_KEY, []).append((self._responses, key, stored))
+
+    def release(self, key: str) -> None:
+        running = self._running.pop(key, None)
+        if running is not None:
+            running.set()
+
+
+class DatabaseIdempotencyStore(IdempotencyStore):
+    """Keys in the idempotency_keys table, so every worker sees them.
+
+    The key row is inserted first thing in the request's transaction: a
+    concurrent repeat blocks on it until the first request commits and then
+    finds the stored response, and a request that fails rolls its key back
+    with everything else.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+
+    async def claim(self, db: AsyncSession, key: str) -> StoredResponse | None:
+        now = _now()
+        cleared = {"created_at": now, "status_code": None, "headers": None, "body": None}
+        result = await db.execute(
+            upsert(db, IdempotencyKey)
+            .values(key=key, created_at=now)
+            .on_conflict_do_update(
+                index_elements=[IdempotencyKey.key],
+                set_=cleared,
+                where=IdempotencyKey.created_at < now - timedelta(seconds=self.ttl),
+            )
+        )
+        if result.rowcount:
+            return None
+        row = (
+            await db.execute(
+                select(IdempotencyKey.status_code, IdempotencyKey.headers, IdempotencyKey.body).where(
+                    IdempotencyKey.key == key
+                )
+            )
+        ).one()
+        if row.status_code is None:
+            raise HTTPException(status_code=409, detail="A request with this idempotency key is still in progress")
+        return StoredResponse(row.status_code, [tuple(header) for header in row.headers], row.body)
+
+    async def record(self, db: AsyncSession, key: str, stored: StoredResponse) -> None:
+        await db.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.key == key)
+            .values(status_code=stored.status_code, headers=stored.headers, body=stored.body)
+        )
+
+
+def create_store(backend: str) -> IdempotencyStore:
+    if backend == "memory":
+        return MemoryIdempotencyStore(settings.idempotency_max_keys, settings.idempotency_ttl)
+    if backend == "database":
+        return DatabaseIdempotencyStore(settings.idempotency_ttl)
+    raise ValueError(f"Unknown idempotency backend: {backend}")
+
+
+store = create_store(settings.idempotency_backend)
+
+
+async def get_idempotency_key(request: Request) -> str | None:
+    """The client's key, from the Idempotency-Key header or a hidden form field."""
+    key = request.headers.get(HEADER)
+    if key is None and request.headers.get("content-type", "").startswith(
+        ("application/x-www-form-urlencoded", "multipart/form-data")
+    ):
+        key = (await request.form()).get(FORM_FIELD)
+    if not key:
+        return None
+    if len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(status_code=422, detail=f"Idempotency key is longer than {MAX_KEY_LENGTH} characters")
+    return key
+
+
+def _identity(cookies: dict[str, str]) -> str:
+    for name in IDENTITY_COOKIES:
+        if cookies.get(name):
+            return f"{name}={cookies[name]}"
+    return ""
+
+
+def _issued_cookies(response: Response) -> dict[str, str]:
+    issued = SimpleCookie()
+    for value in response.headers.getlist("set-cookie"):
+        issued.load(value)
+    return {name: morsel.value for name, morsel in issued.items()}
+
+
+def _scope(request: Request, key: str, identity: str) -> str:
+    return hashlib.sha256(f"{request.method}\n{request.url.path}\n{identity}\n{key}".encode()).hexdigest()
+
+
+async def run_idempotent(
+    request: Request, db: AsyncSession, handler: Callable[[], Awaitable[Response]]
+) -> Response:
+    """Run a write handler once per idempotency key, replaying its response for repeats.
+
+    Requests without a key just run. With one, the handler's response is
+    stored and committed together with its writes; handlers that raise store
+    nothing, so the client can retry them.
+
+    Keys are scoped to the endpoint and to the voter or session cookie, so a
+    key reused by another client runs afresh instead of replaying someone
+    else's response. A first request without a cookie is also stored under
+    the cookie its response issues, so a double submit that already carries
+    it still matches; replays never re-send the cookie.
+    """
+    key = await get_idempotency_key(request)
+    if key is None:
+        return await handler()
+
+    identity = _identity(request.cookies)
+    scope = _scope(request, key, identity)
+    stored = await store.claim(db, scope)
+    if stored is not None:
+        return stored.to_response()
+    scopes = [scope]
+    try:
+        response = await handler()
+        stored = StoredResponse.from_response(response)
+        await store.record(db, scope, stored)
+        if not identity and (issued := _identity(_issued_cookies(response))):
+            scopes.append(_scope(request, key, issued))
+            if await store.claim(db, scopes[-1]) is None:
+                await store.record(db, scopes[-1], stored)
+        await db.commit()
+    finally:
+        for claimed in scopes:
+            store.release(claimed)
+    return response
+
+
+async def prune_idempotency_keys(session_factory: async_sessionmaker, ttl: float, batch_size: int = 1000) -> int:
+    """Delete expired keys (database backend) in bounded batches. Returns rows deleted."""
+    expired = select(IdempotencyKey.key).where(IdempotencyKey.created_at < _now() - timedelta(seconds=ttl))
+    deleted = 0
+    while True:
+        async with session_factory() as db:
+            result = await db.execute(delete(IdempotencyKey).where(IdempotencyKey.key.in_(expired.limit(batch_size))))
+            await db.commit()
+        deleted += result.rowcount
+        if result.rowcount < batch_size:
+            return deleted
+        await asyncio.sleep(0)
+
+
+# Memory-backend responses are only remembered once their write commits
+_RECORDED_KEY = "idempotency_recorded"
+
+
+@event.listens_for(Session, "after_commit")
+def _remember_responses(session: Session) -> None:
+    for responses, key, stored in session.info.pop(_RECORDED_KEY, ()):
+        responses.set(key, stored)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_responses(session: Session) -> None:
+    session.info.pop(_RECORDED_KEY, None)
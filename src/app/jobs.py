@@ -0,0 +1,396 @@
+import asyncio
+import logging
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from apscheduler.triggers.cron import CronTrigger
+from sqlalchemy import and_, case, delete, event, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, aliased
+
+from app.config import get_settings
+from app.database import upsert
+from app.models.job import Job, JobSchedule, JobStatus
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+
+@dataclass
+class JobContext:
+    """What a handler gets: its payload plus a way to record progress for resumption."""
+
+    job_id: int
+    kind: str
+    payload: dict
+    attempt: int
+    session_factory: async_sessionmaker
+    worker: "JobWorker"
+
+    async def checkpoint(self, **progress) -> None:
+        """Merge `progress` into the stored payload and renew the lease.
+
+        A retried job starts from the last checkpoint instead of from scratch.
+        """
+        self.payload = {**self.payload, **progress}
+        async with self.session_factory() as db:
+            await db.execute(
+                update(Job)
+                .where(Job.id == self.job_id, Job.locked_by == self.worker.worker_id)
+                .values(payload=self.payload, locked_until=_now() + timedelta(seconds=self.worker.lease_seconds))
+            )
+            await db.commit()
+
+
+JobHandler = Callable[[JobContext], Awaitable[None]]
+
+_handlers: dict[str, JobHandler] = {}
+_limits: dict[str, int] = {}
+
+
+def job_handler(kind: str, concurrency: int | None = None) -> Callable[[JobHandler], JobHandler]:
+    """Register the coroutine that runs jobs of this kind.
+
+    `concurrency` caps how many jobs of this kind run at once across all
+    workers and processes (1 makes the kind strictly one-at-a-time).
+    """
+
+    def register(func: JobHandler) -> JobHandler:
+        _handlers[kind] = func
+        if concurrency is not None:
+            _limits[kind] = concurrency
+        return func
+
+    return register
+
+
+@dataclass(frozen=True)
+class Schedule:
+    name: str
+    kind: str
+    cron: str | None = None
+    interval: float | None = None
+    payload: dict = field(default_factory=dict)
+
+    def next_run(self, after: datetime) -> datetime:
+        if self.cron is not None:
+            trigger = CronTrigger.from_crontab(self.cron, timezone=timezone.utc)
+            return trigger.get_next_fire_time(None, after + timedelta(microseconds=1))
+        return after + timedelta(seconds=self.interval)
+
+
+_schedules: dict[str, Schedule] = {}
+
+
+def schedule(
+    name: str, kind: str, cron: str | None = None, interval: float | None = None, payload: dict | None = None
+) -> None:
+    """Enqueue a `kind` job on a crontab expression (UTC) or every `interval` seconds.
+
+    Runs missed while no worker was up are coalesced into one.
+    """
+    if (cron is None) == (interval is None):
+        raise ValueError("Give exactly one of cron or interval")
+    if cron is not None:
+        CronTrigger.from_crontab(cron)
+    _schedules[name] = Schedule(name, kind, cron, interval, payload or {})
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def enqueue(
+    db: AsyncSession, kind: str, payload: dict | None = None, delay: float = 0, max_attempts: int | None = None
+) -> Job:
+    """Add a job to the caller's transaction; it becomes visible to workers when that commits."""
+    job = Job(
+        kind=kind,
+        payload=payload or {},
+        run_after=_now() + timedelta(seconds=delay),
+        max_attempts=max_attempts or settings.job_max_attempts,
+    )
+    db.add(job)
+    mark_enqueued(db)
+    return job
+
+
+def retry_delay(attempt: int) -> float:
+    return min(settings.job_retry_base * 2 ** (attempt - 1), settings.job_retry_max)
+
+
+async def sync_schedules(session_factory: async_sessionmaker) -> None:
+    """Write this process's schedules to job_schedules.
+
+    New schedules and ones whose definition changed get a fresh next_run_at;
+    rows that already match are left alone so restarts don't re-run anything.
+    Rows no longer defined in code are kept but ignored.
+    """
+    now = _now()
+    async with session_factory() as db:
+        for definition in _schedules.values():
+            values = {
+                "kind": definition.kind,
+                "cron": definition.cron,
+                "interval": definition.interval,
+                "payload": definition.payload,
+            }
+            await db.execute(
+                upsert(db, JobSchedule)
+                .values(name=definition.name, next_run_at=definition.next_run(now), **values)
+                .on_conflict_do_nothing(index_elements=["name"])
+            )
+            row = await db.get(JobSchedule, definition.name)
+            if {key: getattr(row, key) for key in values} != values:
+                row.next_run_at = definition.next_run(now)
+                for key, value in values.items():
+                    setattr(row, key, value)
+        await db.commit()
+
+
+async def enqueue_due_schedules(session_factory: async_sessionmaker) -> int:
+    """Enqueue a job for every schedule whose time has come. Returns the number enqueued.
+
+    next_run_at is advanced with a compare-and-set, so when several workers
+    tick at once exactly one of them enqueues each run.
+    """
+    if not _schedules:
+        return 0
+    now = _now()
+    enqueued = 0
+    async with session_factory() as db:
+        result = await db.execute(
+            select(JobSchedule.name, JobSchedule.next_run_at).where(
+                JobSchedule.name.in_(list(_schedules)),
+                JobSchedule.enabled.is_(True),
+                JobSchedule.next_run_at <= now,
+            )
+        )
+        for name, next_run_at in result.all():
+            definition = _schedules[name]
+            claimed = await db.execute(
+                update(JobSchedule)
+                .where(JobSchedule.name == name, JobSchedule.next_run_at == next_run_at)
+                .values(next_run_at=definition.next_run(now), last_run_at=now)
+            )
+            if claimed.rowcount:
+                enqueue(db, definition.kind, dict(definition.payload))
+                enqueued += 1
+        await db.commit()
+    return enqueued
+
+
+async def prune_jobs(session_factory: async_sessionmaker, older_than_days: float, batch_size: int = 1000) -> int:
+    """Delete finished jobs older than the cutoff in bounded batches. Returns rows deleted."""
+    cutoff = _now() - timedelta(days=older_than_days)
+    finished = select(Job.id).where(
+        Job.status.in_([JobStatus.DONE, JobStatus.FAILED]), Job.finished_at < cutoff
+    )
+    deleted = 0
+    while True:
+        async with session_factory() as db:
+            result = await db.execute(delete(Job).where(Job.id.in_(finished.limit(batch_size))))
+            await db.commit()
+        deleted += result.rowcount
+        if result.rowcount < batch_size:
+            return deleted
+        await asyncio.sleep(0)
+
+
+class JobWorker:
+    """Claims due jobs from the jobs table and runs their handlers.
+
+    Claiming is a single UPDATE ... RETURNING that takes a lease, so several
+    processes can share the table without running a job twice; the lease is
+    renewed while the handler runs, and a job whose worker died is picked up
+    again once it expires. Failures are retried with exponential backoff until
+    max_attempts, then marked failed. Up to `concurrency` jobs run at once per
+    worker, and per-kind limits hold across processes because they are part
+    of the claim statement. The worker also enqueues due schedules.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        poll_interval: float = settings.job_poll_interval,
+        lease_seconds: float = settings.job_lease_seconds,
+        concurrency: int = settings.job_concurrency,
+    ) -> None:
+        self.session_factory = session_factory
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.concurrency = concurrency
+        self.worker_id = uuid.uuid4().hex
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+
+    async def claim(self) -> Job | None:
+        now = _now()
+        due = select(Job.id).where(
+            or_(
+                and_(Job.status == JobStatus.QUEUED, Job.run_after <= now),
+                and_(Job.status == JobStatus.RUNNING, Job.locked_until < now),
+            )
+        )
+        if _limits:
+            running = aliased(Job)
+            saturated = (
+                select(running.kind)
+                .where(running.status == JobStatus.RUNNING, running.locked_until >= now, running.kind.in_(list(_limits)))
+                .group_by(running.kind)
+                .having(func.count() >= case(_limits, value=running.kind))
+            )
+            due = due.where(Job.kind.not_in(saturated))
+        due = due.order_by(Job.run_after, Job.id).limit(1).scalar_subquery()
+        async with self.session_factory() as db:
+            result = await db.execute(
+                update(Job)
+                .where(Job.id == due)
+                .values(
+                    status=JobStatus.RUNNING,
+                    locked_by=self.worker_id,
+                    locked_until=now + timedelta(seconds=self.lease_seconds),
+                    attempts=Job.attempts + 1,
+                    started_at=now,
+                )
+                .returning(Job)
+            )
+            job = result.scalar_one_or_none()
+            await db.commit()
+            return job
+
+    async def _finish(self, job: Job, **values) -> None:
+        async with self.session_factory() as db:
+            await db.execute(
+                update(Job)
+                .where(Job.id == job.id, Job.locked_by == self.worker_id)
+                .values(locked_by=None, locked_until=None, **values)
+            )
+            await db.commit()
+
+    async def run_once(self) -> bool:
+        """Claim and run one due job. Returns False when nothing was due."""
+        job = await self.claim()
+        if job is None:
+            return False
+
+        handler = _handlers.get(job.kind)
+        if job.attempts > job.max_attempts or handler is None:
+            error = "No handler registered" if handler is None else "Lease expired on the final attempt"
+            logger.error("Job %s (%s) failed permanently: %s", job.id, job.kind, error)
+            await self._finish(job, status=JobStatus.FAILED, last_error=error, finished_at=_now())
+            return True
+
+        ctx = JobContext(job.id, job.kind, dict(job.payload), job.attempts, self.session_factory, self)
+        heartbeat = asyncio.create_task(self._heartbeat(job.id))
+        try:
+            await handler(ctx)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if job.attempts >= job.max_attempts:
+                logger.error("Job %s (%s) failed permanently: %s", job.id, job.kind, e, exc_info=True)
+                await self._finish(job, status=JobStatus.FAILED, last_error=repr(e), finished_at=_now())
+            else:
+                delay = retry_delay(job.attempts)
+                logger.warning("Job %s (%s) attempt %d failed, retrying in %.0fs: %s", job.id, job.kind, job.attempts, delay, e)
+                await self._finish(
+                    job, status=JobStatus.QUEUED, last_error=repr(e), run_after=_now() + timedelta(seconds=delay)
+                )
+        else:
+            await self._finish(job, status=JobStatus.DONE, finished_at=_now())
+        finally:
+            heartbeat.cancel()
+        return True
+
+    async def _heartbeat(self, job_id: int) -> None:
+        """Keep renewing the lease so long-running handlers aren't taken over."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                async with self.session_factory() as db:
+                    await db.execute(
+                        update(Job)
+                        .where(Job.id == job_id, Job.locked_by == self.worker_id)
+                        .values(locked_until=_now() + timedelta(seconds=self.lease_seconds))
+                    )
+                    await db.commit()
+            except Exception as e:
+                logger.warning("Could not renew lease on job %s: %s", job_id, e)
+
+    async def run_until_idle(self) -> int:
+        """Run due jobs until none are left (tests and one-off CLI use)."""
+        ran = 0
+        while await self.run_once():
+            ran += 1
+        return ran
+
+    def wakeup(self) -> None:
+        self._wakeup.set()
+
+    async def _run_slot(self) -> None:
+        while True:
+            try:
+                if await self.run_once():
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Job worker poll failed: %s", e, exc_info=True)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _run_scheduler(self) -> None:
+        while True:
+            try:
+                await enqueue_due_schedules(self.session_factory)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Job scheduler tick failed: %s", e, exc_info=True)
+            await asyncio.sleep(self.poll_interval)
+
+    async def start(self) -> None:
+        # Leases are matched on worker_id, so each process (forked ones included) needs its own
+        self.worker_id = uuid.uuid4().hex
+        await sync_schedules(self.session_factory)
+        _running_workers.add(self)
+        self._tasks = [
+            asyncio.create_task(self._run_slot(), name=f"job-worker-{slot}") for slot in range(self.concurrency)
+        ]
+        self._tasks.append(asyncio.create_task(self._run_scheduler(), name="job-scheduler"))
+
+    async def stop(self) -> None:
+        _running_workers.discard(self)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+
+# Jobs enqueued in this process wake the local worker as soon as they commit
+# instead of waiting for the next poll.
+_ENQUEUED_KEY = "jobs_enqueued"
+_running_workers: set[JobWorker] = set()
+
+
+def mark_enqueued(db: AsyncSession) -> None:
+    db.sync_session.info[_ENQUEUED_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_workers(session: Session) -> None:
+    if session.info.pop(_ENQUEUED_KEY, False):
+        for worker in _running_workers:
+            worker.wakeup()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_enqueued(session: Session) -> None:
+    session.info.pop(_ENQUEUED_KEY, None)
@@ -0,0 +1,136 @@
+import asyncio
+import logging
+import smtplib
+import threading
+from dataclasses import dataclass
+from email.message import EmailMessage
+from functools import lru_cache
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+
+@dataclass
+class SendReport:
+    sent: int = 0
+    refused: int = 0
+
+
+class SMTPPool:
+    """Keeps up to `size` SMTP connections open and sends batches across them in threads.
+
+    smtplib is blocking, so every connection is driven from a worker thread;
+    idle connections are reused across batches and jobs and checked with NOOP
+    before use. Recipients the server refuses are counted and skipped; any other
+    SMTP or socket error propagates so the calling job can retry later.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 25,
+        username: str = "",
+        password: str = "",
+        starttls: bool = False,
+        size: int = 4,
+        timeout: float = 10,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.size = size
+        self.timeout = timeout
+        self._idle: list[smtplib.SMTP] = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> smtplib.SMTP:
+        conn = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.starttls:
+            conn.starttls()
+        if self.username:
+            conn.login(self.username, self.password)
+        return conn
+
+    def _acquire(self) -> smtplib.SMTP:
+        while True:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                return self._connect()
+            try:
+                if conn.noop()[0] == 250:
+                    return conn
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._discard(conn)
+
+    def _release(self, conn: smtplib.SMTP) -> None:
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(conn)
+                return
+        self._discard(conn)
+
+    @staticmethod
+    def _discard(conn: smtplib.SMTP) -> None:
+        try:
+            conn.quit()
+        except (smtplib.SMTPException, OSError):
+            conn.close()
+
+    def _send_all(self, messages: list[EmailMessage]) -> SendReport:
+        report = SendReport()
+        conn = self._acquire()
+        try:
+            for message in messages:
+                try:
+                    conn.send_message(message)
+                    report.sent += 1
+                except smtplib.SMTPRecipientsRefused:
+                    report.refused += 1
+                except smtplib.SMTPServerDisconnected:
+                    conn = self._connect()
+                    conn.send_message(message)
+                    report.sent += 1
+        except BaseException:
+            self._discard(conn)
+            raise
+        self._release(conn)
+        return report
+
+    async def send_many(self, messages: list[EmailMessage]) -> SendReport:
+        """Send messages over up to `size` connections in parallel."""
+        if not messages:
+            return SendReport()
+        lanes = min(self.size, len(messages))
+        reports = await asyncio.gather(
+            *(asyncio.to_thread(self._send_all, messages[lane::lanes]) for lane in range(lanes))
+        )
+        return SendReport(sum(r.sent for r in reports), sum(r.refused for r in reports))
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            self._discard(conn)
+
+
+@lru_cache
+def get_mailer() -> SMTPPool | None:
+    """The process-wide pool, or None while SMTP isn't configured."""
+    if not settings.smtp_host:
+        return None
+    return SMTPPool(
+        settings.smtp_host,
+        settings.smtp_port,
+        username=settings.smtp_username,
+        password=settings.smtp_password,
+        starttls=settings.smtp_starttls,
+        size=settings.smtp_pool_size,
+        timeout=settings.smtp_timeout,
+    )
@@ -1,18 +1,29 @@
 import logging
+import secrets
 from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import Depends, FastAPI, Request
 from fastapi.exceptions import HTTPException
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
+from app import admission
+from app.admission import AdmissionMiddleware
+from app.bus import bus
+from app.compression import CompressionMiddleware
 from app.config import get_settings
 from app.database import engine, Base, get_db, async_session
-from app.api import auth, boards, feedback
+from app.jobs import JobWorker
+from app.mailer import get_mailer
+from app.snapshots import SnapshotPublisher
+from app.templating import register_globals
+from app.webhooks import WebhookDispatcher
+from app.api import admin, auth, boards, feedback
 from app.api.deps import get_optional_user
+from app import tasks  # noqa: F401  (registers maintenance jobs and schedules)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -24,14 +35,35 @@ settings = get_settings()
 
 TEMPLATES_DIR = Path(__file__).parent / "templates"
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
+register_globals(templates.env)
 
+job_worker = JobWorker(async_session)
+webhook_dispatcher = WebhookDispatcher(async_session)
+snapshot_publisher = SnapshotPublisher(async_session)
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    # Create tables on startup (dev convenience; Alembic for production)
+
+async def create_tables() -> None:
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Dev convenience (Alembic owns production schemas). app.serve does it once before forking workers.
+    if settings.create_tables_on_startup and not getattr(app.state, "tables_created", False):
+        await create_tables()
+    await bus.start()
+    await job_worker.start()
+    await webhook_dispatcher.start()
+    if snapshot_publisher.slugs:
+        await snapshot_publisher.start()
     yield
+    await snapshot_publisher.stop()
+    await webhook_dispatcher.stop()
+    await job_worker.stop()
+    if mailer := get_mailer():
+        mailer.close()
+    await bus.stop()
     await engine.dispose()
 
 
@@ -42,6 +74,15 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_min_size,
+    cache_entries=settings.compression_cache_entries,
+)
+# Added last so it runs first: a shed request never reaches compression or a route
+if settings.admission_enabled:
+    app.add_middleware(AdmissionMiddleware)
+
 async def _handle_http_exception(request: Request, exc):
     accept = request.headers.get("accept", "")
     is_html = "text/html" in accept
@@ -57,9 +98,14 @@ async def _handle_http_exception(request: Request, exc):
         return templates.TemplateResponse(
             request, "errors/404.html", {"user": user}, status_code=404
         )
+    headers = getattr(exc, "headers", None)
+    if exc.status_code == 429 and is_html:
+        return templates.TemplateResponse(
+            request, "errors/429.html", {"user": None}, status_code=429, headers=headers
+        )
     from fastapi.responses import JSONResponse
     detail = getattr(exc, "detail", "An error occurred")
-    return JSONResponse(status_code=exc.status_code, content={"detail": detail})
+    return JSONResponse(status_code=exc.status_code, content={"detail": detail}, headers=headers)
 
 
 # Handle both FastAPI and Starlette HTTPExceptions (route-not-found uses Starlette's)
@@ -93,6 +139,7 @@ async def internal_server_error_handler(request: Request, exc: Exception):
 
 # Routers
 app.include_router(auth.router)
+app.include_router(admin.router)
 app.include_router(boards.router)
 app.include_router(feedback.router)
 
@@ -102,6 +149,17 @@ async def health_check():
     return {"status": "healthy", "app": settings.app_name, "version": "0.1.0"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics(request: Request):
+    """Admission control gauges and counters for Prometheus (this worker only)."""
+    if not settings.metrics_token:
+        raise HTTPException(status_code=404, detail="Not found")
+    expected = f"Bearer {settings.metrics_token}"
+    if not secrets.compare_digest(request.headers.get("authorization", "").encode(), expected.encode()):
+        raise HTTPException(status_code=401, detail="Invalid metrics token", headers={"WWW-Authenticate": "Bearer"})
+    return PlainTextResponse(admission.controller.render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/", response_class=HTMLResponse)
 async def landing_page(request: Request, db: AsyncSession = Depends(get_db)):
     user = await get_optional_user(request, db)
@@ -2,5 +2,11 @@ from app.models.user import User
 from app.models.board import Board
 from app.models.feedback import FeedbackItem
 from app.models.vote import Vote
+from app.models.voter import Voter
+from app.models.archive import ArchivedFeedbackItem, ArchivedVote
+from app.models.job import Job, JobSchedule
+from app.models.webhook import Webhook, WebhookDelivery
+from app.models.idempotency import IdempotencyKey
+from app.models.event import BoardEvent, ProjectionCheckpoint, ProjectionCounter, RankingSnapshot
 
-__all__ = ["User", "Board", "FeedbackItem", "Vote"]
+__all__ = ["User", "Board", "FeedbackItem", "Vote", "Voter", "ArchivedFeedbackItem", "ArchivedVote", "Job", "JobSchedule", "Webhook", "WebhookDelivery", "IdempotencyKey", "BoardEvent", "ProjectionCounter", "ProjectionCheckpoint", "RankingSnapshot"]
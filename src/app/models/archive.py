@@ -0,0 +1,38 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import String, DateTime, Text, Integer, Enum
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+from app.models.feedback import FeedbackStatus, FeedbackCategory
+
+
+class ArchivedFeedbackItem(Base):
+    """Cold copy of a feedback item moved out of feedback_items by the archiver."""
+
+    __tablename__ = "feedback_items_archive"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    title: Mapped[str] = mapped_column(String(300), nullable=False)
+    description: Mapped[str] = mapped_column(Text, nullable=True)
+    status: Mapped[FeedbackStatus] = mapped_column(Enum(FeedbackStatus), nullable=False)
+    category: Mapped[FeedbackCategory] = mapped_column(Enum(FeedbackCategory), nullable=False)
+    vote_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    author_email: Mapped[str] = mapped_column(String(255), nullable=True)
+    author_name: Mapped[str] = mapped_column(String(100), nullable=True)
+    board_id: Mapped[str] = mapped_column(String(36), nullable=False, index=True)
+    merged_into_id: Mapped[str | None] = mapped_column(String(36), nullable=True, index=True)  # stubs travel with their target
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+
+
+class ArchivedVote(Base):
+    __tablename__ = "votes_archive"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    feedback_item_id: Mapped[str] = mapped_column(String(36), nullable=False, index=True)
+    voter_key: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
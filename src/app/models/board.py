@@ -28,8 +28,10 @@ class Board(Base):
         default=lambda: datetime.now(timezone.utc),
         onupdate=lambda: datetime.now(timezone.utc),
     )
+    # Set when the owner deletes the board; rows are purged in chunks in the background
+    deleted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     owner: Mapped["User"] = relationship(back_populates="boards")
     items: Mapped[list["FeedbackItem"]] = relationship(
-        back_populates="board", cascade="all, delete-orphan"
+        back_populates="board", cascade="all, delete-orphan", passive_deletes=True
     )
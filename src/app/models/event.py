@@ -0,0 +1,72 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import JSON, DateTime, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class BoardEvent(Base):
+    """One change to a board's feedback, appended in the same transaction as the change itself.
+
+    Never updated or deleted: counters and stats can be rebuilt from it, and
+    a board's state at any past moment replayed. The id is the log order.
+    No foreign keys, so the history outlives purged boards and items.
+    """
+
+    __tablename__ = "board_events"
+    __table_args__ = (Index("ix_board_events_board_id_id", "board_id", "id"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    board_id: Mapped[str] = mapped_column(String(36), nullable=False)
+    item_id: Mapped[str | None] = mapped_column(String(36), nullable=True)
+    kind: Mapped[str] = mapped_column(String(32), nullable=False)
+    data: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc)
+    )
+
+
+class ProjectionCounter(Base):
+    """A projection's folded state: integer counters by key (item id, "<board>:votes", ...)."""
+
+    __tablename__ = "projection_counters"
+
+    projection: Mapped[str] = mapped_column(String(64), primary_key=True)
+    key: Mapped[str] = mapped_column(String(128), primary_key=True)
+    value: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class ProjectionCheckpoint(Base):
+    """How far into the event log a projection has got; committed with each batch it applies."""
+
+    __tablename__ = "projection_checkpoints"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    last_event_id: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    events_applied: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    # Set when a rebuild has replayed the whole log and published its result
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class RankingSnapshot(Base):
+    """Every live item's vote count on a board as of `last_event_id`, stored column-wise.
+
+    `item_ids`, `votes` and `ranks` are parallel lists in creation order, one
+    row per board per snapshot, so a board with thousands of items costs a
+    few hundred kilobytes rather than thousands of rows. Counts at any later
+    moment are this plus the board's events after `last_event_id`.
+    """
+
+    __tablename__ = "ranking_snapshots"
+    __table_args__ = (Index("ix_ranking_snapshots_board_id_taken_at", "board_id", "taken_at"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    board_id: Mapped[str] = mapped_column(String(36), nullable=False)
+    taken_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    last_event_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    item_ids: Mapped[list[str]] = mapped_column(JSON, nullable=False)
+    votes: Mapped[list[int]] = mapped_column(JSON, nullable=False)
+    ranks: Mapped[list[int]] = mapped_column(JSON, nullable=False)
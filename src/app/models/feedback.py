@@ -42,8 +42,11 @@ class FeedbackItem(Base):
     author_email: Mapped[str] = mapped_column(String(255), nullable=True)
     author_name: Mapped[str] = mapped_column(String(100), nullable=True, default="Anonymous")
     board_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("boards.id", ondelete="CASCADE"), nullable=False
+        String(36), ForeignKey("boards.id", ondelete="CASCADE"), nullable=False, index=True
     )
+    merged_into_id: Mapped[str | None] = mapped_column(
+        String(36), ForeignKey("feedback_items.id"), nullable=True, index=True
+    )  # set on merged-away stubs; votes and links to them go to the target
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
     )
@@ -55,5 +58,5 @@ class FeedbackItem(Base):
 
     board: Mapped["Board"] = relationship(back_populates="items")
     votes: Mapped[list["Vote"]] = relationship(
-        back_populates="feedback_item", cascade="all, delete-orphan"
+        back_populates="feedback_item", cascade="all, delete-orphan", passive_deletes=True
     )
@@ -0,0 +1,25 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import JSON, DateTime, Integer, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class IdempotencyKey(Base):
+    """A write request's response, kept so a retry with the same key gets it back instead of re-running.
+
+    Only used with IDEMPOTENCY_BACKEND=database. The row is inserted at the
+    start of the request's own transaction, so it commits (or rolls back)
+    together with the write it guards.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)  # sha256 of method, path and client key
+    status_code: Mapped[int | None] = mapped_column(Integer, nullable=True)  # NULL while the request is running
+    headers: Mapped[list | None] = mapped_column(JSON, nullable=True)
+    body: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True, default=lambda: datetime.now(timezone.utc)
+    )
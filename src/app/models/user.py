@@ -20,4 +20,6 @@ class User(Base):
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
     )
 
-    boards: Mapped[list["Board"]] = relationship(back_populates="owner", cascade="all, delete-orphan")
+    boards: Mapped[list["Board"]] = relationship(
+        back_populates="owner", cascade="all, delete-orphan", passive_deletes=True
+    )
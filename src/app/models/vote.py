@@ -1,7 +1,6 @@
-import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -10,19 +9,17 @@ from app.database import Base
 class Vote(Base):
     __tablename__ = "votes"
     __table_args__ = (
-        UniqueConstraint("feedback_item_id", "voter_id", name="uq_vote_per_voter"),
+        UniqueConstraint("feedback_item_id", "voter_key", name="uq_vote_per_voter"),
+        Index("ix_votes_voter_key", "voter_key"),
     )
 
-    id: Mapped[str] = mapped_column(
-        String(36), primary_key=True, default=lambda: str(uuid.uuid4())
-    )
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)  # SQLite rowid alias, no extra index
     feedback_item_id: Mapped[str] = mapped_column(
         String(36), ForeignKey("feedback_items.id", ondelete="CASCADE"), nullable=False
     )
-    voter_id: Mapped[str] = mapped_column(
-        String(255), nullable=False, index=True
-    )  # session cookie ID or email
-    voter_email: Mapped[str] = mapped_column(String(255), nullable=True)
+    voter_key: Mapped[int] = mapped_column(
+        Integer, ForeignKey("voters.id"), nullable=False
+    )  # voters.id of the session cookie ID or email
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
     )
@@ -0,0 +1,40 @@
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, Integer, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+_UUID_TAG = b"\x01"
+_TEXT_TAG = b"\x02"
+
+
+def encode_identity(voter_id: str) -> bytes:
+    """Pack a voter identity: cookie UUIDs become 17 bytes, anything else (emails) UTF-8 tagged."""
+    try:
+        parsed = uuid.UUID(voter_id)
+    except ValueError:
+        return _TEXT_TAG + voter_id.encode()
+    if str(parsed) != voter_id:
+        return _TEXT_TAG + voter_id.encode()
+    return _UUID_TAG + parsed.bytes
+
+
+def decode_identity(identity: bytes) -> str:
+    if identity[:1] == _UUID_TAG:
+        return str(uuid.UUID(bytes=identity[1:]))
+    return identity[1:].decode()
+
+
+class Voter(Base):
+    """Dictionary of voter identities (cookie id or email), so votes only carry a small integer."""
+
+    __tablename__ = "voters"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    identity: Mapped[bytes] = mapped_column(LargeBinary(256), nullable=False, unique=True)
+    email: Mapped[str] = mapped_column(String(255), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
@@ -0,0 +1,374 @@
+import abc
+import asyncio
+import logging
+from collections import Counter
+from datetime import datetime, timezone
+
+from sqlalchemy import Row, delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.bus import BOARD_CHANGED, emit
+from app.config import get_settings
+from app.database import upsert
+from app.models.event import BoardEvent, ProjectionCheckpoint, ProjectionCounter
+from app.models.feedback import FeedbackItem
+from app.services.events import (
+    ITEM_CREATED,
+    ITEM_DELETED,
+    ITEM_IMPORTED,
+    ITEM_MERGED,
+    ITEM_STATUS_CHANGED,
+    VOTE_ADDED,
+    VOTE_REMOVED,
+    VOTES_CORRECTED,
+    VOTES_MERGED,
+    EVENT_COLUMNS,
+    get_board_events,
+)
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# Rows per INSERT when upserting folded counters (3 bound parameters each)
+_UPSERT_CHUNK = 5000
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class Projection(abc.ABC):
+    """A fold over the board event log into integer counters.
+
+    `apply` adds one event's deltas to a Counter and must not look anything
+    up, so the same code folds the whole log, catches up incrementally, or
+    replays one board up to a date. Events are plain rows (EVENT_COLUMNS),
+    not ORM objects. Projections whose result lives somewhere else (a column
+    on another table) copy it there in `publish`.
+    """
+
+    name: str = ""
+    kinds: tuple[str, ...] | None = None  # the event kinds apply() uses; None reads every event
+
+    @abc.abstractmethod
+    def apply(self, event: Row, counters: Counter) -> None: ...
+
+    async def publish(self, db: AsyncSession, after: str, limit: int) -> str | None:
+        """Copy one chunk of the folded counters to their target; returns where to continue, or None when done."""
+        return None
+
+
+class ItemVotes(Projection):
+    """Each item's vote count, published to feedback_items.vote_count by a rebuild."""
+
+    name = "item_votes"
+    kinds = (VOTE_ADDED, VOTE_REMOVED, ITEM_IMPORTED, ITEM_MERGED, VOTES_MERGED, VOTES_CORRECTED)
+
+    def apply(self, event: Row, counters: Counter) -> None:
+        if event.kind == VOTE_ADDED:
+            counters[event.item_id] += 1
+        elif event.kind == VOTE_REMOVED:
+            counters[event.item_id] -= 1
+        elif event.kind == ITEM_MERGED:
+            counters[event.item_id] -= event.data["votes"]
+        else:  # imported, merged in or corrected
+            counters[event.item_id] += event.data["votes"]
+
+    async def publish(self, db: AsyncSession, after: str, limit: int) -> str | None:
+        item_ids = list(
+            (
+                await db.execute(
+                    select(FeedbackItem.id).where(FeedbackItem.id > after).order_by(FeedbackItem.id).limit(limit)
+                )
+            ).scalars()
+        )
+        if not item_ids:
+            return None
+        projected = func.max(
+            func.coalesce(
+                select(ProjectionCounter.value)
+                .where(ProjectionCounter.projection == self.name, ProjectionCounter.key == FeedbackItem.id)
+                .scalar_subquery(),
+                0,
+            ),
+            0,
+        )
+        result = await db.execute(
+            update(FeedbackItem)
+            .where(FeedbackItem.id.in_(item_ids), FeedbackItem.vote_count != projected)
+            .values(vote_count=projected)
+            .returning(FeedbackItem.id, FeedbackItem.board_id)
+            .execution_options(synchronize_session=False)
+        )
+        corrected = result.all()
+        for board_id in {row.board_id for row in corrected}:
+            emit(db, BOARD_CHANGED, board_id)
+        if corrected:
+            logger.info("Rebuilt vote_count differed on %d items", len(corrected))
+        return item_ids[-1] if len(item_ids) == limit else None
+
+
+class BoardStats(Projection):
+    """Per board: "<board>:items", "<board>:votes" and "<board>:status:<status>" (archived items included)."""
+
+    name = "board_stats"
+    kinds = (
+        ITEM_CREATED, ITEM_IMPORTED, ITEM_STATUS_CHANGED, ITEM_DELETED, ITEM_MERGED, VOTE_ADDED, VOTE_REMOVED,
+        VOTES_MERGED, VOTES_CORRECTED,
+    )
+
+    def apply(self, event: Row, counters: Counter) -> None:
+        board, data = event.board_id, event.data or {}
+        if event.kind in (ITEM_CREATED, ITEM_IMPORTED):
+            counters[f"{board}:items"] += 1
+            counters[f"{board}:status:{data['status']}"] += 1
+            counters[f"{board}:votes"] += data.get("votes", 0)
+        elif event.kind in (ITEM_DELETED, ITEM_MERGED):
+            counters[f"{board}:items"] -= 1
+            counters[f"{board}:status:{data['status']}"] -= 1
+            counters[f"{board}:votes"] -= data["votes"]
+        elif event.kind == ITEM_STATUS_CHANGED:
+            counters[f"{board}:status:{data['from']}"] -= 1
+            counters[f"{board}:status:{data['to']}"] += 1
+        elif event.kind == VOTE_ADDED:
+            counters[f"{board}:votes"] += 1
+        elif event.kind == VOTE_REMOVED:
+            counters[f"{board}:votes"] -= 1
+        elif event.kind in (VOTES_MERGED, VOTES_CORRECTED):
+            counters[f"{board}:votes"] += data["votes"]
+
+
+class DailyActivity(Projection):
+    """Per board and UTC day: "<board>:<YYYY-MM-DD>:<items|votes_added|votes_removed|status_changes>"."""
+
+    name = "daily_activity"
+    kinds = (ITEM_CREATED, ITEM_STATUS_CHANGED, VOTE_ADDED, VOTE_REMOVED)
+    _metrics = {
+        ITEM_CREATED: "items",
+        ITEM_STATUS_CHANGED: "status_changes",
+        VOTE_ADDED: "votes_added",
+        VOTE_REMOVED: "votes_removed",
+    }
+
+    def apply(self, event: Row, counters: Counter) -> None:
+        counters[f"{event.board_id}:{event.created_at.date().isoformat()}:{self._metrics[event.kind]}"] += 1
+
+
+PROJECTIONS: dict[str, Projection] = {p.name: p for p in (ItemVotes(), BoardStats(), DailyActivity())}
+
+
+def _events_after(projection: Projection, last_event_id: int, limit: int):
+    query = select(*EVENT_COLUMNS).where(BoardEvent.id > last_event_id)
+    if projection.kinds is not None:
+        query = query.where(BoardEvent.kind.in_(projection.kinds))
+    return query.order_by(BoardEvent.id).limit(limit)
+
+
+async def _add_counters(db: AsyncSession, name: str, counters: Counter) -> None:
+    rows = [{"projection": name, "key": key, "value": value} for key, value in counters.items() if value]
+    for start in range(0, len(rows), _UPSERT_CHUNK):
+        stmt = upsert(db, ProjectionCounter).values(rows[start : start + _UPSERT_CHUNK])
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[ProjectionCounter.projection, ProjectionCounter.key],
+                set_={"value": ProjectionCounter.value + stmt.excluded.value},
+            )
+        )
+
+
+async def _apply_batch(db: AsyncSession, projection: Projection, batch_size: int) -> int:
+    """Fold the next batch of events and advance the checkpoint, in the caller's transaction.
+
+    The checkpoint is touched first, which takes SQLite's write lock: a
+    concurrent catch-up waits, then reads the checkpoint this one commits,
+    so no event is applied twice.
+    """
+    last_event_id = await db.scalar(
+        update(ProjectionCheckpoint)
+        .where(ProjectionCheckpoint.name == projection.name)
+        .values(updated_at=_now())
+        .returning(ProjectionCheckpoint.last_event_id)
+    )
+    events = (await db.execute(_events_after(projection, last_event_id, batch_size))).all()
+    if not events:
+        return 0
+    counters: Counter = Counter()
+    for event in events:
+        projection.apply(event, counters)
+    await _add_counters(db, projection.name, counters)
+    await db.execute(
+        update(ProjectionCheckpoint)
+        .where(ProjectionCheckpoint.name == projection.name)
+        .values(last_event_id=events[-1].id, events_applied=ProjectionCheckpoint.events_applied + len(events))
+    )
+    return len(events)
+
+
+async def _ensure_checkpoint(db: AsyncSession, name: str, reset: bool = False) -> None:
+    now = _now()
+    values = {"name": name, "last_event_id": 0, "events_applied": 0, "started_at": now, "updated_at": now}
+    stmt = upsert(db, ProjectionCheckpoint).values(**values)
+    if reset:
+        await db.execute(delete(ProjectionCounter).where(ProjectionCounter.projection == name))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ProjectionCheckpoint.name], set_={**values, "finished_at": None}
+        )
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=[ProjectionCheckpoint.name])
+    await db.execute(stmt)
+
+
+async def catch_up_in(db: AsyncSession, projection: Projection, batch_size: int = settings.projection_batch_size) -> int:
+    """Fold every pending event inside the caller's transaction; returns the number applied.
+
+    The first write takes SQLite's write lock, so whatever the caller reads
+    afterwards in the same transaction matches the folded counters exactly.
+    """
+    await _ensure_checkpoint(db, projection.name)
+    applied = 0
+    while (count := await _apply_batch(db, projection, batch_size)) == batch_size:
+        applied += count
+    return applied + count
+
+
+async def fold_next_batch(
+    db: AsyncSession, projection: Projection, batch_size: int = settings.projection_batch_size
+) -> bool:
+    """Fold at most one batch of pending events in the caller's transaction; True if nothing is left pending.
+
+    A bounded alternative to catch_up_in() for callers that run many short
+    transactions; the checkpoint must exist (run catch_up() first).
+    """
+    return await _apply_batch(db, projection, batch_size) < batch_size
+
+
+async def catch_up(
+    session_factory: async_sessionmaker,
+    projection: Projection,
+    batch_size: int = settings.projection_batch_size,
+    pause: float = 0,
+) -> int:
+    """Fold every event past the projection's checkpoint, one committed batch at a time.
+
+    Safe to interrupt anywhere: each batch commits its counters together with
+    the checkpoint, so the next call resumes exactly where this one stopped.
+    Returns the number of events applied.
+    """
+    async with session_factory() as db:
+        await _ensure_checkpoint(db, projection.name)
+        await db.commit()
+
+    applied = 0
+    while True:
+        async with session_factory() as db:
+            count = await _apply_batch(db, projection, batch_size)
+            await db.commit()
+        applied += count
+        if count < batch_size:
+            return applied
+        if applied % (batch_size * 100) == 0:
+            logger.info("Projection %s: %d events applied", projection.name, applied)
+        await asyncio.sleep(pause)
+
+
+async def rebuild(
+    session_factory: async_sessionmaker,
+    projection: Projection,
+    batch_size: int = settings.projection_batch_size,
+    pause: float = 0,
+    restart: bool = False,
+) -> dict:
+    """Bring a projection up to date with the whole log and publish it.
+
+    Picks up from the last checkpoint, so an interrupted rebuild resumes and a
+    finished one only folds what is new. `restart` drops the counters and
+    replays from the first event (needed after changing what apply() does).
+    Publishing runs in chunks, each after a final catch-up in the same
+    transaction, so writes landing meanwhile are neither lost nor doubled.
+    """
+    if restart:
+        async with session_factory() as db:
+            await _ensure_checkpoint(db, projection.name, reset=True)
+            await db.commit()
+    applied = await catch_up(session_factory, projection, batch_size, pause)
+
+    cursor: str | None = ""
+    while cursor is not None:
+        async with session_factory() as db:
+            applied += await catch_up_in(db, projection, batch_size)
+            cursor = await projection.publish(db, cursor, batch_size)
+            await db.commit()
+        await asyncio.sleep(pause)
+
+    async with session_factory() as db:
+        checkpoint = await db.get(ProjectionCheckpoint, projection.name)
+        checkpoint.finished_at = _now()
+        await db.commit()
+        return {
+            "projection": projection.name,
+            "events_applied": applied,
+            "last_event_id": checkpoint.last_event_id,
+            "total_events_applied": checkpoint.events_applied,
+        }
+
+
+async def read_counters(db: AsyncSession, projection: str, prefix: str) -> dict[str, int]:
+    """A projection's counters whose key starts with `prefix`, with the prefix stripped."""
+    result = await db.execute(
+        select(ProjectionCounter.key, ProjectionCounter.value).where(
+            ProjectionCounter.projection == projection,
+            ProjectionCounter.key >= prefix,
+            ProjectionCounter.key < prefix + "\uffff",
+        )
+    )
+    return {key[len(prefix) :]: value for key, value in result}
+
+
+async def read_item_votes(db: AsyncSession, item_ids: list[str]) -> dict[str, int]:
+    """The item_votes counters for these items: each one's vote count according to the event log."""
+    result = await db.execute(
+        select(ProjectionCounter.key, ProjectionCounter.value).where(
+            ProjectionCounter.projection == ItemVotes.name, ProjectionCounter.key.in_(item_ids)
+        )
+    )
+    return dict(result.all())
+
+
+def _board_stats(counters: dict[str, int]) -> dict:
+    return {
+        "items": counters.get("items", 0),
+        "votes": counters.get("votes", 0),
+        "statuses": {
+            key.removeprefix("status:"): value
+            for key, value in sorted(counters.items())
+            if key.startswith("status:") and value
+        },
+    }
+
+
+async def get_board_stats(db: AsyncSession, board_id: str) -> dict:
+    """Current stats from the board_stats projection (as of its last catch-up)."""
+    return _board_stats(await read_counters(db, BoardStats.name, f"{board_id}:"))
+
+
+async def get_board_stats_at(db: AsyncSession, board_id: str, at: datetime, batch_size: int = 5000) -> dict:
+    """What the board looked like at `at`, replayed from its own events."""
+    projection = PROJECTIONS[BoardStats.name]
+    counters: Counter = Counter()
+    after_id = 0
+    while events := await get_board_events(db, board_id, after_id=after_id, until=at, limit=batch_size):
+        for event in events:
+            if event.kind in projection.kinds:
+                projection.apply(event, counters)
+        after_id = events[-1].id
+    return _board_stats({key.removeprefix(f"{board_id}:"): value for key, value in counters.items()})
+
+
+async def get_daily_activity(db: AsyncSession, board_id: str) -> dict[str, dict[str, int]]:
+    """{"YYYY-MM-DD": {"items": .., "votes_added": .., ...}} from the daily_activity projection."""
+    days: dict[str, dict[str, int]] = {}
+    for key, value in sorted((await read_counters(db, DailyActivity.name, f"{board_id}:")).items()):
+        day, metric = key.split(":", 1)
+        days.setdefault(day, {})[metric] = value
+    return days
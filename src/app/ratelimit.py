@@ -0,0 +1,133 @@
+import math
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+
+from fastapi import HTTPException, Request
+
+from app.config import get_settings
+
+settings = get_settings()
+
+PERIODS = {"second": 1, "minute": 60, "hour": 60 * 60, "day": 24 * 60 * 60}
+SCOPES = ("ip", "voter", "board")
+
+_LIMIT_RE = re.compile(r"^\s*(\w+)\s*=\s*(\d+)\s*/\s*(second|minute|hour|day)\s*$")
+
+
+@dataclass(slots=True, frozen=True)
+class Limit:
+    """A token bucket: `capacity` requests at once, refilled evenly over `period` seconds."""
+
+    capacity: int
+    period: float
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.period
+
+
+def parse_limits(spec: str) -> dict[str, Limit]:
+    """Parse "ip=20/minute, voter=5/minute, board=300/minute" (any subset of scopes; "" for none)."""
+    limits = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        match = _LIMIT_RE.match(part)
+        if not match or match.group(1) not in SCOPES:
+            raise ValueError(f"Bad rate limit {part!r}: expected <{'|'.join(SCOPES)}>=<count>/<second|minute|hour|day>")
+        scope, count, period = match.groups()
+        limits[scope] = Limit(int(count), PERIODS[period])
+    return limits
+
+
+class RateLimiter:
+    """Token buckets for many keys in a bounded, LRU-ordered dict.
+
+    Each bucket is two floats (tokens left, last refill time), refilled lazily
+    when it is next checked. When more than `max_keys` are tracked the least
+    recently used are dropped; an idle bucket would have refilled anyway, so
+    evicting it only forgets a client who has gone quiet.
+    """
+
+    def __init__(self, max_keys: int = 100_000) -> None:
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[Hashable, list[float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def hit(self, checks: list[tuple[Hashable, Limit]], cost: int = 1) -> float:
+        """Take `cost` tokens from every bucket, or from none of them.
+
+        Returns 0 when allowed, otherwise the seconds until all buckets could
+        afford `cost` (nothing is taken, so a rejected request doesn't push
+        the client's wait further out).
+        """
+        now = time.monotonic()
+        buckets = self._buckets
+        refilled = []
+        wait = 0.0
+        for key, limit in checks:
+            bucket = buckets.get(key)
+            if bucket is None:
+                tokens = float(limit.capacity)
+            else:
+                tokens = min(limit.capacity, bucket[0] + (now - bucket[1]) * limit.rate)
+            # A batch bigger than the bucket may still go through, emptying it
+            need = min(cost, limit.capacity)
+            if tokens < need:
+                wait = max(wait, (need - tokens) / limit.rate)
+            refilled.append((key, bucket, tokens - need))
+        if wait:
+            return wait
+
+        for key, bucket, tokens in refilled:
+            if bucket is None:
+                buckets[key] = [tokens, now]
+            else:
+                bucket[0] = tokens
+                bucket[1] = now
+                buckets.move_to_end(key)
+        while len(buckets) > self.max_keys:
+            buckets.popitem(last=False)
+        return 0.0
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+
+limiter = RateLimiter(settings.rate_limit_max_keys)
+
+# Route name -> limits per scope, from the RATE_LIMIT_<ROUTE> settings
+ROUTE_LIMITS = {
+    "submit": parse_limits(settings.rate_limit_submit),
+    "vote": parse_limits(settings.rate_limit_vote),
+}
+
+
+def client_ip(request: Request) -> str:
+    # Behind a reverse proxy run uvicorn with --proxy-headers / --forwarded-allow-ips
+    # so this is the client's address rather than the proxy's.
+    return request.client.host if request.client else ""
+
+
+def enforce(request: Request, route: str, board: str, voter: str | None = None, cost: int = 1) -> None:
+    """Charge a request against its route's IP, voter and board buckets; 429 if any is empty.
+
+    Voters are identified by whatever the route trusts (cookie or widget id);
+    a client that drops its cookie to get a fresh voter id still shares the
+    IP bucket. Limits are per worker process.
+    """
+    limits = ROUTE_LIMITS[route]
+    if not settings.rate_limit_enabled or not limits:
+        return
+    keys = {"ip": client_ip(request), "voter": voter, "board": board}
+    checks = [((route, scope, keys[scope]), limit) for scope, limit in limits.items() if keys[scope]]
+    wait = limiter.hit(checks, cost)
+    if wait:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many requests, please slow down",
+            headers={"Retry-After": str(math.ceil(wait))},
+        )
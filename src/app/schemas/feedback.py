@@ -1,5 +1,8 @@
+import uuid
 from datetime import datetime
-from pydantic import BaseModel
+from typing import Literal
+
+from pydantic import BaseModel, Field, model_validator
 
 from app.models.feedback import FeedbackStatus, FeedbackCategory
 
@@ -16,6 +19,35 @@ class FeedbackUpdateStatus(BaseModel):
     status: FeedbackStatus
 
 
+class BulkModerationRequest(BaseModel):
+    item_ids: list[str] = Field(min_length=1, max_length=1000)
+    status: FeedbackStatus | None = None
+    category: FeedbackCategory | None = None
+    delete: bool = False
+
+    @model_validator(mode="after")
+    def one_action(self):
+        if self.delete == (self.status is not None or self.category is not None):
+            raise ValueError("Give a status and/or category, or delete, but not both")
+        return self
+
+
+class BulkItemResult(BaseModel):
+    id: str
+    result: Literal["updated", "deleted", "not_found"]
+
+
+class BulkModerationResponse(BaseModel):
+    updated: int
+    deleted: int
+    not_found: int
+    results: list[BulkItemResult]
+
+
+class MergeRequest(BaseModel):
+    source_ids: list[str] = Field(min_length=1, max_length=1000)
+
+
 class FeedbackResponse(BaseModel):
     id: str
     title: str
@@ -26,6 +58,7 @@ class FeedbackResponse(BaseModel):
     author_email: str | None
     author_name: str | None
     board_id: str
+    merged_into_id: str | None = None
     created_at: datetime
     updated_at: datetime
 
@@ -34,3 +67,67 @@ class FeedbackResponse(BaseModel):
 
 class VoteRequest(BaseModel):
     voter_email: str | None = None
+
+
+class WidgetVoteRequest(BaseModel):
+    # Anonymous id the widget keeps in localStorage (third-party cookies aren't reliable)
+    voter_id: uuid.UUID
+
+
+class WidgetVoteResponse(BaseModel):
+    id: str
+    voted: bool
+    votes: int
+
+
+class BatchVote(BaseModel):
+    item_id: str
+    voted: bool  # the state wanted, not a toggle, so retries are harmless
+
+
+class BatchVoteRequest(BaseModel):
+    voter_id: uuid.UUID
+    voter_email: str | None = None
+    votes: list[BatchVote] = Field(min_length=1, max_length=100)
+
+
+class BatchVoteResult(BaseModel):
+    item_id: str
+    id: str  # differs from item_id when the item was merged into another
+    voted: bool
+    votes: int
+
+
+class BatchVoteResponse(BaseModel):
+    votes: list[BatchVoteResult]
+    not_found: list[str]
+
+
+class RankedItem(BaseModel):
+    item_id: str
+    votes: int
+    rank: int
+
+
+class RankingResponse(BaseModel):
+    at: datetime
+    items: list[RankedItem]
+
+
+class ItemStandingResponse(BaseModel):
+    item_id: str
+    at: datetime
+    votes: int
+    rank: int
+    of: int  # items live on the board at `at`
+
+
+class RankPoint(BaseModel):
+    at: datetime
+    votes: int
+    rank: int
+
+
+class ItemHistoryResponse(BaseModel):
+    item_id: str
+    points: list[RankPoint]
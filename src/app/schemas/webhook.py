@@ -0,0 +1,32 @@
+from datetime import datetime
+from typing import Literal
+
+from pydantic import AnyHttpUrl, BaseModel
+
+WebhookEvent = Literal["feedback.created", "feedback.voted", "feedback.status_changed"]
+
+
+class WebhookCreate(BaseModel):
+    url: AnyHttpUrl
+    # Empty subscribes to every event
+    events: list[WebhookEvent] = []
+
+
+class WebhookResponse(BaseModel):
+    id: str
+    board_id: str
+    url: str
+    events: list[str]
+    active: bool
+    failures: int
+    last_error: str | None
+    created_at: datetime
+    pending: int = 0
+    failed: int = 0
+
+    model_config = {"from_attributes": True}
+
+
+class WebhookCreated(WebhookResponse):
+    # Only returned once, at creation: used to verify the X-FeedbackCue-Signature header
+    secret: str
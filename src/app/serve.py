@@ -0,0 +1,191 @@
+"""Production server: the app is loaded once, then forked into worker processes.
+
+    python -m app.serve [--workers 4] [--host 0.0.0.0] [--port 8000]
+
+The parent imports every module, compiles every template and creates the
+tables (when CREATE_TABLES_ON_STARTUP is set) before forking, so workers
+start warm and share those pages copy-on-write. It binds the listening
+socket once; all workers accept from it. It restarts workers that die.
+
+On SIGTERM or SIGINT the parent stops restarting workers and passes the
+signal on. Each worker stops accepting connections, finishes in-flight
+requests for up to DRAIN_TIMEOUT seconds and runs the app's shutdown.
+Workers still running after that are killed.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import time
+
+import uvicorn
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# A worker that dies sooner than this after starting is restarted only after a pause
+_CRASH_WINDOW = 1.0
+# Extra time for the lifespan shutdown after draining, before stragglers are killed
+_SHUTDOWN_GRACE = 5.0
+
+
+def warm_templates() -> int:
+    """Compile every template in every Jinja environment once, before workers fork; returns the count."""
+    from app import main, snapshots, streaming
+    from app.api import admin, auth, boards, feedback
+
+    envs = [streaming.env, snapshots.env] + [m.templates.env for m in (main, admin, auth, boards, feedback)]
+    compiled = 0
+    for env in envs:
+        for name in env.list_templates():
+            env.get_template(name)
+            compiled += 1
+    return compiled
+
+
+def preload():
+    """Import and warm the app in the parent. No database connection survives into the workers."""
+    from app.database import engine
+    from app.main import app, create_tables
+
+    started = time.monotonic()
+    compiled = warm_templates()
+    if settings.create_tables_on_startup:
+
+        async def _create() -> None:
+            await create_tables()
+            await engine.dispose()
+
+        asyncio.run(_create())
+        app.state.tables_created = True
+    logger.info("Preloaded app and %d templates in %.2fs", compiled, time.monotonic() - started)
+    return app
+
+
+class Supervisor:
+    """Forks `workers` uvicorn servers onto one shared socket and keeps that many running."""
+
+    def __init__(self, config: uvicorn.Config, workers: int, drain_timeout: float) -> None:
+        self.config = config
+        self.workers = workers
+        self.drain_timeout = drain_timeout
+        self.children: dict[int, float] = {}  # pid -> start time
+        self._stopping = False
+        self._socket = None
+
+    def _spawn(self) -> None:
+        pid = os.fork()
+        if pid:
+            self.children[pid] = time.monotonic()
+            return
+        status = 0
+        try:
+            self._run_worker()
+        except BaseException:
+            logger.exception("Worker %d failed", os.getpid())
+            status = 1
+        finally:
+            logging.shutdown()
+            os._exit(status)
+
+    def _run_worker(self) -> None:
+        from app.database import dispose_inherited_pool
+
+        # uvicorn installs its own SIGTERM/SIGINT handling (stop accepting, drain, shut down)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        dispose_inherited_pool()
+        uvicorn.Server(self.config).run(sockets=[self._socket])
+
+    def _on_signal(self, signum: int, _frame) -> None:
+        if not self._stopping:
+            logger.info("%s received: draining %d workers", signal.Signals(signum).name, len(self.children))
+            self._stopping = True
+
+    def _reap(self) -> list[tuple[int, float]]:
+        """Collect exited workers: [(pid, seconds it ran)]."""
+        exited = []
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            started = self.children.pop(pid, None)
+            if started is not None:
+                exited.append((pid, time.monotonic() - started))
+                if not self._stopping:
+                    logger.warning("Worker %d exited (status %d)", pid, os.waitstatus_to_exitcode(status))
+        return exited
+
+    def run(self) -> None:
+        self._socket = self.config.bind_socket()
+        signal.signal(signal.SIGTERM, self._on_signal)
+        signal.signal(signal.SIGINT, self._on_signal)
+        for _ in range(self.workers):
+            self._spawn()
+        logger.info("Serving on %s:%d with %d workers", self.config.host, self.config.port, self.workers)
+
+        while not self._stopping:
+            for _pid, lifetime in self._reap():
+                if self._stopping:
+                    break
+                if lifetime < _CRASH_WINDOW:
+                    time.sleep(_CRASH_WINDOW)
+                self._spawn()
+            time.sleep(0.1)
+        self._drain()
+
+    def _drain(self) -> None:
+        # New connections now queue in the backlog until the last copy closes, then are refused
+        self._socket.close()
+        for pid in self.children:
+            _kill(pid, signal.SIGTERM)
+        deadline = time.monotonic() + self.drain_timeout + _SHUTDOWN_GRACE
+        while self.children and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.05)
+        for pid in self.children:
+            logger.warning("Worker %d still running after %.0fs, killing it", pid, self.drain_timeout)
+            _kill(pid, signal.SIGKILL)
+        while self.children:
+            self._reap()
+            time.sleep(0.05)
+        logger.info("All workers stopped")
+
+
+def _kill(pid: int, signum: int) -> None:
+    try:
+        os.kill(pid, signum)
+    except ProcessLookupError:
+        pass
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.serve", description="Run FeedbackCue with pre-forked workers")
+    parser.add_argument("--host", default=settings.host)
+    parser.add_argument("--port", type=int, default=settings.port)
+    parser.add_argument("--workers", type=int, default=settings.workers, help="0 = one per CPU")
+    parser.add_argument("--drain-timeout", type=float, default=settings.drain_timeout)
+    parser.add_argument("--no-access-log", dest="access_log", action="store_false")
+    args = parser.parse_args(argv)
+
+    app = preload()
+    config = uvicorn.Config(
+        app,
+        host=args.host,
+        port=args.port,
+        access_log=args.access_log,
+        timeout_graceful_shutdown=args.drain_timeout,
+        log_config=None,  # keep the app's logging setup
+    )
+    Supervisor(config, args.workers or os.cpu_count() or 1, args.drain_timeout).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, insert, literal, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.bus import BOARD_CHANGED, ROADMAP_CHANGED, emit
+from app.models.archive import ArchivedFeedbackItem, ArchivedVote
+from app.models.feedback import FeedbackItem, FeedbackStatus
+from app.models.vote import Vote
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_STATUSES = (FeedbackStatus.CLOSED, FeedbackStatus.SHIPPED)
+ARCHIVE_BATCH_SIZE = 500
+
+_ITEM_COLUMNS = (
+    "id", "title", "description", "status", "category", "vote_count",
+    "author_email", "author_name", "board_id", "merged_into_id", "created_at", "updated_at",
+)
+# Vote ids are rowids that SQLite may hand out again, so each table keeps its own
+_VOTE_COLUMNS = ("feedback_item_id", "voter_key", "created_at")
+
+
+def _copy(source, target, columns: tuple[str, ...], where, extra: dict | None = None):
+    """INSERT INTO target (...) SELECT ... FROM source WHERE ..., column for column."""
+    extra = extra or {}
+    selected = [getattr(source, name) for name in columns]
+    selected += [literal(value, getattr(target, name).type).label(name) for name, value in extra.items()]
+    return insert(target).from_select([*columns, *extra], select(*selected).where(where))
+
+
+async def _move_batch(db: AsyncSession, item_ids: list[str]) -> None:
+    """Move items, the stubs merged into them (merges keep stubs pointing at the live target) and their votes."""
+    now = datetime.now(timezone.utc)
+    moving = or_(FeedbackItem.id.in_(item_ids), FeedbackItem.merged_into_id.in_(item_ids))
+    moving_ids = select(FeedbackItem.id).where(moving)
+    await db.execute(_copy(Vote, ArchivedVote, _VOTE_COLUMNS, Vote.feedback_item_id.in_(moving_ids)))
+    await db.execute(_copy(FeedbackItem, ArchivedFeedbackItem, _ITEM_COLUMNS, moving, {"archived_at": now}))
+    await db.execute(delete(Vote).where(Vote.feedback_item_id.in_(moving_ids)))
+    await db.execute(delete(FeedbackItem).where(moving))
+
+
+async def archive_items(
+    session_factory: async_sessionmaker,
+    older_than_days: int,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+    statuses: tuple[FeedbackStatus, ...] = ARCHIVE_STATUSES,
+    board_id: str | None = None,
+) -> int:
+    """Move terminal-status items untouched for `older_than_days`, with their votes, to the archive tables.
+
+    Works in batches of `batch_size` items, each copied and deleted in its own
+    short transaction, so a crash leaves every item either fully live or fully
+    archived. Returns the number of items archived.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+    candidates = (
+        select(FeedbackItem.id, FeedbackItem.board_id)
+        .where(
+            FeedbackItem.status.in_(statuses),
+            FeedbackItem.updated_at < cutoff,
+            FeedbackItem.merged_into_id.is_(None),
+        )
+        .order_by(FeedbackItem.id)
+        .limit(batch_size)
+    )
+    if board_id is not None:
+        candidates = candidates.where(FeedbackItem.board_id == board_id)
+
+    archived = 0
+    while True:
+        async with session_factory() as db:
+            rows = (await db.execute(candidates)).all()
+            if not rows:
+                break
+            await _move_batch(db, [row.id for row in rows])
+            for changed_board in {row.board_id for row in rows}:
+                emit(db, BOARD_CHANGED, changed_board)
+                emit(db, ROADMAP_CHANGED, changed_board)
+            await db.commit()
+        archived += len(rows)
+        if len(rows) < batch_size:
+            break
+        await asyncio.sleep(0)
+
+    if archived:
+        logger.info("Archived %d feedback items older than %d days", archived, older_than_days)
+    return archived
+
+
+async def get_archived_item(db: AsyncSession, item_id: str) -> ArchivedFeedbackItem | None:
+    result = await db.execute(select(ArchivedFeedbackItem).where(ArchivedFeedbackItem.id == item_id))
+    return result.scalar_one_or_none()
+
+
+async def restore_item(db: AsyncSession, item: ArchivedFeedbackItem) -> FeedbackItem:
+    """Move an archived item, its merge stubs and their votes back into the live tables.
+
+    Restoring a stub restores the item it was merged into.
+    """
+    if item.merged_into_id is not None:
+        item = await get_archived_item(db, item.merged_into_id)
+    restoring = or_(ArchivedFeedbackItem.id == item.id, ArchivedFeedbackItem.merged_into_id == item.id)
+    restoring_ids = select(ArchivedFeedbackItem.id).where(restoring)
+    # Target first: the stubs' merged_into_id must point at a live row
+    await db.execute(_copy(ArchivedFeedbackItem, FeedbackItem, _ITEM_COLUMNS, ArchivedFeedbackItem.id == item.id))
+    await db.execute(
+        _copy(ArchivedFeedbackItem, FeedbackItem, _ITEM_COLUMNS, ArchivedFeedbackItem.merged_into_id == item.id)
+    )
+    await db.execute(_copy(ArchivedVote, Vote, _VOTE_COLUMNS, ArchivedVote.feedback_item_id.in_(restoring_ids)))
+    await db.execute(delete(ArchivedVote).where(ArchivedVote.feedback_item_id.in_(restoring_ids)))
+    await db.execute(delete(ArchivedFeedbackItem).where(restoring))
+    emit(db, BOARD_CHANGED, item.board_id)
+    emit(db, ROADMAP_CHANGED, item.board_id)
+    result = await db.execute(select(FeedbackItem).where(FeedbackItem.id == item.id))
+    return result.scalar_one()
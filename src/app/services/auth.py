@@ -2,10 +2,12 @@ from datetime import datetime, timedelta, timezone
 
 import bcrypt
 from jose import JWTError, jwt
-from sqlalchemy import select
+from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.bus import BOARD_CHANGED, emit
 from app.config import get_settings
+from app.models.board import Board
 from app.models.user import User
 
 settings = get_settings()
@@ -64,3 +66,16 @@ async def authenticate_user(db: AsyncSession, email: str, password: str) -> User
     if user is None or not verify_password(password, user.hashed_password):
         return None
     return user
+
+
+async def delete_user(db: AsyncSession, user: User) -> None:
+    """Delete the account with set-based statements; its boards are soft-deleted for the background purge."""
+    result = await db.execute(
+        update(Board)
+        .where(Board.owner_id == user.id, Board.deleted_at.is_(None))
+        .values(deleted_at=datetime.now(timezone.utc))
+        .returning(Board.id)
+    )
+    for board_id in result.scalars().all():
+        emit(db, BOARD_CHANGED, board_id)
+    await db.execute(delete(User).where(User.id == user.id))
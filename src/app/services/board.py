@@ -1,9 +1,21 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+
 from slugify import slugify
-from sqlalchemy import select, func
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, select, func
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.bus import BOARD_CHANGED, emit
+from app.models.archive import ArchivedFeedbackItem, ArchivedVote
 from app.models.board import Board
 from app.models.feedback import FeedbackItem
+from app.models.vote import Vote
+from app.models.webhook import Webhook, WebhookDelivery
+
+logger = logging.getLogger(__name__)
+
+PURGE_CHUNK_SIZE = 1000
 
 
 async def generate_unique_slug(db: AsyncSession, name: str, exclude_id: str | None = None) -> str:
@@ -37,18 +49,20 @@ async def create_board(db: AsyncSession, name: str, description: str, accent_col
 
 async def get_boards_by_owner(db: AsyncSession, owner_id: str) -> list[Board]:
     result = await db.execute(
-        select(Board).where(Board.owner_id == owner_id).order_by(Board.created_at.desc())
+        select(Board)
+        .where(Board.owner_id == owner_id, Board.deleted_at.is_(None))
+        .order_by(Board.created_at.desc())
     )
     return list(result.scalars().all())
 
 
 async def get_board_by_slug(db: AsyncSession, slug: str) -> Board | None:
-    result = await db.execute(select(Board).where(Board.slug == slug))
+    result = await db.execute(select(Board).where(Board.slug == slug, Board.deleted_at.is_(None)))
     return result.scalar_one_or_none()
 
 
 async def get_board_by_id(db: AsyncSession, board_id: str) -> Board | None:
-    result = await db.execute(select(Board).where(Board.id == board_id))
+    result = await db.execute(select(Board).where(Board.id == board_id, Board.deleted_at.is_(None)))
     return result.scalar_one_or_none()
 
 
@@ -63,12 +77,79 @@ async def update_board(db: AsyncSession, board: Board, **kwargs) -> Board:
         if value is not None:
             setattr(board, key, value)
     await db.flush()
+    emit(db, BOARD_CHANGED, board.id)
     return board
 
 
 async def delete_board(db: AsyncSession, board: Board) -> None:
-    await db.delete(board)
+    """Hide the board immediately; its items and votes are removed later by purge_board()."""
+    board.deleted_at = datetime.now(timezone.utc)
     await db.flush()
+    emit(db, BOARD_CHANGED, board.id)
+
+
+async def _delete_chunk(session_factory: async_sessionmaker, statement) -> int:
+    async with session_factory() as db:
+        result = await db.execute(statement)
+        await db.commit()
+        return result.rowcount
+
+
+async def purge_board(
+    session_factory: async_sessionmaker, board_id: str, chunk_size: int = PURGE_CHUNK_SIZE
+) -> int:
+    """Delete a soft-deleted board's votes, items and row in bounded set-based chunks.
+
+    Each chunk is its own short transaction so the SQLite writer lock is released
+    between chunks and live traffic can interleave. Safe to re-run after a crash.
+    Returns the number of rows deleted.
+    """
+    board_items = select(FeedbackItem.id).where(FeedbackItem.board_id == board_id)
+    archived_items = select(ArchivedFeedbackItem.id).where(ArchivedFeedbackItem.board_id == board_id)
+    statements = [
+        delete(Vote).where(
+            Vote.id.in_(select(Vote.id).where(Vote.feedback_item_id.in_(board_items)).limit(chunk_size))
+        ),
+        delete(FeedbackItem).where(FeedbackItem.id.in_(board_items.limit(chunk_size))),
+        delete(ArchivedVote).where(
+            ArchivedVote.id.in_(
+                select(ArchivedVote.id).where(ArchivedVote.feedback_item_id.in_(archived_items)).limit(chunk_size)
+            )
+        ),
+        delete(ArchivedFeedbackItem).where(ArchivedFeedbackItem.id.in_(archived_items.limit(chunk_size))),
+        delete(WebhookDelivery).where(
+            WebhookDelivery.id.in_(
+                select(WebhookDelivery.id)
+                .where(WebhookDelivery.webhook_id.in_(select(Webhook.id).where(Webhook.board_id == board_id)))
+                .limit(chunk_size)
+            )
+        ),
+        delete(Webhook).where(Webhook.id.in_(select(Webhook.id).where(Webhook.board_id == board_id).limit(chunk_size))),
+    ]
+    deleted = 0
+    for statement in statements:
+        while True:
+            count = await _delete_chunk(session_factory, statement)
+            deleted += count
+            if count < chunk_size:
+                break
+            await asyncio.sleep(0)
+    deleted += await _delete_chunk(
+        session_factory, delete(Board).where(Board.id == board_id, Board.deleted_at.is_not(None))
+    )
+    return deleted
+
+
+async def purge_deleted_boards(session_factory: async_sessionmaker, chunk_size: int = PURGE_CHUNK_SIZE) -> int:
+    async with session_factory() as db:
+        result = await db.execute(select(Board.id).where(Board.deleted_at.is_not(None)))
+        board_ids = list(result.scalars().all())
+    deleted = 0
+    for board_id in board_ids:
+        count = await purge_board(session_factory, board_id, chunk_size)
+        logger.info("Purged deleted board %s (%d rows)", board_id, count)
+        deleted += count
+    return deleted
 
 
 async def get_board_stats(db: AsyncSession, board_id: str) -> dict:
@@ -77,7 +158,7 @@ async def get_board_stats(db: AsyncSession, board_id: str) -> dict:
         select(
             func.count(FeedbackItem.id),
             func.coalesce(func.sum(FeedbackItem.vote_count), 0),
-        ).where(FeedbackItem.board_id == board_id)
+        ).where(FeedbackItem.board_id == board_id, FeedbackItem.merged_into_id.is_(None))
     )
     row = result.one()
     return {"item_count": row[0], "total_votes": row[1]}
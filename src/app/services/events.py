@@ -0,0 +1,50 @@
+from datetime import datetime
+
+from sqlalchemy import Row, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.event import BoardEvent
+
+# Event kinds and their data. Every event that moves an item's vote counter
+# says by how much ("votes", or +1/-1 implied by the vote kinds), so the
+# counter can be rebuilt by summing the log.
+ITEM_CREATED = "item.created"  # data: status
+ITEM_IMPORTED = "item.imported"  # data: status, votes; baseline for items that predate the log
+ITEM_STATUS_CHANGED = "item.status"  # data: from, to
+ITEM_RECATEGORIZED = "item.category"  # data: from, to
+ITEM_DELETED = "item.deleted"  # data: status, votes
+ITEM_MERGED = "item.merged"  # data: into, status, votes (the counter it left with)
+VOTE_ADDED = "vote.added"
+VOTE_REMOVED = "vote.removed"
+VOTES_MERGED = "votes.merged"  # data: votes (net change to the merge target's counter)
+VOTES_CORRECTED = "votes.corrected"  # data: votes (what reconciliation added to bring the log in line with the votes table)
+
+
+# Events are read as plain rows: replaying millions of them shouldn't fill an identity map
+EVENT_COLUMNS = (
+    BoardEvent.id, BoardEvent.board_id, BoardEvent.item_id, BoardEvent.kind, BoardEvent.data, BoardEvent.created_at
+)
+
+
+def log_event(
+    db: AsyncSession, board_id: str, kind: str, item_id: str | None = None, data: dict | None = None
+) -> None:
+    """Append an event to the caller's transaction; it is kept only if that commits."""
+    db.add(BoardEvent(board_id=board_id, item_id=item_id, kind=kind, data=data))
+
+
+async def log_events(db: AsyncSession, events: list[dict]) -> None:
+    """Append many events ({board_id, item_id, kind, data}) with one executemany INSERT."""
+    if events:
+        await db.execute(insert(BoardEvent), [{"item_id": None, "data": None, **event} for event in events])
+
+
+async def get_board_events(
+    db: AsyncSession, board_id: str, after_id: int = 0, until: datetime | None = None, limit: int = 5000
+) -> list[Row]:
+    """One board's events in log order, a page at a time (pass the last id seen as `after_id`)."""
+    query = select(*EVENT_COLUMNS).where(BoardEvent.board_id == board_id, BoardEvent.id > after_id)
+    if until is not None:
+        query = query.where(BoardEvent.created_at <= until)
+    result = await db.execute(query.order_by(BoardEvent.id).limit(limit))
+    return list(result.all())
@@ -1,8 +1,68 @@
-from sqlalchemy import select, func
+import logging
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import Boolean, Select, case, delete, func, literal, or_, select, union_all, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
+from app.bus import BOARD_CHANGED, ITEM_VOTED, ROADMAP_CHANGED, emit
+from app.database import upsert
+from app.models.archive import ArchivedFeedbackItem
+from app.models.board import Board
 from app.models.feedback import FeedbackItem, FeedbackStatus, FeedbackCategory
 from app.models.vote import Vote
+from app.services.events import (
+    ITEM_CREATED,
+    ITEM_DELETED,
+    ITEM_RECATEGORIZED,
+    ITEM_STATUS_CHANGED,
+    VOTE_ADDED,
+    VOTE_REMOVED,
+    log_event,
+    log_events,
+)
+from app.services.merge import resolve_merged
+from app.services.notifications import queue_status_notifications
+from app.services.voter import get_or_create_voter_key, get_voter_key, voter_key_subquery
+from app.services.webhooks import (
+    FEEDBACK_CREATED,
+    FEEDBACK_STATUS_CHANGED,
+    FEEDBACK_VOTED,
+    item_data,
+    record_event,
+)
+
+logger = logging.getLogger(__name__)
+
+# Listings only show a few clamped lines of description; don't ship the rest.
+DESCRIPTION_PREVIEW_CHARS = 300
+
+
+@dataclass(slots=True, frozen=True)
+class FeedbackRow:
+    """Read-only listing row: only the columns board pages display, untracked by the session."""
+
+    id: str
+    title: str
+    description: str | None
+    status: FeedbackStatus
+    category: FeedbackCategory
+    vote_count: int
+    author_name: str | None
+    author_email: str | None
+    created_at: datetime
+    archived: bool = False
+
+
+@dataclass(slots=True, frozen=True)
+class VoteState:
+    """Where a voter's vote on an item stands after set_votes."""
+
+    id: str  # the item the vote counts toward (a merged stub's target)
+    voted: bool
+    vote_count: int
 
 
 async def create_feedback(
@@ -24,9 +84,37 @@ async def create_feedback(
     )
     db.add(item)
     await db.flush()
+    emit(db, BOARD_CHANGED, board_id)
+    log_event(db, board_id, ITEM_CREATED, item.id, {"status": FeedbackStatus(item.status).value})
+    await record_event(db, board_id, FEEDBACK_CREATED, item_data(item))
     return item
 
 
+def _apply_filters(
+    query: Select,
+    board_id: str,
+    status: FeedbackStatus | None,
+    category: FeedbackCategory | None,
+    model: type[FeedbackItem] | type[ArchivedFeedbackItem] = FeedbackItem,
+) -> Select:
+    query = query.where(model.board_id == board_id, model.merged_into_id.is_(None))
+
+    if status:
+        query = query.where(model.status == status)
+    if category:
+        query = query.where(model.category == category)
+    return query
+
+
+def _apply_sort(query: Select, sort_by: str, columns) -> Select:
+    if sort_by == "newest":
+        return query.order_by(columns.created_at.desc())
+    if sort_by == "oldest":
+        return query.order_by(columns.created_at.asc())
+    # votes (default)
+    return query.order_by(columns.vote_count.desc(), columns.created_at.desc())
+
+
 async def get_feedback_for_board(
     db: AsyncSession,
     board_id: str,
@@ -34,22 +122,103 @@ async def get_feedback_for_board(
     category: FeedbackCategory | None = None,
     sort_by: str = "votes",
 ) -> list[FeedbackItem]:
-    query = select(FeedbackItem).where(FeedbackItem.board_id == board_id)
+    query = _apply_sort(_apply_filters(select(FeedbackItem), board_id, status, category), sort_by, FeedbackItem)
+    result = await db.execute(query)
+    return list(result.scalars().all())
 
-    if status:
-        query = query.where(FeedbackItem.status == status)
-    if category:
-        query = query.where(FeedbackItem.category == category)
 
-    if sort_by == "newest":
-        query = query.order_by(FeedbackItem.created_at.desc())
-    elif sort_by == "oldest":
-        query = query.order_by(FeedbackItem.created_at.asc())
-    else:  # votes (default)
-        query = query.order_by(FeedbackItem.vote_count.desc(), FeedbackItem.created_at.desc())
+def _listing_columns(description_chars: int, model: type[FeedbackItem] | type[ArchivedFeedbackItem]) -> Select:
+    return select(
+        model.id,
+        model.title,
+        func.substr(model.description, 1, description_chars).label("description"),
+        model.status,
+        model.category,
+        model.vote_count,
+        model.author_name,
+        model.author_email,
+        model.created_at,
+        literal(model is ArchivedFeedbackItem, Boolean).label("archived"),
+    )
+
 
+def _listing_query(
+    board_id: str,
+    status: FeedbackStatus | None,
+    category: FeedbackCategory | None,
+    sort_by: str,
+    description_chars: int,
+    include_archived: bool,
+) -> Select:
+    live = _apply_filters(_listing_columns(description_chars, FeedbackItem), board_id, status, category)
+    if not include_archived:
+        return _apply_sort(live, sort_by, FeedbackItem)
+    archived = _apply_filters(
+        _listing_columns(description_chars, ArchivedFeedbackItem), board_id, status, category, ArchivedFeedbackItem
+    )
+    combined = union_all(live, archived).subquery()
+    return _apply_sort(select(combined), sort_by, combined.c)
+
+
+async def list_feedback_rows(
+    db: AsyncSession,
+    board_id: str,
+    status: FeedbackStatus | None = None,
+    category: FeedbackCategory | None = None,
+    sort_by: str = "votes",
+    description_chars: int = DESCRIPTION_PREVIEW_CHARS,
+    include_archived: bool = False,
+    limit: int | None = None,
+) -> list[FeedbackRow]:
+    """Projected listing for board pages: displayed columns only, description truncated in SQL.
+
+    Archived items are only included when explicitly asked for.
+    """
+    query = _listing_query(board_id, status, category, sort_by, description_chars, include_archived).limit(limit)
     result = await db.execute(query)
-    return list(result.scalars().all())
+    return [FeedbackRow(*row) for row in result]
+
+
+async def stream_feedback_rows(
+    db: AsyncSession,
+    board_id: str,
+    status: FeedbackStatus | None = None,
+    category: FeedbackCategory | None = None,
+    sort_by: str = "votes",
+    description_chars: int = DESCRIPTION_PREVIEW_CHARS,
+    include_archived: bool = False,
+    batch_size: int = 200,
+) -> AsyncIterator[FeedbackRow]:
+    """Like list_feedback_rows, but yields rows from a server-side cursor in batches."""
+    query = _listing_query(board_id, status, category, sort_by, description_chars, include_archived)
+    result = await db.stream(query)
+    async for partition in result.partitions(batch_size):
+        for row in partition:
+            yield FeedbackRow(*row)
+
+
+async def get_listing_summary(
+    db: AsyncSession,
+    board_id: str,
+    status: FeedbackStatus | None = None,
+    category: FeedbackCategory | None = None,
+    include_archived: bool = False,
+) -> dict:
+    """Item count, vote total and per-status counts for a (filtered) listing, in one grouped query per table."""
+    status_counts = {}
+    total_votes = 0
+    for model in (FeedbackItem, ArchivedFeedbackItem) if include_archived else (FeedbackItem,):
+        query = _apply_filters(
+            select(model.status, func.count(model.id), func.coalesce(func.sum(model.vote_count), 0)),
+            board_id,
+            status,
+            category,
+            model,
+        ).group_by(model.status)
+        for row_status, count, votes in await db.execute(query):
+            status_counts[row_status] = status_counts.get(row_status, 0) + count
+            total_votes += votes
+    return {"item_count": sum(status_counts.values()), "total_votes": total_votes, "status_counts": status_counts}
 
 
 async def get_feedback_by_id(db: AsyncSession, item_id: str) -> FeedbackItem | None:
@@ -58,41 +227,271 @@ async def get_feedback_by_id(db: AsyncSession, item_id: str) -> FeedbackItem | N
 
 
 async def update_feedback_status(db: AsyncSession, item: FeedbackItem, status: FeedbackStatus) -> FeedbackItem:
+    previous = item.status
     item.status = status
     await db.flush()
+    emit(db, BOARD_CHANGED, item.board_id)
+    if previous != status:
+        emit(db, ROADMAP_CHANGED, item.board_id)
+        queue_status_notifications(db, [item.id], status)
+        log_event(
+            db, item.board_id, ITEM_STATUS_CHANGED, item.id, {"from": FeedbackStatus(previous).value, "to": status.value}
+        )
+        await record_event(
+            db,
+            item.board_id,
+            FEEDBACK_STATUS_CHANGED,
+            {**item_data(item), "previous_status": FeedbackStatus(previous).value},
+        )
     return item
 
 
-async def toggle_vote(db: AsyncSession, item_id: str, voter_id: str, voter_email: str | None = None) -> bool:
-    """Toggle vote on a feedback item. Returns True if vote was added, False if removed."""
-    result = await db.execute(
-        select(Vote).where(Vote.feedback_item_id == item_id, Vote.voter_id == voter_id)
+async def bulk_moderate(
+    db: AsyncSession,
+    owner_id: str,
+    board_id: str,
+    item_ids: list[str],
+    status: FeedbackStatus | None = None,
+    category: FeedbackCategory | None = None,
+    delete_items: bool = False,
+) -> dict[str, str]:
+    """Apply one status/category change or a delete to many items with set-based statements.
+
+    Ownership is part of each statement's WHERE clause, so items on someone
+    else's board (or unknown ids) simply don't match. Costs one UPDATE, or two
+    DELETEs (votes, then items), however many ids are passed; an update adds
+    one SELECT of the items' current status and category, so voter
+    notifications and event-log entries are only made for real changes. Returns
+    {item_id: "updated" | "deleted" | "not_found"} in request order.
+    """
+    item_ids = list(dict.fromkeys(item_ids))
+    owned_board = select(Board.id).where(
+        Board.id == board_id, Board.owner_id == owner_id, Board.deleted_at.is_(None)
     )
-    existing_vote = result.scalar_one_or_none()
+    matched = (FeedbackItem.id.in_(item_ids), FeedbackItem.board_id.in_(owned_board))
+    events = []
 
-    item = await get_feedback_by_id(db, item_id)
+    if delete_items:
+        # Stubs merged into a deleted item go with it (merges keep stubs pointing at the live target)
+        doomed = select(FeedbackItem.id).where(*matched)
+        doomed_or_stub = or_(FeedbackItem.id.in_(doomed), FeedbackItem.merged_into_id.in_(doomed))
+        await db.execute(delete(Vote).where(Vote.feedback_item_id.in_(select(FeedbackItem.id).where(doomed_or_stub))))
+        result = await db.execute(
+            delete(FeedbackItem)
+            .where(doomed_or_stub)
+            .returning(FeedbackItem.id, FeedbackItem.status, FeedbackItem.vote_count, FeedbackItem.merged_into_id)
+        )
+        deleted = result.all()
+        changed = {row.id for row in deleted}
+        # Merged stubs already left the board's listing (and the log's counts) when they were merged
+        events = [
+            {
+                "board_id": board_id,
+                "item_id": row.id,
+                "kind": ITEM_DELETED,
+                "data": {"status": FeedbackStatus(row.status).value, "votes": row.vote_count},
+            }
+            for row in deleted
+            if row.merged_into_id is None
+        ]
+        outcome = "deleted"
+    else:
+        values = {}
+        if status is not None:
+            values["status"] = status
+        if category is not None:
+            values["category"] = category
+        if not values:
+            raise ValueError("Nothing to change")
+        current = select(FeedbackItem.id, FeedbackItem.status, FeedbackItem.category, FeedbackItem.merged_into_id)
+        before = {row.id: row for row in await db.execute(current.where(*matched))}
+        # Only items actually changing status notify their voters
+        unchanged = {item_id for item_id, row in before.items() if row.status == status}
+        result = await db.execute(
+            update(FeedbackItem)
+            .where(*matched)
+            .values(**values)
+            .returning(FeedbackItem.id)
+        )
+        changed = set(result.scalars().all())
+        for item_id in item_ids:
+            row = before.get(item_id)
+            if item_id not in changed or row is None or row.merged_into_id is not None:
+                continue
+            for kind, old, new in (
+                (ITEM_STATUS_CHANGED, row.status, status),
+                (ITEM_RECATEGORIZED, row.category, category),
+            ):
+                if new is not None and old != new:
+                    data = {"from": old.value, "to": new.value}
+                    events.append({"board_id": board_id, "item_id": item_id, "kind": kind, "data": data})
+        outcome = "updated"
+
+    await log_events(db, events)
+    if changed:
+        emit(db, BOARD_CHANGED, board_id)
+        if status is not None or delete_items:
+            emit(db, ROADMAP_CHANGED, board_id)
+    if status is not None and not delete_items:
+        status_changed = [i for i in item_ids if i in changed - unchanged]
+        queue_status_notifications(db, status_changed, status)
+        for item_id in status_changed:
+            await record_event(db, board_id, FEEDBACK_STATUS_CHANGED, {"id": item_id, "status": status.value})
+    return {item_id: outcome if item_id in changed else "not_found" for item_id in item_ids}
+
+
+async def toggle_vote(db: AsyncSession, item_id: str, voter_id: str, voter_email: str | None = None) -> bool:
+    """Toggle vote on a feedback item. Returns True if vote was added, False if removed.
+
+    Votes on a merged stub count toward the item it was merged into.
+    """
+    item = await resolve_merged(db, await get_feedback_by_id(db, item_id))
     if item is None:
         return False
+    item_id = item.id
+
+    voter_key = await get_or_create_voter_key(db, voter_id, voter_email)
+    result = await db.execute(
+        select(Vote).where(Vote.feedback_item_id == item_id, Vote.voter_key == voter_key)
+    )
+    existing_vote = result.scalar_one_or_none()
 
+    emit(db, BOARD_CHANGED, item.board_id)
+    emit(db, ITEM_VOTED, item.id)
     if existing_vote:
         await db.delete(existing_vote)
+        if item.vote_count <= 0:
+            logger.warning("vote_count drift on item %s (count %d with a vote present)", item.id, item.vote_count)
         item.vote_count = max(0, item.vote_count - 1)
         await db.flush()
+        log_event(db, item.board_id, VOTE_REMOVED, item.id)
+        await _record_vote(db, item, added=False)
         return False
     else:
-        vote = Vote(
-            feedback_item_id=item_id,
-            voter_id=voter_id,
-            voter_email=voter_email,
-        )
+        vote = Vote(feedback_item_id=item_id, voter_key=voter_key)
         db.add(vote)
         item.vote_count += 1
         await db.flush()
+        log_event(db, item.board_id, VOTE_ADDED, item.id)
+        await _record_vote(db, item, added=True)
         return True
 
 
+async def set_votes(
+    db: AsyncSession, board_id: str, voter_id: str, wanted: dict[str, bool], voter_email: str | None = None
+) -> dict[str, VoteState | None]:
+    """Bring one voter's votes on many items to the wanted state in one transaction.
+
+    Idempotent: each entry says whether the vote should exist, so replaying a
+    batch changes nothing. Items are resolved (merged stubs to their targets)
+    and checked against the board in one query; votes go in with one INSERT
+    .. ON CONFLICT DO NOTHING and out with one DELETE, and counters only move
+    for the rows those statements actually touched. Returns
+    {item_id: VoteState, or None if the item isn't on the board} in request order.
+    """
+    target = aliased(FeedbackItem)
+    result = await db.execute(
+        select(FeedbackItem.id, target.id, target.vote_count)
+        .join(target, target.id == func.coalesce(FeedbackItem.merged_into_id, FeedbackItem.id))
+        .where(FeedbackItem.id.in_(list(wanted)), FeedbackItem.board_id == board_id)
+    )
+    resolved: dict[str, str] = {}
+    counts: dict[str, int] = {}
+    for item_id, target_id, vote_count in result:
+        resolved[item_id] = target_id
+        counts[target_id] = vote_count
+
+    # Several ids may resolve to one target (a stub and its target); the last entry wins
+    desired = {resolved[item_id]: voted for item_id, voted in wanted.items() if item_id in resolved}
+    to_add = [target_id for target_id, voted in desired.items() if voted]
+    to_remove = [target_id for target_id, voted in desired.items() if not voted]
+
+    if to_add:
+        voter_key = await get_or_create_voter_key(db, voter_id, voter_email)
+    else:
+        voter_key = await get_voter_key(db, voter_id)
+
+    added: list[str] = []
+    removed: list[str] = []
+    if to_add:
+        result = await db.execute(
+            upsert(db, Vote)
+            .values([{"feedback_item_id": target_id, "voter_key": voter_key} for target_id in to_add])
+            .on_conflict_do_nothing(index_elements=[Vote.feedback_item_id, Vote.voter_key])
+            .returning(Vote.feedback_item_id)
+        )
+        added = list(result.scalars())
+    if to_remove and voter_key is not None:
+        result = await db.execute(
+            delete(Vote)
+            .where(Vote.voter_key == voter_key, Vote.feedback_item_id.in_(to_remove))
+            .returning(Vote.feedback_item_id)
+        )
+        removed = list(result.scalars())
+
+    decrement = case((FeedbackItem.vote_count > 0, FeedbackItem.vote_count - 1), else_=0)
+    for changed, new_count in ((added, FeedbackItem.vote_count + 1), (removed, decrement)):
+        if changed:
+            result = await db.execute(
+                update(FeedbackItem)
+                .where(FeedbackItem.id.in_(changed))
+                .values(vote_count=new_count)
+                .returning(FeedbackItem.id, FeedbackItem.vote_count)
+                .execution_options(synchronize_session="fetch")
+            )
+            counts.update((target_id, vote_count) for target_id, vote_count in result)
+
+    if added or removed:
+        emit(db, BOARD_CHANGED, board_id)
+        await log_events(
+            db,
+            [{"board_id": board_id, "item_id": target_id, "kind": VOTE_ADDED} for target_id in added]
+            + [{"board_id": board_id, "item_id": target_id, "kind": VOTE_REMOVED} for target_id in removed],
+        )
+    for changed, was_added in ((added, True), (removed, False)):
+        for target_id in changed:
+            emit(db, ITEM_VOTED, target_id)
+            await record_event(
+                db, board_id, FEEDBACK_VOTED, {"id": target_id, "vote_count": counts[target_id], "added": was_added}
+            )
+    return {
+        item_id: VoteState(resolved[item_id], desired[resolved[item_id]], counts[resolved[item_id]])
+        if item_id in resolved
+        else None
+        for item_id in wanted
+    }
+
+
+async def _record_vote(db: AsyncSession, item: FeedbackItem, added: bool) -> None:
+    await record_event(
+        db, item.board_id, FEEDBACK_VOTED, {"id": item.id, "vote_count": item.vote_count, "added": added}
+    )
+
+
 async def has_voted(db: AsyncSession, item_id: str, voter_id: str) -> bool:
     result = await db.execute(
-        select(Vote).where(Vote.feedback_item_id == item_id, Vote.voter_id == voter_id)
+        select(Vote.id).where(Vote.feedback_item_id == item_id, Vote.voter_key == voter_key_subquery(voter_id))
     )
     return result.scalar_one_or_none() is not None
+
+
+async def get_voted_item_ids(db: AsyncSession, item_ids: list[str], voter_id: str) -> set[str]:
+    """Return the subset of item_ids the voter has voted on, in one query."""
+    if not item_ids:
+        return set()
+    result = await db.execute(
+        select(Vote.feedback_item_id).where(
+            Vote.voter_key == voter_key_subquery(voter_id), Vote.feedback_item_id.in_(item_ids)
+        )
+    )
+    return set(result.scalars().all())
+
+
+async def get_voted_item_ids_for_board(db: AsyncSession, board_id: str, voter_id: str) -> set[str]:
+    """All items on a board the voter has voted on (used when the item list is streamed)."""
+    result = await db.execute(
+        select(Vote.feedback_item_id)
+        .join(FeedbackItem, FeedbackItem.id == Vote.feedback_item_id)
+        .where(FeedbackItem.board_id == board_id, Vote.voter_key == voter_key_subquery(voter_id))
+    )
+    return set(result.scalars().all())
@@ -0,0 +1,143 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.jobs import enqueue, mark_enqueued
+from app.models.job import Job, JobSchedule, JobStatus
+
+# Finished jobs sampled per stats request for the latency percentiles
+LATENCY_SAMPLE = 5000
+
+
+def _utc(value: datetime | None) -> datetime | None:
+    # SQLite hands datetimes back naive; they are stored in UTC
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _percentile(values: list[float], pct: float) -> float | None:
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(len(values) * pct))], 3)
+
+
+async def get_queue_stats(db: AsyncSession, window_hours: float = 24) -> dict:
+    """Queue depth per kind plus wait/run latency of jobs finished within the window.
+
+    Wait is started_at - run_after (time spent due but unclaimed); run is
+    finished_at - started_at of the successful attempt.
+    """
+    now = datetime.now(timezone.utc)
+    since = now - timedelta(hours=window_hours)
+    kinds: dict[str, dict] = {}
+
+    def kind_stats(kind: str) -> dict:
+        return kinds.setdefault(
+            kind,
+            {"kind": kind, "queued": 0, "scheduled": 0, "running": 0, "done": 0, "failed": 0, "oldest_wait": None},
+        )
+
+    due = Job.run_after <= now
+    result = await db.execute(
+        select(Job.kind, Job.status, due, func.count(), func.min(Job.run_after))
+        .where(Job.status.in_([JobStatus.QUEUED, JobStatus.RUNNING]))
+        .group_by(Job.kind, Job.status, due)
+    )
+    for kind, status, is_due, count, oldest in result.all():
+        stats = kind_stats(kind)
+        if status == JobStatus.RUNNING:
+            stats["running"] += count
+        elif is_due:
+            stats["queued"] += count
+            stats["oldest_wait"] = round((now - _utc(oldest)).total_seconds(), 3)
+        else:
+            stats["scheduled"] += count
+
+    result = await db.execute(
+        select(Job.kind, Job.status, func.count())
+        .where(Job.status.in_([JobStatus.DONE, JobStatus.FAILED]), Job.finished_at >= since)
+        .group_by(Job.kind, Job.status)
+    )
+    for kind, status, count in result.all():
+        kind_stats(kind)["done" if status == JobStatus.DONE else "failed"] = count
+
+    result = await db.execute(
+        select(Job.kind, Job.run_after, Job.started_at, Job.finished_at)
+        .where(Job.status == JobStatus.DONE, Job.finished_at >= since, Job.started_at.is_not(None))
+        .order_by(Job.finished_at.desc())
+        .limit(LATENCY_SAMPLE)
+    )
+    waits: dict[str, list[float]] = {}
+    runs: dict[str, list[float]] = {}
+    for kind, run_after, started_at, finished_at in result.all():
+        started_at = _utc(started_at)
+        waits.setdefault(kind, []).append(max(0.0, (started_at - _utc(run_after)).total_seconds()))
+        runs.setdefault(kind, []).append((_utc(finished_at) - started_at).total_seconds())
+    for kind, stats in kinds.items():
+        stats["wait_p50"] = _percentile(waits.get(kind, []), 0.5)
+        stats["wait_p95"] = _percentile(waits.get(kind, []), 0.95)
+        stats["run_p50"] = _percentile(runs.get(kind, []), 0.5)
+        stats["run_p95"] = _percentile(runs.get(kind, []), 0.95)
+
+    schedules = (await db.execute(select(JobSchedule).order_by(JobSchedule.name))).scalars().all()
+    failures = (
+        await db.execute(
+            select(Job).where(Job.status == JobStatus.FAILED).order_by(Job.finished_at.desc()).limit(20)
+        )
+    ).scalars().all()
+    return {
+        "window_hours": window_hours,
+        "kinds": sorted(kinds.values(), key=lambda stats: stats["kind"]),
+        "schedules": [
+            {
+                "name": row.name,
+                "kind": row.kind,
+                "cron": row.cron,
+                "interval": row.interval,
+                "enabled": row.enabled,
+                "next_run_at": _utc(row.next_run_at),
+                "last_run_at": _utc(row.last_run_at),
+            }
+            for row in schedules
+        ],
+        "failures": [
+            {
+                "id": job.id,
+                "kind": job.kind,
+                "attempts": job.attempts,
+                "last_error": job.last_error,
+                "finished_at": _utc(job.finished_at),
+            }
+            for job in failures
+        ],
+    }
+
+
+async def run_schedule_now(db: AsyncSession, name: str) -> Job | None:
+    """Enqueue one run of a schedule's job right away, outside its timetable."""
+    row = await db.get(JobSchedule, name)
+    if row is None:
+        return None
+    return enqueue(db, row.kind, dict(row.payload))
+
+
+async def retry_failed_job(db: AsyncSession, job_id: int) -> bool:
+    """Put a failed job back in the queue with a fresh set of attempts."""
+    result = await db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == JobStatus.FAILED)
+        .values(
+            status=JobStatus.QUEUED,
+            attempts=0,
+            run_after=datetime.now(timezone.utc),
+            finished_at=None,
+            locked_by=None,
+            locked_until=None,
+        )
+    )
+    if result.rowcount:
+        mark_enqueued(db)
+    return bool(result.rowcount)
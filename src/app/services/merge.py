@@ -0,0 +1,167 @@
+import asyncio
+import logging
+
+from sqlalchemy import delete, func, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.bus import BOARD_CHANGED, ITEM_VOTED, ROADMAP_CHANGED, emit
+from app.database import upsert
+from app.models.feedback import FeedbackItem, FeedbackStatus
+from app.models.vote import Vote
+from app.services.events import ITEM_MERGED, VOTES_MERGED, log_event, log_events
+
+logger = logging.getLogger(__name__)
+
+MERGE_CHUNK_SIZE = 5000
+
+
+class MergeError(ValueError):
+    pass
+
+
+async def _load_merge(db: AsyncSession, target_id: str, source_ids: list[str]) -> tuple[FeedbackItem, list[str]]:
+    source_ids = [item_id for item_id in dict.fromkeys(source_ids) if item_id != target_id]
+    if not source_ids:
+        raise MergeError("Pick at least one item to merge into the target")
+    result = await db.execute(select(FeedbackItem).where(FeedbackItem.id.in_([target_id, *source_ids])))
+    items = {item.id: item for item in result.scalars()}
+    target = items.get(target_id)
+    if target is None or target.merged_into_id is not None:
+        raise MergeError("Target item not found")
+    for source_id in source_ids:
+        source = items.get(source_id)
+        if source is None or source.board_id != target.board_id:
+            raise MergeError(f"Item {source_id} is not on this board")
+        if source.merged_into_id not in (None, target.id):
+            raise MergeError(f"Item {source_id} was already merged elsewhere")
+    return target, source_ids
+
+
+async def _move_votes(db: AsyncSession, target_id: str, source_ids: list[str], limit: int | None = None) -> int:
+    """Copy source votes onto the target, one row per voter, then drop them. Returns source votes moved."""
+    moving = select(Vote.id).where(Vote.feedback_item_id.in_(source_ids))
+    if limit is not None:
+        moving = moving.order_by(Vote.id).limit(limit)
+    # Voters who voted on several of these items collapse to one row (GROUP BY), and
+    # those who already voted on the target are skipped by uq_vote_per_voter.
+    await db.execute(
+        upsert(db, Vote)
+        .from_select(
+            ["feedback_item_id", "voter_key", "created_at"],
+            select(literal(target_id), Vote.voter_key, func.min(Vote.created_at))
+            .where(Vote.id.in_(moving))
+            .group_by(Vote.voter_key),
+        )
+        .on_conflict_do_nothing(index_elements=["feedback_item_id", "voter_key"])
+    )
+    result = await db.execute(delete(Vote).where(Vote.id.in_(moving)))
+    return result.rowcount
+
+
+async def _recount(db: AsyncSession, target: FeedbackItem) -> None:
+    actual = select(func.count(Vote.id)).where(Vote.feedback_item_id == target.id).scalar_subquery()
+    before = await db.scalar(select(FeedbackItem.vote_count).where(FeedbackItem.id == target.id))
+    await db.execute(update(FeedbackItem).where(FeedbackItem.id == target.id).values(vote_count=actual))
+    emit(db, BOARD_CHANGED, target.board_id)
+    emit(db, ROADMAP_CHANGED, target.board_id)
+    emit(db, ITEM_VOTED, target.id)
+    await db.refresh(target)
+    if target.vote_count != before:
+        log_event(db, target.board_id, VOTES_MERGED, target.id, {"votes": target.vote_count - before})
+
+
+async def _mark_merged(db: AsyncSession, target_id: str, source_ids: list[str]) -> None:
+    merging = await db.execute(
+        select(FeedbackItem.id, FeedbackItem.board_id, FeedbackItem.status, FeedbackItem.vote_count).where(
+            FeedbackItem.id.in_(source_ids), FeedbackItem.merged_into_id.is_(None)
+        )
+    )
+    await log_events(
+        db,
+        [
+            {
+                "board_id": row.board_id,
+                "item_id": row.id,
+                "kind": ITEM_MERGED,
+                "data": {"into": target_id, "status": FeedbackStatus(row.status).value, "votes": row.vote_count},
+            }
+            for row in merging
+        ],
+    )
+    # Stubs stay behind so old links and vote buttons resolve to the target; stubs
+    # that pointed at a source now point straight at the target.
+    await db.execute(
+        update(FeedbackItem)
+        .where(FeedbackItem.id.in_(source_ids) | FeedbackItem.merged_into_id.in_(source_ids))
+        .values(merged_into_id=target_id, vote_count=0)
+    )
+
+
+async def merge_feedback(db: AsyncSession, target_id: str, source_ids: list[str]) -> FeedbackItem:
+    """Merge source items into the target in one transaction.
+
+    Votes move with a single INSERT ... SELECT ... ON CONFLICT DO NOTHING, so a
+    voter who backed several of the items keeps exactly one vote on the target;
+    vote_count is then recomputed once from the votes table.
+    """
+    target, source_ids = await _load_merge(db, target_id, source_ids)
+    await _mark_merged(db, target.id, source_ids)
+    await _move_votes(db, target.id, source_ids)
+    await _recount(db, target)
+    return target
+
+
+async def merge_feedback_chunked(
+    session_factory: async_sessionmaker,
+    target_id: str,
+    source_ids: list[str],
+    chunk_size: int = MERGE_CHUNK_SIZE,
+) -> FeedbackItem:
+    """Same as merge_feedback, but moves votes in `chunk_size` transactions for very large items.
+
+    Sources are marked merged first, so new votes already land on the target
+    while the move runs. Re-running with the same arguments resumes an
+    interrupted merge.
+    """
+    async with session_factory() as db:
+        target, source_ids = await _load_merge(db, target_id, source_ids)
+        await _mark_merged(db, target.id, source_ids)
+        await db.commit()
+
+    moved = 0
+    while True:
+        async with session_factory() as db:
+            count = await _move_votes(db, target.id, source_ids, limit=chunk_size)
+            await db.commit()
+        moved += count
+        if count < chunk_size:
+            break
+        await asyncio.sleep(0)
+
+    async with session_factory() as db:
+        target = await db.get(FeedbackItem, target.id)
+        await _recount(db, target)
+        await db.commit()
+    logger.info("Merged %d items into %s (%d source votes moved)", len(source_ids), target.id, moved)
+    return target
+
+
+async def pick_merge_target(db: AsyncSession, board_id: str, item_ids: list[str]) -> str | None:
+    """The most-voted of the given items on the board (oldest wins ties)."""
+    return await db.scalar(
+        select(FeedbackItem.id)
+        .where(
+            FeedbackItem.id.in_(item_ids),
+            FeedbackItem.board_id == board_id,
+            FeedbackItem.merged_into_id.is_(None),
+        )
+        .order_by(FeedbackItem.vote_count.desc(), FeedbackItem.created_at)
+        .limit(1)
+    )
+
+
+async def resolve_merged(db: AsyncSession, item: FeedbackItem | None) -> FeedbackItem | None:
+    """Follow a merged stub to the item it was merged into."""
+    if item is None or item.merged_into_id is None:
+        return item
+    return await db.get(FeedbackItem, item.merged_into_id)
@@ -0,0 +1,104 @@
+import logging
+from email.message import EmailMessage
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemLoader
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.jobs import JobContext, enqueue, job_handler
+from app.mailer import get_mailer
+from app.models.board import Board
+from app.models.feedback import FeedbackItem, FeedbackStatus
+from app.models.vote import Vote
+from app.models.voter import Voter
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+NOTIFY_STATUSES = (FeedbackStatus.PLANNED, FeedbackStatus.SHIPPED)
+STATUS_CHANGE_JOB = "notify-status-change"
+
+TEMPLATES_DIR = Path(__file__).parent.parent / "templates" / "emails"
+env = Environment(loader=FileSystemLoader(str(TEMPLATES_DIR)), autoescape=False, keep_trailing_newline=True)
+
+
+def queue_status_notifications(db: AsyncSession, item_ids: list[str], status: FeedbackStatus) -> None:
+    """Enqueue voter emails for items that just moved to a notifying status (commits with the caller)."""
+    if status not in NOTIFY_STATUSES:
+        return
+    for item_id in item_ids:
+        enqueue(db, STATUS_CHANGE_JOB, {"item_id": item_id, "status": status.value})
+
+
+@job_handler(STATUS_CHANGE_JOB)
+async def send_status_notifications(ctx: JobContext) -> None:
+    """Email everyone who voted on the item with an address, in keyset-paginated batches.
+
+    The message is rendered once per item; each batch is deduplicated by
+    address and sent over the pooled SMTP connections. Progress is
+    checkpointed after every batch so a retry resumes where it stopped.
+    """
+    mailer = get_mailer()
+    if mailer is None:
+        logger.info("SMTP not configured, skipping notifications for item %s", ctx.payload["item_id"])
+        return
+
+    async with ctx.session_factory() as db:
+        row = (
+            await db.execute(
+                select(FeedbackItem, Board)
+                .join(Board, Board.id == FeedbackItem.board_id)
+                .where(FeedbackItem.id == ctx.payload["item_id"])
+            )
+        ).one_or_none()
+    if row is None:
+        return
+    item, board = row
+    if item.status.value != ctx.payload["status"]:
+        # Moved on again before we got to it; the newer change has its own job
+        return
+
+    status_label = item.status.value.replace("_", " ").title()
+    # Titles are user input; a CR/LF would make the Subject header invalid
+    subject = f'"{" ".join(item.title.split())}" is now {status_label}'
+    body = env.get_template("status_change.txt").render(
+        item=item, board=board, status_label=status_label, board_url=f"{settings.public_url}/b/{board.slug}"
+    )
+
+    after = ctx.payload.get("after_voter", 0)
+    sent = ctx.payload.get("sent", 0)
+    seen: set[str] = set()
+    while True:
+        async with ctx.session_factory() as db:
+            result = await db.execute(
+                select(Voter.id, func.lower(Voter.email))
+                .join(Vote, Vote.voter_key == Voter.id)
+                .where(Vote.feedback_item_id == item.id, Voter.email.is_not(None), Voter.id > after)
+                .order_by(Voter.id)
+                .limit(settings.notify_batch_size)
+            )
+            rows = result.all()
+        if not rows:
+            break
+
+        messages = []
+        for _, email in rows:
+            if email in seen:
+                continue
+            seen.add(email)
+            message = EmailMessage()
+            message["From"] = settings.smtp_from
+            message["To"] = email
+            message["Subject"] = subject
+            message.set_content(body)
+            messages.append(message)
+
+        report = await mailer.send_many(messages)
+        sent += report.sent
+        after = rows[-1][0]
+        await ctx.checkpoint(after_voter=after, sent=sent)
+
+    logger.info("Notified %d voters that item %s is %s", sent, item.id, item.status.value)
@@ -0,0 +1,197 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import Row, delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.board import Board
+from app.models.event import BoardEvent, RankingSnapshot
+from app.services.events import (
+    ITEM_CREATED,
+    ITEM_DELETED,
+    ITEM_IMPORTED,
+    ITEM_MERGED,
+    VOTE_ADDED,
+    VOTE_REMOVED,
+    VOTES_CORRECTED,
+    VOTES_MERGED,
+    get_board_events,
+)
+
+# Events folded per query when replaying the log past a snapshot
+_REPLAY_BATCH = 1000
+
+# Event ids follow commit order and timestamps are taken just before, so an
+# event stamped after T can precede one stamped before it only by about the
+# length of a write transaction. A replay to T stops at the first event
+# stamped this much later, instead of scanning the rest of the board's log.
+_CLOCK_SKEW = timedelta(minutes=5)
+
+
+def _utc(at: datetime) -> datetime:
+    return at.astimezone(timezone.utc) if at.tzinfo else at.replace(tzinfo=timezone.utc)
+
+
+def apply_event(counts: dict[str, int], event: Row) -> None:
+    """Fold one event into {item_id: votes} for the board's live items, kept in creation order."""
+    if event.kind == ITEM_CREATED:
+        counts[event.item_id] = 0
+    elif event.kind == ITEM_IMPORTED:
+        counts[event.item_id] = event.data["votes"]
+    elif event.kind in (ITEM_DELETED, ITEM_MERGED):
+        counts.pop(event.item_id, None)
+    elif event.item_id in counts:
+        if event.kind == VOTE_ADDED:
+            counts[event.item_id] += 1
+        elif event.kind == VOTE_REMOVED:
+            counts[event.item_id] -= 1
+        elif event.kind in (VOTES_MERGED, VOTES_CORRECTED):
+            counts[event.item_id] += event.data["votes"]
+
+
+def rank_items(counts: dict[str, int]) -> dict[str, int]:
+    """1-based ranks as the board's default "votes" sort orders them: most votes first, newest first on ties."""
+    order = sorted(enumerate(counts.items()), key=lambda entry: (-entry[1][1], -entry[0]))
+    return {item_id: rank for rank, (_, (item_id, _votes)) in enumerate(order, start=1)}
+
+
+async def _replay(db: AsyncSession, board_id: str, counts: dict[str, int], after_id: int, until: datetime | None) -> int:
+    """Fold the board's events after `after_id` (stamped up to `until`) into `counts`; returns the last id seen."""
+    # SQLite hands back naive UTC datetimes
+    cutoff = until.replace(tzinfo=None) if until is not None else None
+    while events := await get_board_events(db, board_id, after_id=after_id, limit=_REPLAY_BATCH):
+        for event in events:
+            if cutoff is not None and event.created_at > cutoff:
+                if event.created_at > cutoff + _CLOCK_SKEW:
+                    return after_id
+                continue
+            apply_event(counts, event)
+        after_id = events[-1].id
+    return after_id
+
+
+async def _latest_snapshot(db: AsyncSession, board_id: str, at: datetime | None = None) -> RankingSnapshot | None:
+    query = select(RankingSnapshot).where(RankingSnapshot.board_id == board_id)
+    if at is not None:
+        query = query.where(RankingSnapshot.taken_at <= at)
+    return await db.scalar(query.order_by(RankingSnapshot.taken_at.desc(), RankingSnapshot.id.desc()).limit(1))
+
+
+async def get_counts_at(db: AsyncSession, board_id: str, at: datetime) -> dict[str, int]:
+    """{item_id: votes} for the items live on the board at `at`: the nearest earlier snapshot plus later events."""
+    at = _utc(at)
+    snapshot = await _latest_snapshot(db, board_id, at)
+    counts = dict(zip(snapshot.item_ids, snapshot.votes)) if snapshot else {}
+    await _replay(db, board_id, counts, snapshot.last_event_id if snapshot else 0, at)
+    return counts
+
+
+async def get_ranking_at(db: AsyncSession, board_id: str, at: datetime, limit: int = 50) -> list[dict]:
+    """The board's top `limit` items at `at`: [{"item_id", "votes", "rank"}] in rank order."""
+    counts = await get_counts_at(db, board_id, at)
+    ranks = rank_items(counts)
+    top = sorted(ranks, key=ranks.get)[:limit]
+    return [{"item_id": item_id, "votes": counts[item_id], "rank": ranks[item_id]} for item_id in top]
+
+
+async def get_item_standing_at(db: AsyncSession, board_id: str, item_id: str, at: datetime) -> dict | None:
+    """{"votes", "rank", "of"} for one item at `at`, or None if it didn't exist (or was gone) then."""
+    counts = await get_counts_at(db, board_id, at)
+    if item_id not in counts:
+        return None
+    return {"votes": counts[item_id], "rank": rank_items(counts)[item_id], "of": len(counts)}
+
+
+async def get_item_history(
+    db: AsyncSession, board_id: str, item_id: str, start: datetime, end: datetime, max_points: int = 100
+) -> list[dict]:
+    """[{"at", "votes", "rank"}] for one item from snapshots in [start, end], then its standing at `end`.
+
+    At most `max_points` snapshots are read, evenly spaced over the window: the
+    ids come from an index-only scan, and only the chosen rows' columns are
+    decoded. Snapshots where the item wasn't live are skipped.
+    """
+    start, end = _utc(start), _utc(end)
+    snapshot_ids = list(
+        (
+            await db.execute(
+                select(RankingSnapshot.id)
+                .where(
+                    RankingSnapshot.board_id == board_id,
+                    RankingSnapshot.taken_at >= start,
+                    RankingSnapshot.taken_at <= end,
+                )
+                .order_by(RankingSnapshot.taken_at)
+            )
+        ).scalars()
+    )
+    if len(snapshot_ids) > max_points > 1:
+        step = (len(snapshot_ids) - 1) / (max_points - 1)
+        snapshot_ids = list(dict.fromkeys(snapshot_ids[round(n * step)] for n in range(max_points)))
+    rows = await db.execute(
+        select(RankingSnapshot.taken_at, RankingSnapshot.item_ids, RankingSnapshot.votes, RankingSnapshot.ranks)
+        .where(RankingSnapshot.id.in_(snapshot_ids))
+        .order_by(RankingSnapshot.taken_at)
+    )
+    points = []
+    for taken_at, item_ids, votes, ranks in rows:
+        try:
+            index = item_ids.index(item_id)
+        except ValueError:
+            continue
+        points.append({"at": _utc(taken_at), "votes": votes[index], "rank": ranks[index]})
+    standing = await get_item_standing_at(db, board_id, item_id, end)
+    if standing is not None and (not points or points[-1]["at"] < end):
+        points.append({"at": end, "votes": standing["votes"], "rank": standing["rank"]})
+    return points
+
+
+async def snapshot_board(db: AsyncSession, board_id: str) -> RankingSnapshot | None:
+    """Record the board's counts and ranks if anything has happened since its last snapshot."""
+    previous = await _latest_snapshot(db, board_id)
+    after_id = previous.last_event_id if previous else 0
+    newest = await db.scalar(select(func.max(BoardEvent.id)).where(BoardEvent.board_id == board_id))
+    if newest is None or newest <= after_id:
+        return None
+
+    counts = dict(zip(previous.item_ids, previous.votes)) if previous else {}
+    last_event_id = await _replay(db, board_id, counts, after_id, None)
+    ranks = rank_items(counts)
+    snapshot = RankingSnapshot(
+        board_id=board_id,
+        taken_at=datetime.now(timezone.utc),
+        last_event_id=last_event_id,
+        item_ids=list(counts),
+        votes=list(counts.values()),
+        ranks=[ranks[item_id] for item_id in counts],
+    )
+    db.add(snapshot)
+    return snapshot
+
+
+async def take_ranking_snapshots(session_factory: async_sessionmaker) -> int:
+    """Snapshot every board that changed since its last snapshot, one transaction per board."""
+    async with session_factory() as db:
+        board_ids = list((await db.execute(select(Board.id).where(Board.deleted_at.is_(None)))).scalars())
+    taken = 0
+    for board_id in board_ids:
+        async with session_factory() as db:
+            if await snapshot_board(db, board_id) is not None:
+                taken += 1
+            await db.commit()
+    return taken
+
+
+async def thin_ranking_snapshots(session_factory: async_sessionmaker, keep_all_days: int) -> int:
+    """Past `keep_all_days`, keep only each board's first snapshot of every UTC day."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=keep_all_days)
+    first_of_day = (
+        select(func.min(RankingSnapshot.id))
+        .where(RankingSnapshot.taken_at < cutoff)
+        .group_by(RankingSnapshot.board_id, func.date(RankingSnapshot.taken_at))
+    )
+    async with session_factory() as db:
+        result = await db.execute(
+            delete(RankingSnapshot).where(RankingSnapshot.taken_at < cutoff, RankingSnapshot.id.not_in(first_of_day))
+        )
+        await db.commit()
+    return result.rowcount
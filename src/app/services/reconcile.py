@@ -0,0 +1,140 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.bus import BOARD_CHANGED, emit
+from app.models.feedback import FeedbackItem
+from app.models.vote import Vote
+from app.projections import PROJECTIONS, ItemVotes, catch_up, fold_next_batch, read_item_votes
+from app.services.events import VOTES_CORRECTED, log_events
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReconcileReport:
+    scanned: int = 0
+    mismatched: int = 0
+    repaired: int = 0
+    total_drift: int = 0  # sum of |stored - actual| over mismatched items
+    max_drift: int = 0
+    log_corrected: int = 0  # items whose event-log count was corrected
+    log_deferred: int = 0  # batches whose log check waited for the next run (events arrived faster than one fold)
+    duration: float = 0.0
+    boards: set[str] = field(default_factory=set)
+
+    def as_dict(self) -> dict:
+        return {
+            "scanned": self.scanned,
+            "mismatched": self.mismatched,
+            "repaired": self.repaired,
+            "total_drift": self.total_drift,
+            "max_drift": self.max_drift,
+            "log_corrected": self.log_corrected,
+            "log_deferred": self.log_deferred,
+            "boards_affected": len(self.boards),
+            "duration_seconds": round(self.duration, 3),
+        }
+
+
+async def reconcile_vote_counts(
+    session_factory: async_sessionmaker,
+    batch_size: int = 500,
+    pause: float = 0.05,
+    repair: bool = True,
+) -> ReconcileReport:
+    """Compare FeedbackItem.vote_count with the votes table and repair drift.
+
+    Items are walked in keyset-paginated batches by id; each batch costs one
+    grouped COUNT query and, when something drifted, one UPDATE that recomputes
+    the count with a correlated subquery (so a vote landing between the read and
+    the write is not lost). Every batch is its own short transaction, followed
+    by `pause` seconds of sleep so the job never hogs the database.
+
+    When repairing, the event log is brought in line too: items whose
+    item_votes count differs from the votes table get a votes.corrected event
+    for the difference, so a projection rebuild or a ranking replay agrees
+    with the repaired column instead of undoing it. The log backlog is folded
+    up front in committed batches; each item batch then folds at most one
+    more batch of events, and skips the log check if that didn't catch up.
+    """
+    report = ReconcileReport()
+    started = time.monotonic()
+    item_votes = PROJECTIONS[ItemVotes.name]
+    if repair:
+        await catch_up(session_factory, item_votes, pause=pause)
+    last_id = ""
+    while True:
+        async with session_factory() as db:
+            log_current = False
+            if repair:
+                # The fold's first write takes the write lock: the log counts and vote counts read below can't diverge
+                log_current = await fold_next_batch(db, item_votes)
+            result = await db.execute(
+                select(FeedbackItem.id, FeedbackItem.board_id, FeedbackItem.vote_count)
+                .where(FeedbackItem.id > last_id)
+                .order_by(FeedbackItem.id)
+                .limit(batch_size)
+            )
+            rows = result.all()
+            if not rows:
+                await db.commit()  # keeps whatever the catch-up folded
+                break
+            item_ids = [row.id for row in rows]
+            counts = dict(
+                (
+                    await db.execute(
+                        select(Vote.feedback_item_id, func.count(Vote.id))
+                        .where(Vote.feedback_item_id.in_(item_ids))
+                        .group_by(Vote.feedback_item_id)
+                    )
+                ).all()
+            )
+
+            corrections = []
+            if repair and not log_current:
+                report.log_deferred += 1
+            elif repair:
+                logged = await read_item_votes(db, item_ids)
+                corrections = [
+                    {"board_id": row.board_id, "item_id": row.id, "kind": VOTES_CORRECTED, "data": {"votes": delta}}
+                    for row in rows
+                    if (delta := counts.get(row.id, 0) - logged.get(row.id, 0))
+                ]
+
+            drifted = []
+            for row in rows:
+                drift = abs(row.vote_count - counts.get(row.id, 0))
+                if drift:
+                    drifted.append(row.id)
+                    report.boards.add(row.board_id)
+                    report.total_drift += drift
+                    report.max_drift = max(report.max_drift, drift)
+            report.scanned += len(rows)
+            report.mismatched += len(drifted)
+
+            if drifted and repair:
+                actual = select(func.count(Vote.id)).where(Vote.feedback_item_id == FeedbackItem.id).scalar_subquery()
+                await db.execute(update(FeedbackItem).where(FeedbackItem.id.in_(drifted)).values(vote_count=actual))
+                for row in rows:
+                    if row.id in drifted:
+                        emit(db, BOARD_CHANGED, row.board_id)
+                report.repaired += len(drifted)
+            if repair:
+                await log_events(db, corrections)
+                report.log_corrected += len(corrections)
+                await db.commit()
+            last_id = item_ids[-1]
+        if pause:
+            await asyncio.sleep(pause)
+
+    report.duration = time.monotonic() - started
+    if report.mismatched:
+        logger.warning("Vote count drift: %s", report.as_dict())
+    else:
+        logger.info("Vote counts consistent: %s", report.as_dict())
+    return report
@@ -0,0 +1,89 @@
+from dataclasses import dataclass
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.bus import ROADMAP_CHANGED, Message, bus
+from app.cache import get_cache
+from app.config import get_settings
+from app.models.feedback import FeedbackCategory, FeedbackItem, FeedbackStatus
+
+settings = get_settings()
+
+ROADMAP_STATUSES = (FeedbackStatus.PLANNED, FeedbackStatus.IN_PROGRESS, FeedbackStatus.SHIPPED)
+ROADMAP_DESCRIPTION_CHARS = 160
+
+
+@dataclass(slots=True, frozen=True)
+class RoadmapItem:
+    id: str
+    title: str
+    description: str | None
+    category: FeedbackCategory
+    vote_count: int
+
+
+@dataclass(slots=True, frozen=True)
+class RoadmapColumn:
+    status: FeedbackStatus
+    total: int  # items in this status, of which `items` are the most voted
+    items: tuple[RoadmapItem, ...]
+
+
+# Keyed by (board id, limit) and tagged "roadmap:<board id>" rather than the bare
+# board id, so the BOARD_CHANGED every vote emits doesn't flush it: status changes
+# invalidate it via ROADMAP_CHANGED and vote counts may lag by up to the TTL.
+_roadmaps = get_cache("roadmap", maxsize=1024, ttl=settings.roadmap_cache_ttl)
+
+
+def _invalidate_roadmap(message: Message) -> None:
+    _roadmaps.invalidate(f"roadmap:{message.key}")
+
+
+bus.subscribe(ROADMAP_CHANGED, _invalidate_roadmap)
+
+
+async def get_roadmap(
+    db: AsyncSession, board_id: str, limit: int = settings.roadmap_items_per_status
+) -> list[RoadmapColumn]:
+    """Top `limit` items per roadmap status, plus each status's total, from one windowed query.
+
+    ROW_NUMBER() and COUNT(*) partitioned by status rank and count every
+    status in a single pass over the board's roadmap items.
+    """
+    key = (board_id, limit)
+    cached = _roadmaps.get(key)
+    if cached is not None:
+        return cached
+
+    by_status = {"partition_by": FeedbackItem.status}
+    ranked = (
+        select(
+            FeedbackItem.id,
+            FeedbackItem.title,
+            func.substr(FeedbackItem.description, 1, ROADMAP_DESCRIPTION_CHARS).label("description"),
+            FeedbackItem.category,
+            FeedbackItem.vote_count,
+            FeedbackItem.status,
+            func.row_number()
+            .over(**by_status, order_by=(FeedbackItem.vote_count.desc(), FeedbackItem.created_at))
+            .label("rank"),
+            func.count().over(**by_status).label("total"),
+        )
+        .where(
+            FeedbackItem.board_id == board_id,
+            FeedbackItem.status.in_(ROADMAP_STATUSES),
+            FeedbackItem.merged_into_id.is_(None),
+        )
+        .subquery()
+    )
+    result = await db.execute(select(ranked).where(ranked.c.rank <= limit).order_by(ranked.c.rank))
+
+    items: dict[FeedbackStatus, list[RoadmapItem]] = {status: [] for status in ROADMAP_STATUSES}
+    totals: dict[FeedbackStatus, int] = {}
+    for item_id, title, description, category, vote_count, status, _, total in result:
+        items[status].append(RoadmapItem(item_id, title, description, category, vote_count))
+        totals[status] = total
+    roadmap = [RoadmapColumn(status, totals.get(status, 0), tuple(items[status])) for status in ROADMAP_STATUSES]
+    _roadmaps.set(key, roadmap, tags=(f"roadmap:{board_id}",))
+    return roadmap
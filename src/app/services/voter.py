@@ -0,0 +1,26 @@
+from sqlalchemy import ScalarSelect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import upsert
+from app.models.voter import Voter, encode_identity
+
+
+def voter_key_subquery(voter_id: str) -> ScalarSelect:
+    """The voter's integer key as a scalar subquery, so vote lookups stay a single query."""
+    return select(Voter.id).where(Voter.identity == encode_identity(voter_id)).scalar_subquery()
+
+
+async def get_voter_key(db: AsyncSession, voter_id: str) -> int | None:
+    result = await db.execute(select(Voter.id).where(Voter.identity == encode_identity(voter_id)))
+    return result.scalar_one_or_none()
+
+
+async def get_or_create_voter_key(db: AsyncSession, voter_id: str, email: str | None = None) -> int:
+    """Return the voter's key, registering the identity on first sight (and remembering the latest email)."""
+    statement = upsert(db, Voter).values(identity=encode_identity(voter_id), email=email)
+    if email:
+        statement = statement.on_conflict_do_update(index_elements=[Voter.identity], set_={"email": email})
+    else:
+        statement = statement.on_conflict_do_nothing(index_elements=[Voter.identity])
+    await db.execute(statement)
+    return await get_voter_key(db, voter_id)
@@ -0,0 +1,101 @@
+import secrets
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.bus import WEBHOOKS_CHANGED, Message, bus, emit
+from app.cache import get_cache
+from app.models.feedback import FeedbackCategory, FeedbackItem, FeedbackStatus
+from app.models.webhook import Webhook, WebhookDelivery
+from app.webhooks import mark_pending
+
+FEEDBACK_CREATED = "feedback.created"
+FEEDBACK_VOTED = "feedback.voted"
+FEEDBACK_STATUS_CHANGED = "feedback.status_changed"
+WEBHOOK_EVENTS = (FEEDBACK_CREATED, FEEDBACK_VOTED, FEEDBACK_STATUS_CHANGED)
+
+# board id -> ((webhook id, subscribed events), ...); boards without webhooks cache ()
+# so the vote path costs no query for them. Not tagged with the board id, so the
+# BOARD_CHANGED every vote emits doesn't flush it.
+_subscriptions = get_cache("webhook-subscriptions", maxsize=4096)
+
+
+def _invalidate_subscriptions(message: Message) -> None:
+    _subscriptions.delete(message.key)
+
+
+bus.subscribe(WEBHOOKS_CHANGED, _invalidate_subscriptions)
+
+
+async def _board_subscriptions(db: AsyncSession, board_id: str) -> tuple[tuple[str, frozenset[str]], ...]:
+    subscriptions = _subscriptions.get(board_id)
+    if subscriptions is None:
+        result = await db.execute(
+            select(Webhook.id, Webhook.events).where(Webhook.board_id == board_id, Webhook.active.is_(True))
+        )
+        subscriptions = tuple((webhook_id, frozenset(events)) for webhook_id, events in result.all())
+        _subscriptions.set(board_id, subscriptions)
+    return subscriptions
+
+
+async def record_event(db: AsyncSession, board_id: str, event: str, data: dict) -> None:
+    """Stage an outbox row per subscribed webhook; they commit or roll back with the caller.
+
+    No network I/O happens here: the dispatcher picks the rows up after commit.
+    """
+    targets = [webhook_id for webhook_id, events in await _board_subscriptions(db, board_id) if not events or event in events]
+    if not targets:
+        return
+    db.add_all(WebhookDelivery(webhook_id=webhook_id, event=event, board_id=board_id, data=data) for webhook_id in targets)
+    mark_pending(db)
+
+
+def item_data(item: FeedbackItem) -> dict:
+    """Public fields of an item as sent in webhook payloads (no author email)."""
+    return {
+        "id": item.id,
+        "title": item.title,
+        "description": item.description,
+        "status": FeedbackStatus(item.status).value,
+        "category": FeedbackCategory(item.category).value,
+        "vote_count": item.vote_count,
+        "author_name": item.author_name,
+        "created_at": item.created_at.isoformat() if item.created_at else None,
+    }
+
+
+async def create_webhook(db: AsyncSession, board_id: str, url: str, events: list[str]) -> Webhook:
+    webhook = Webhook(board_id=board_id, url=url, events=list(dict.fromkeys(events)), secret=secrets.token_hex(32))
+    db.add(webhook)
+    await db.flush()
+    emit(db, WEBHOOKS_CHANGED, board_id)
+    return webhook
+
+
+async def get_webhook(db: AsyncSession, webhook_id: str) -> Webhook | None:
+    return await db.get(Webhook, webhook_id)
+
+
+async def list_webhooks(db: AsyncSession, board_id: str) -> list[tuple[Webhook, int, int]]:
+    """The board's webhooks with their pending and failed delivery counts."""
+    pending = (
+        select(func.count(WebhookDelivery.id))
+        .where(WebhookDelivery.webhook_id == Webhook.id, WebhookDelivery.failed_at.is_(None))
+        .scalar_subquery()
+    )
+    failed = (
+        select(func.count(WebhookDelivery.id))
+        .where(WebhookDelivery.webhook_id == Webhook.id, WebhookDelivery.failed_at.is_not(None))
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        select(Webhook, pending, failed).where(Webhook.board_id == board_id).order_by(Webhook.created_at)
+    )
+    return [tuple(row) for row in result.all()]
+
+
+async def delete_webhook(db: AsyncSession, webhook: Webhook) -> None:
+    await db.execute(delete(WebhookDelivery).where(WebhookDelivery.webhook_id == webhook.id))
+    await db.delete(webhook)
+    await db.flush()
+    emit(db, WEBHOOKS_CHANGED, webhook.board_id)
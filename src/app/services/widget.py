@@ -0,0 +1,68 @@
+import hashlib
+import json
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import get_cache
+from app.config import get_settings
+from app.models.board import Board
+from app.services.feedback import get_listing_summary, list_feedback_rows
+
+settings = get_settings()
+
+WIDGET_FEED_VERSION = 1
+
+
+@dataclass(slots=True, frozen=True)
+class WidgetFeed:
+    body: bytes  # compact JSON, served as-is
+    etag: str
+
+
+# Keyed by slug so a cache hit (including a 304 revalidation) needs no query at
+# all, and tagged with the board id so the BOARD_CHANGED every write emits
+# drops it. The ETag hashes the body, so every worker agrees on it and a
+# rebuild that produces the same feed keeps downstream caches valid.
+_feeds = get_cache("widget-feed", maxsize=4096)
+
+
+def cached_feed(slug: str) -> WidgetFeed | None:
+    return _feeds.get(slug)
+
+
+async def build_feed(db: AsyncSession, board: Board, limit: int = settings.widget_items) -> WidgetFeed:
+    """The board's top items by votes plus its counts, as the widget renders them.
+
+    Not personalised (no per-voter state), so shared caches can hold it.
+    """
+    summary = await get_listing_summary(db, board.id)
+    rows = await list_feedback_rows(db, board.id, sort_by="votes", description_chars=0, limit=limit)
+    data = {
+        "v": WIDGET_FEED_VERSION,
+        "board": {
+            "name": board.name,
+            "slug": board.slug,
+            "accent_color": board.accent_color,
+            "url": f"{settings.public_url}/b/{board.slug}",
+        },
+        "counts": {
+            "items": summary["item_count"],
+            "votes": summary["total_votes"],
+            "statuses": {status.value: count for status, count in summary["status_counts"].items()},
+        },
+        "items": [
+            {
+                "id": row.id,
+                "title": row.title,
+                "status": row.status.value,
+                "category": row.category.value,
+                "votes": row.vote_count,
+            }
+            for row in rows
+        ],
+    }
+    body = json.dumps(data, separators=(",", ":")).encode()
+    feed = WidgetFeed(body, f'"{hashlib.sha256(body).hexdigest()[:20]}"')
+    _feeds.set(board.slug, feed, tags=(board.id,))
+    return feed
@@ -0,0 +1,252 @@
+import asyncio
+import fcntl
+import logging
+import os
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemLoader
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.bus import BOARD_CHANGED, Message, bus
+from app.config import get_settings
+from app.models.board import Board
+from app.models.feedback import FeedbackCategory, FeedbackItem, FeedbackStatus
+from app.services.board import get_board_by_slug
+from app.services.feedback import list_feedback_rows
+from app.services.widget import build_feed
+from app.templating import register_globals
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# Part of every content version: bump it when the files a snapshot contains or
+# the context they are rendered with change, so existing snapshots get redone.
+SNAPSHOT_FORMAT = 2
+
+VERSION_FILE = ".version"
+LOCK_FILE = ".lock"
+
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+
+# Snapshots are shared by every visitor, so forms get no idempotency key: a
+# baked-in key would make the second visitor's submit replay the first's.
+env = Environment(loader=FileSystemLoader(str(TEMPLATES_DIR)), autoescape=True, enable_async=True)
+register_globals(env, idempotency_key=lambda: "")
+
+
+def parse_slugs(spec: str) -> list[str]:
+    return [slug.strip() for slug in spec.split(",") if slug.strip()]
+
+
+def board_dir(root: Path, slug: str) -> Path:
+    """Mirrors the URL, so nginx can serve /b/<slug> from <root>/b/<slug>/index.html."""
+    return root / "b" / slug
+
+
+async def content_version(db: AsyncSession, board: Board) -> str:
+    """Changes whenever anything a snapshot shows does: board settings, items, statuses or votes."""
+    count, votes, last_change = (
+        await db.execute(
+            select(
+                func.count(FeedbackItem.id),
+                func.coalesce(func.sum(FeedbackItem.vote_count), 0),
+                func.max(FeedbackItem.updated_at),
+            ).where(FeedbackItem.board_id == board.id)
+        )
+    ).one()
+    return f"{SNAPSHOT_FORMAT}:{board.updated_at.isoformat()}:{count}:{votes}:{last_change}"
+
+
+async def render_board(db: AsyncSession, board: Board) -> dict[str, bytes]:
+    """The snapshot's files: the public board page as an anonymous first-time visitor sees it, and the widget feed."""
+    items = await list_feedback_rows(db, board.id)
+    html = await env.get_template("public/board.html").render_async(
+        board=board,
+        items=items,
+        item_count=len(items),
+        voted_items=set(),
+        user=None,
+        status_filter=None,
+        category_filter=None,
+        sort="votes",
+        archived=False,
+        statuses=FeedbackStatus,
+        categories=FeedbackCategory,
+        submitted=False,
+    )
+    feed = await build_feed(db, board)
+    return {"index.html": html.encode("utf-8"), "widget.json": feed.body}
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Write to a temporary file beside `path`, then rename over it: readers see the old file or the new one."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _write_files(directory: Path, files: dict[str, bytes], version: str) -> list[str]:
+    directory.mkdir(parents=True, exist_ok=True)
+    written = []
+    for name, data in files.items():
+        path = directory / name
+        # Unchanged files keep their mtime, so nginx's ETag/Last-Modified stay valid
+        if path.exists() and path.read_bytes() == data:
+            continue
+        write_atomic(path, data)
+        written.append(name)
+    # Last, so an interrupted write is redone on the next pass
+    write_atomic(directory / VERSION_FILE, version.encode())
+    return written
+
+
+def _remove_files(directory: Path) -> bool:
+    if not directory.is_dir():
+        return False
+    # The page first: once it is gone nginx falls through to the app
+    for name in ("index.html", "widget.json", VERSION_FILE):
+        (directory / name).unlink(missing_ok=True)
+    return True
+
+
+def _read_version(directory: Path) -> str | None:
+    try:
+        return (directory / VERSION_FILE).read_text()
+    except FileNotFoundError:
+        return None
+
+
+async def publish_board(db: AsyncSession, root: Path, slug: str, force: bool = False) -> str:
+    """Bring one board's snapshot up to date.
+
+    Returns "written", "unchanged" (content version matches what is on disk;
+    nothing is rendered), "removed" (the board is gone or was renamed) or
+    "missing".
+    """
+    directory = board_dir(root, slug)
+    board = await get_board_by_slug(db, slug)
+    if board is None:
+        return "removed" if await asyncio.to_thread(_remove_files, directory) else "missing"
+
+    version = await content_version(db, board)
+    if not force and await asyncio.to_thread(_read_version, directory) == version:
+        return "unchanged"
+    files = await render_board(db, board)
+    written = await asyncio.to_thread(_write_files, directory, files, version)
+    logger.info("Snapshot of %s: %s", slug, ", ".join(written) or "re-rendered, no file changed")
+    return "written"
+
+
+async def publish_boards(
+    session_factory: async_sessionmaker,
+    root: Path,
+    slugs: list[str],
+    board_ids: set[str] | None = None,
+    force: bool = False,
+) -> dict[str, str]:
+    """Publish the given slugs, or only those whose board id is in `board_ids` when it is given.
+
+    Slugs that no longer resolve are always checked, so a deleted or renamed
+    board's snapshot is taken down on the next pass.
+    """
+    results = {}
+    async with session_factory() as db:
+        for slug in slugs:
+            if board_ids is not None:
+                board_id = await db.scalar(select(Board.id).where(Board.slug == slug, Board.deleted_at.is_(None)))
+                if board_id is not None and board_id not in board_ids:
+                    continue
+            results[slug] = await publish_board(db, root, slug, force=force)
+    return results
+
+
+class SnapshotPublisher:
+    """Keeps static snapshots of selected boards current as they change.
+
+    BOARD_CHANGED marks a board dirty. The first change is published at once
+    and later ones are coalesced: a pass runs at most once per `interval`,
+    however many votes land in between. Every worker runs a publisher, but
+    only the one holding the lock file in `root` does any work; if it exits,
+    the next to wake takes over and republishes everything.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        root: str | Path = settings.snapshot_dir,
+        slugs: list[str] | None = None,
+        interval: float = settings.snapshot_interval,
+    ) -> None:
+        self.session_factory = session_factory
+        self.root = Path(root)
+        self.slugs = slugs if slugs is not None else parse_slugs(settings.snapshot_boards)
+        self.interval = interval
+        self._dirty: set[str] = set()
+        self._wakeup = asyncio.Event()
+        self._lock_fd: int | None = None
+        self._subscribed = False
+        self._task: asyncio.Task | None = None
+
+    def _on_board_changed(self, message: Message) -> None:
+        if self._task is not None:
+            self._dirty.add(message.key)
+            self._wakeup.set()
+
+    def _acquire_lock(self) -> bool:
+        """True if this process is (or has just become) the publishing one."""
+        if self._lock_fd is not None:
+            return True
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.root / LOCK_FILE, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._lock_fd = fd
+        return True
+
+    def _release_lock(self) -> None:
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    async def run_once(self) -> dict[str, str]:
+        dirty, self._dirty = self._dirty, set()
+        was_leader = self._lock_fd is not None
+        if not self._acquire_lock():
+            return {}
+        # A new leader can't know what its predecessor missed: redo everything
+        return await publish_boards(
+            self.session_factory, self.root, self.slugs, board_ids=dirty if was_leader else None, force=not was_leader
+        )
+
+    async def _run_forever(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Snapshot pass failed: %s", e, exc_info=True)
+            await asyncio.sleep(self.interval)
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+    async def start(self) -> None:
+        if not self._subscribed:
+            bus.subscribe(BOARD_CHANGED, self._on_board_changed)
+            self._subscribed = True
+        self._task = asyncio.create_task(self._run_forever(), name="snapshot-publisher")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self._release_lock()
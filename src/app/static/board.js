@@ -0,0 +1,29 @@
+// Progressive enhancement: swap in server-rendered fragments instead of reloading
+// the whole board. Without JS the plain form POST/GET paths keep working.
+(function () {
+    document.addEventListener('submit', function (e) {
+        var form = e.target.closest('[data-vote-form]');
+        if (!form) return;
+        e.preventDefault();
+        fetch(form.action, { method: 'POST', body: new FormData(form), headers: { 'X-Fragment': '1' }, credentials: 'same-origin' })
+            .then(function (r) { if (!r.ok) throw r; return r.text(); })
+            .then(function (html) { form.outerHTML = html; })
+            .catch(function () { form.submit(); });
+    });
+
+    var filters = document.querySelector('[data-filter-form]');
+    if (!filters) return;
+    filters.addEventListener('change', function () {
+        var query = new URLSearchParams(new FormData(filters)).toString();
+        fetch(filters.dataset.fragmentUrl + '?' + query, { headers: { 'X-Fragment': '1' }, credentials: 'same-origin' })
+            .then(function (r) { if (!r.ok) throw r; return r.text(); })
+            .then(function (html) {
+                var list = document.getElementById('feedback-items');
+                list.outerHTML = html;
+                var count = parseInt(document.getElementById('feedback-items').dataset.count, 10);
+                document.getElementById('item-count').textContent = count + ' item' + (count !== 1 ? 's' : '');
+                history.replaceState(null, '', '?' + query);
+            })
+            .catch(function () { filters.submit(); });
+    });
+})();
@@ -0,0 +1,173 @@
+/*
+ * FeedbackCue embeddable widget.
+ *
+ *   <div data-feedbackcue-board="your-board-slug"></div>
+ *   <script src="https://feedback.example.com/widget.js" async></script>
+ *
+ * Renders the board's most-voted items into a shadow root (so host page styles
+ * don't leak in either direction) from /b/<slug>/widget.json, and votes through
+ * the batch JSON endpoint. The widget keeps its own anonymous voter id and voted
+ * items in localStorage because third-party cookies are not reliable.
+ */
+(function () {
+    'use strict';
+
+    var script = document.currentScript;
+    var origin = script ? new URL(script.src).origin : '';
+    var STATUS_LABELS = {
+        open: 'Open', under_review: 'Under review', planned: 'Planned',
+        in_progress: 'In progress', shipped: 'Shipped', closed: 'Closed'
+    };
+    var STYLE = [
+        ':host{all:initial;display:block;font:14px/1.4 -apple-system,BlinkMacSystemFont,"Segoe UI",Roboto,sans-serif;color:#111827}',
+        '.fc{border:1px solid #e5e7eb;border-radius:12px;overflow:hidden;background:#fff}',
+        '.fc-head{padding:12px 16px;color:#fff;font-weight:600}',
+        '.fc-head small{display:block;font-weight:400;opacity:.8}',
+        'ul{list-style:none;margin:0;padding:0}',
+        'li{display:flex;gap:12px;align-items:center;padding:10px 16px;border-top:1px solid #f3f4f6}',
+        'button{flex:none;min-width:44px;padding:4px 6px;border:1px solid #e5e7eb;border-radius:8px;background:#fff;cursor:pointer;font:600 12px/1.2 inherit;color:#374151}',
+        'button[aria-pressed=true]{color:#fff;border-color:transparent}',
+        '.fc-title{flex:1;min-width:0}',
+        '.fc-status{display:block;font-size:11px;color:#6b7280}',
+        '.fc-foot{display:block;padding:10px 16px;border-top:1px solid #f3f4f6;font-size:12px;text-decoration:none;text-align:center}'
+    ].join('');
+
+    function storage(key, fallback) {
+        try {
+            var value = window.localStorage.getItem(key);
+            return value ? JSON.parse(value) : fallback;
+        } catch (e) {
+            return fallback;
+        }
+    }
+
+    function store(key, value) {
+        try {
+            window.localStorage.setItem(key, JSON.stringify(value));
+        } catch (e) { /* private mode: votes still work, state just isn't remembered */ }
+    }
+
+    function voterId() {
+        var id = storage('feedbackcue:voter', null);
+        if (!id) {
+            id = window.crypto && crypto.randomUUID ? crypto.randomUUID() :
+                'xxxxxxxx-xxxx-4xxx-yxxx-xxxxxxxxxxxx'.replace(/[xy]/g, function (c) {
+                    var r = Math.random() * 16 | 0;
+                    return (c === 'x' ? r : (r & 3 | 8)).toString(16);
+                });
+            store('feedbackcue:voter', id);
+        }
+        return id;
+    }
+
+    function el(tag, attrs, text) {
+        var node = document.createElement(tag);
+        for (var name in attrs || {}) node.setAttribute(name, attrs[name]);
+        if (text !== undefined) node.textContent = text;
+        return node;
+    }
+
+    function paintButton(button, votes, voted, accent) {
+        button.textContent = '▲ ' + votes;
+        button.setAttribute('aria-pressed', voted ? 'true' : 'false');
+        button.style.background = voted ? accent : '';
+    }
+
+    function render(container, slug, feed) {
+        var accent = feed.board.accent_color;
+        var votedKey = 'feedbackcue:voted:' + slug;
+        var voted = storage(votedKey, {});
+        var root = container.shadowRoot || container.attachShadow({ mode: 'open' });
+        root.innerHTML = '';
+        root.appendChild(el('style', {}, STYLE));
+
+        var box = el('div', { 'class': 'fc' });
+        var head = el('div', { 'class': 'fc-head' }, feed.board.name);
+        head.style.background = accent;
+        head.appendChild(el('small', {}, feed.counts.items + ' ideas · ' + feed.counts.votes + ' votes'));
+        box.appendChild(head);
+
+        // Clicks show at once and go out together: a short pause batches them
+        // into one request. Each entry is the wanted state, so a retry after a
+        // network error can't flip a vote back.
+        var buttons = {};
+        var pending = {};
+        var timer = null;
+
+        function flush() {
+            timer = null;
+            var votes = Object.keys(pending).map(function (id) { return { item_id: id, voted: pending[id] }; });
+            pending = {};
+            if (!votes.length) return;
+            fetch(origin + '/b/' + encodeURIComponent(slug) + '/widget/votes', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ voter_id: voterId(), votes: votes })
+            })
+                .then(function (r) { if (!r.ok) throw r; return r.json(); })
+                .then(function (result) {
+                    result.votes.forEach(function (vote) {
+                        if (vote.voted) voted[vote.item_id] = true; else delete voted[vote.item_id];
+                        if (buttons[vote.item_id] && !(vote.item_id in pending)) {
+                            buttons[vote.item_id].votes = vote.votes;
+                            paintButton(buttons[vote.item_id].button, vote.votes, vote.voted, accent);
+                        }
+                    });
+                    store(votedKey, voted);
+                })
+                .catch(function () {
+                    // Put back whatever hasn't been superseded; the next click or a retry sends it again
+                    votes.forEach(function (vote) { if (!(vote.item_id in pending)) pending[vote.item_id] = vote.voted; });
+                    if (!timer) timer = setTimeout(flush, 5000);
+                });
+        }
+
+        var list = el('ul');
+        feed.items.forEach(function (item) {
+            var row = el('li');
+            var button = el('button', { type: 'button', title: 'Vote' });
+            var state = buttons[item.id] = { button: button, votes: item.votes };
+            paintButton(button, item.votes, voted[item.id], accent);
+            button.addEventListener('click', function () {
+                var wanted = !(item.id in pending ? pending[item.id] : voted[item.id]);
+                var shown = wanted === !!voted[item.id] ? state.votes : state.votes + (wanted ? 1 : -1);
+                pending[item.id] = wanted;
+                paintButton(button, Math.max(0, shown), wanted, accent);
+                clearTimeout(timer);
+                timer = setTimeout(flush, 400);
+            });
+            var title = el('span', { 'class': 'fc-title' }, item.title);
+            title.appendChild(el('span', { 'class': 'fc-status' }, STATUS_LABELS[item.status] || item.status));
+            row.appendChild(button);
+            row.appendChild(title);
+            list.appendChild(row);
+        });
+        box.appendChild(list);
+
+        var more = el('a', { 'class': 'fc-foot', href: feed.board.url, target: '_blank', rel: 'noopener' },
+            'View all ' + feed.counts.items + ' ideas →');
+        more.style.color = accent;
+        box.appendChild(more);
+        root.appendChild(box);
+    }
+
+    function load(container) {
+        var slug = container.getAttribute('data-feedbackcue-board');
+        if (!slug || container.getAttribute('data-feedbackcue-loaded')) return;
+        container.setAttribute('data-feedbackcue-loaded', '1');
+        fetch(origin + '/b/' + encodeURIComponent(slug) + '/widget.json')
+            .then(function (r) { if (!r.ok) throw r; return r.json(); })
+            .then(function (feed) { render(container, slug, feed); })
+            .catch(function () { container.removeAttribute('data-feedbackcue-loaded'); });
+    }
+
+    function init() {
+        Array.prototype.forEach.call(document.querySelectorAll('[data-feedbackcue-board]'), load);
+    }
+
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', init);
+    } else {
+        init();
+    }
+})();
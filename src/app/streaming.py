@@ -0,0 +1,88 @@
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from jinja2 import Environment, FileSystemLoader
+from markupsafe import Markup
+
+from app.templating import register_globals
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+
+# Chunks are coalesced up to this size before being written to the socket.
+FLUSH_BYTES = 16 * 1024
+
+# Templates place `{{ stream_flush }}` where everything rendered so far should be
+# sent right away (e.g. just before the item list). In regular, non-streaming
+# rendering the name is undefined and renders as an empty string.
+FLUSH_MARKER = Markup("<!-- flush -->")
+
+# Once the first byte is sent the status code can no longer change, so a failure
+# mid-stream is logged and the page is closed off with a visible notice instead.
+STREAM_ERROR_HTML = (
+    '<div role="alert" class="max-w-4xl mx-auto my-6 px-4 py-3 rounded-xl border border-red-200 bg-red-50 '
+    'text-sm text-red-700">Something went wrong while loading the rest of this page. Please refresh to try again.'
+    "</div></body></html>"
+)
+
+env = Environment(loader=FileSystemLoader(str(TEMPLATES_DIR)), autoescape=True, enable_async=True)
+env.globals["stream_flush"] = FLUSH_MARKER
+register_globals(env)
+
+
+async def _render_chunks(
+    name: str,
+    context: dict[str, Any],
+    on_close: Callable[[], Awaitable[None]] | None,
+) -> AsyncIterator[bytes]:
+    buffer: list[str] = []
+    size = 0
+    try:
+        async for chunk in env.get_template(name).generate_async(context):
+            if chunk == FLUSH_MARKER:
+                if buffer:
+                    yield "".join(buffer).encode("utf-8")
+                    buffer.clear()
+                    size = 0
+                continue
+            buffer.append(chunk)
+            size += len(chunk)
+            if size >= FLUSH_BYTES:
+                yield "".join(buffer).encode("utf-8")
+                buffer.clear()
+                size = 0
+        if buffer:
+            yield "".join(buffer).encode("utf-8")
+    except Exception as e:
+        logger.error("Streaming render of %s failed mid-stream: %s", name, e, exc_info=True)
+        if buffer:
+            yield "".join(buffer).encode("utf-8")
+        yield STREAM_ERROR_HTML.encode("utf-8")
+    finally:
+        if on_close is not None:
+            await on_close()
+
+
+def stream_template(
+    request: Request,
+    name: str,
+    context: dict[str, Any],
+    on_close: Callable[[], Awaitable[None]] | None = None,
+    status_code: int = 200,
+) -> StreamingResponse:
+    """Render a template incrementally with Jinja's async generate().
+
+    Context values may be async iterables (e.g. rows from a server-side cursor);
+    `on_close` runs once the body is finished or the client disconnects, and is
+    where a session opened for the stream should be closed.
+    """
+    return StreamingResponse(
+        _render_chunks(name, {"request": request, **context}, on_close),
+        status_code=status_code,
+        media_type="text/html; charset=utf-8",
+    )
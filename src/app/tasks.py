@@ -0,0 +1,81 @@
+import logging
+
+from app.config import get_settings
+from app.idempotency import prune_idempotency_keys
+from app.jobs import JobContext, job_handler, prune_jobs, schedule
+from app.projections import PROJECTIONS, catch_up
+from app.services.archive import archive_items
+from app.services.board import purge_deleted_boards
+from app.services.ranking import take_ranking_snapshots, thin_ranking_snapshots
+from app.services.reconcile import reconcile_vote_counts
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# Importing this module registers the maintenance handlers and schedules. The
+# job worker runs each scheduled run once across all processes.
+PURGE_BOARDS_JOB = "purge-deleted-boards"
+RECONCILE_JOB = "reconcile-vote-counts"
+ARCHIVE_JOB = "archive-feedback"
+PRUNE_JOBS_JOB = "prune-jobs"
+PRUNE_IDEMPOTENCY_JOB = "prune-idempotency-keys"
+CATCH_UP_PROJECTIONS_JOB = "catch-up-projections"
+RANKING_SNAPSHOTS_JOB = "snapshot-rankings"
+
+
+@job_handler(PURGE_BOARDS_JOB, concurrency=1)
+async def purge_boards_job(ctx: JobContext) -> None:
+    await purge_deleted_boards(ctx.session_factory)
+
+
+@job_handler(RECONCILE_JOB, concurrency=1)
+async def reconcile_job(ctx: JobContext) -> None:
+    await reconcile_vote_counts(
+        ctx.session_factory, batch_size=settings.reconcile_batch_size, pause=settings.reconcile_pause
+    )
+
+
+@job_handler(ARCHIVE_JOB, concurrency=1)
+async def archive_job(ctx: JobContext) -> None:
+    await archive_items(
+        ctx.session_factory, older_than_days=settings.archive_after_days, batch_size=settings.archive_batch_size
+    )
+
+
+@job_handler(PRUNE_JOBS_JOB, concurrency=1)
+async def prune_jobs_job(ctx: JobContext) -> None:
+    deleted = await prune_jobs(ctx.session_factory, settings.job_retention_days)
+    logger.info("Pruned %d finished jobs", deleted)
+
+
+@job_handler(PRUNE_IDEMPOTENCY_JOB, concurrency=1)
+async def prune_idempotency_job(ctx: JobContext) -> None:
+    deleted = await prune_idempotency_keys(ctx.session_factory, settings.idempotency_ttl)
+    logger.info("Pruned %d expired idempotency keys", deleted)
+
+
+@job_handler(CATCH_UP_PROJECTIONS_JOB, concurrency=1)
+async def catch_up_projections_job(ctx: JobContext) -> None:
+    for projection in PROJECTIONS.values():
+        applied = await catch_up(ctx.session_factory, projection, batch_size=settings.projection_batch_size)
+        if applied:
+            logger.info("Projection %s caught up %d events", projection.name, applied)
+
+
+@job_handler(RANKING_SNAPSHOTS_JOB, concurrency=1)
+async def ranking_snapshots_job(ctx: JobContext) -> None:
+    taken = await take_ranking_snapshots(ctx.session_factory)
+    thinned = await thin_ranking_snapshots(ctx.session_factory, settings.ranking_snapshot_keep_days)
+    logger.info("Took %d ranking snapshots, thinned %d", taken, thinned)
+
+
+schedule(PURGE_BOARDS_JOB, PURGE_BOARDS_JOB, interval=settings.board_purge_interval)
+schedule(RECONCILE_JOB, RECONCILE_JOB, interval=settings.reconcile_interval)
+if settings.archive_after_days > 0:
+    schedule(ARCHIVE_JOB, ARCHIVE_JOB, interval=settings.archive_interval)
+schedule(PRUNE_JOBS_JOB, PRUNE_JOBS_JOB, cron="30 3 * * *")
+schedule(CATCH_UP_PROJECTIONS_JOB, CATCH_UP_PROJECTIONS_JOB, interval=settings.projection_interval)
+schedule(RANKING_SNAPSHOTS_JOB, RANKING_SNAPSHOTS_JOB, interval=settings.ranking_snapshot_interval)
+if settings.idempotency_backend == "database":
+    schedule(PRUNE_IDEMPOTENCY_JOB, PRUNE_IDEMPOTENCY_JOB, interval=60 * 60)
@@ -0,0 +1,18 @@
+"""Globals shared by every Jinja environment that renders pages.
+
+Route modules, streaming and snapshots each build their own environment;
+all of them go through `register_globals`, so a template never finds a
+helper missing in one of them.
+"""
+from collections.abc import Callable
+
+from jinja2 import Environment
+
+from app import assets
+from app.idempotency import new_key
+
+
+def register_globals(env: Environment, idempotency_key: Callable[[], str] = new_key) -> None:
+    """asset_url(), theme_url() and idempotency_key() (a fresh key per rendered form, unless overridden)."""
+    assets.register(env)
+    env.globals["idempotency_key"] = idempotency_key
@@ -0,0 +1,293 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from sqlalchemy import delete, event, exists, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.webhook import Webhook, WebhookDelivery
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+SIGNATURE_HEADER = "X-FeedbackCue-Signature"
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def sign(secret: str, body: bytes) -> str:
+    """HMAC-SHA256 of the request body, as sent in the signature header."""
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def retry_delay(failures: int) -> float:
+    return min(settings.webhook_retry_base * 2 ** (failures - 1), settings.webhook_retry_max)
+
+
+class WebhookDispatcher:
+    """Delivers outbox rows to their endpoints in batches, off the request path.
+
+    Every endpoint with pending events gets one POST carrying up to
+    `batch_size` of them, oldest first. Endpoints are leased (one worker per
+    endpoint at a time, so batches stay in order) and at most `concurrency` are
+    in flight at once over a single pooled httpx.AsyncClient. A failed POST
+    backs the whole endpoint off exponentially; events that run out of attempts
+    are marked failed and no longer block the ones behind them.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        concurrency: int = settings.webhook_concurrency,
+        batch_size: int = settings.webhook_batch_size,
+        batch_window: float = settings.webhook_batch_window,
+        poll_interval: float = settings.webhook_poll_interval,
+        lease_seconds: float = settings.webhook_lease_seconds,
+        timeout: float = settings.webhook_timeout,
+        max_attempts: int = settings.webhook_max_attempts,
+    ) -> None:
+        self.session_factory = session_factory
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.worker_id = uuid.uuid4().hex
+        self.client: httpx.AsyncClient | None = None
+        self._slots = asyncio.Semaphore(concurrency)
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+                headers={"User-Agent": "FeedbackCue-Webhooks"},
+            )
+        return self.client
+
+    async def _due_webhooks(self) -> list[str]:
+        now = _now()
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(Webhook.id)
+                .where(
+                    Webhook.active.is_(True),
+                    or_(Webhook.retry_after.is_(None), Webhook.retry_after <= now),
+                    or_(Webhook.locked_until.is_(None), Webhook.locked_until < now),
+                    exists().where(WebhookDelivery.webhook_id == Webhook.id, WebhookDelivery.failed_at.is_(None)),
+                )
+                .limit(self.concurrency * 4)
+            )
+            return list(result.scalars().all())
+
+    async def _claim(self, webhook_id: str) -> Webhook | None:
+        now = _now()
+        async with self.session_factory() as db:
+            result = await db.execute(
+                update(Webhook)
+                .where(
+                    Webhook.id == webhook_id,
+                    Webhook.active.is_(True),
+                    or_(Webhook.retry_after.is_(None), Webhook.retry_after <= now),
+                    or_(Webhook.locked_until.is_(None), Webhook.locked_until < now),
+                )
+                .values(locked_by=self.worker_id, locked_until=now + timedelta(seconds=self.lease_seconds))
+                .returning(Webhook)
+            )
+            webhook = result.scalar_one_or_none()
+            await db.commit()
+            return webhook
+
+    async def _update_webhook(self, db: AsyncSession, webhook: Webhook, **values) -> None:
+        await db.execute(
+            update(Webhook).where(Webhook.id == webhook.id, Webhook.locked_by == self.worker_id).values(**values)
+        )
+
+    async def _post(self, webhook: Webhook, deliveries: list[WebhookDelivery]) -> None:
+        body = json.dumps(
+            {
+                "webhook_id": webhook.id,
+                "events": [
+                    {
+                        "id": delivery.id,
+                        "event": delivery.event,
+                        "board_id": delivery.board_id,
+                        "created_at": delivery.created_at.isoformat(),
+                        "data": delivery.data,
+                    }
+                    for delivery in deliveries
+                ],
+            },
+            separators=(",", ":"),
+        ).encode()
+        response = await self._get_client().post(
+            webhook.url,
+            content=body,
+            headers={"Content-Type": "application/json", SIGNATURE_HEADER: sign(webhook.secret, body)},
+        )
+        response.raise_for_status()
+
+    async def _drain(self, webhook: Webhook) -> int:
+        """Send the endpoint's pending events batch by batch until it is empty or fails."""
+        delivered = 0
+        while True:
+            async with self.session_factory() as db:
+                result = await db.execute(
+                    select(WebhookDelivery)
+                    .where(WebhookDelivery.webhook_id == webhook.id, WebhookDelivery.failed_at.is_(None))
+                    .order_by(WebhookDelivery.id)
+                    .limit(self.batch_size)
+                )
+                deliveries = list(result.scalars().all())
+            if not deliveries:
+                break
+            ids = [delivery.id for delivery in deliveries]
+
+            try:
+                await self._post(webhook, deliveries)
+            except httpx.HTTPError as e:
+                await self._failed(webhook, ids, e)
+                return delivered
+
+            delivered += len(ids)
+            async with self.session_factory() as db:
+                await db.execute(delete(WebhookDelivery).where(WebhookDelivery.id.in_(ids)))
+                await self._update_webhook(
+                    db,
+                    webhook,
+                    failures=0,
+                    retry_after=None,
+                    last_error=None,
+                    locked_until=_now() + timedelta(seconds=self.lease_seconds),
+                )
+                await db.commit()
+            webhook.failures = 0
+            if len(ids) < self.batch_size:
+                break
+
+        async with self.session_factory() as db:
+            await self._update_webhook(db, webhook, locked_by=None, locked_until=None)
+            await db.commit()
+        return delivered
+
+    async def _failed(self, webhook: Webhook, ids: list[int], error: Exception) -> None:
+        failures = webhook.failures + 1
+        delay = retry_delay(failures)
+        logger.warning("Webhook %s failed (%d in a row), retrying in %.0fs: %r", webhook.id, failures, delay, error)
+        async with self.session_factory() as db:
+            await db.execute(
+                update(WebhookDelivery)
+                .where(WebhookDelivery.id.in_(ids))
+                .values(attempts=WebhookDelivery.attempts + 1)
+            )
+            await db.execute(
+                update(WebhookDelivery)
+                .where(WebhookDelivery.id.in_(ids), WebhookDelivery.attempts >= self.max_attempts)
+                .values(failed_at=_now())
+            )
+            await self._update_webhook(
+                db,
+                webhook,
+                failures=failures,
+                retry_after=_now() + timedelta(seconds=delay),
+                last_error=repr(error)[:2000],
+                locked_by=None,
+                locked_until=None,
+            )
+            await db.commit()
+
+    async def _run_endpoint(self, webhook_id: str) -> int:
+        async with self._slots:
+            webhook = await self._claim(webhook_id)
+            if webhook is None:
+                return 0
+            try:
+                return await self._drain(webhook)
+            except Exception as e:
+                # Leave the lease to expire; another pass picks the endpoint up again
+                logger.error("Webhook %s delivery crashed: %s", webhook_id, e, exc_info=True)
+                return 0
+
+    async def run_once(self) -> int:
+        """Deliver to every due endpoint once. Returns the number of endpoints tried."""
+        webhook_ids = await self._due_webhooks()
+        if webhook_ids:
+            await asyncio.gather(*(self._run_endpoint(webhook_id) for webhook_id in webhook_ids))
+        return len(webhook_ids)
+
+    async def run_until_idle(self) -> int:
+        """Run passes until no endpoint is due (tests and one-off CLI use)."""
+        tried = 0
+        while count := await self.run_once():
+            tried += count
+        return tried
+
+    def wakeup(self) -> None:
+        self._wakeup.set()
+
+    async def _run_forever(self) -> None:
+        while True:
+            try:
+                if await self.run_once():
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Webhook dispatcher pass failed: %s", e, exc_info=True)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                # Let a burst of writes land so it goes out as one batch per endpoint
+                await asyncio.sleep(self.batch_window)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def start(self) -> None:
+        self.worker_id = uuid.uuid4().hex  # not inherited across app.serve's fork
+        _running_dispatchers.add(self)
+        self._task = asyncio.create_task(self._run_forever(), name="webhook-dispatcher")
+
+    async def stop(self) -> None:
+        _running_dispatchers.discard(self)
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+
+# Outbox rows written in this process wake the local dispatcher when they commit
+_PENDING_KEY = "webhooks_pending"
+_running_dispatchers: set[WebhookDispatcher] = set()
+
+
+def mark_pending(db: AsyncSession) -> None:
+    db.sync_session.info[_PENDING_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_dispatchers(session: Session) -> None:
+    if session.info.pop(_PENDING_KEY, False):
+        for dispatcher in _running_dispatchers:
+            dispatcher.wakeup()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -2,8 +2,11 @@ import pytest
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
-from app.database import Base, get_db
+from app import admission
+from app.cache import clear_caches
+from app.database import Base, get_db, get_session_factory
 from app.main import app
+from app.ratelimit import limiter
 
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
@@ -22,6 +25,7 @@ async def override_get_db():
 
 
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_session_factory] = lambda: async_session_test
 
 
 @pytest.fixture(autouse=True)
@@ -31,6 +35,10 @@ async def setup_db():
     yield
     async with engine_test.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
+    # Some caches are keyed by slug, which the next test's fresh database reuses
+    clear_caches()
+    limiter.clear()
+    admission.controller.reset()
 
 
 @pytest.fixture
@@ -0,0 +1,131 @@
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+
+from app import admission
+from app.admission import AdmissionController, ClassLimit, Gate, parse_class_limits, route_class
+from app.config import get_settings
+from app.services.board import create_board
+
+
+def test_parse_class_limits():
+    assert parse_class_limits("read=64/512, write=4/0") == {"read": ClassLimit(64, 512), "write": ClassLimit(4, 0)}
+    assert parse_class_limits("") == {}
+    with pytest.raises(ValueError):
+        parse_class_limits("static=10/10")
+    with pytest.raises(ValueError):
+        parse_class_limits("write=0/10")
+
+
+def test_route_class():
+    assert route_class("GET", "/b/acme") == "read"
+    assert route_class("GET", "/b/acme/widget.json") == "read"
+    assert route_class("POST", "/b/acme/vote/1") == "write"
+    assert route_class("POST", "/b/acme/widget/votes") == "write"
+    assert route_class("GET", "/dashboard/boards/1") == "dashboard"
+    assert route_class("POST", "/api/boards/1/feedback/bulk") == "dashboard"
+    assert route_class("GET", "/admin/jobs") == "dashboard"
+    assert route_class("POST", "/login") == "auth"
+    assert route_class("POST", "/api/auth/register") == "auth"
+    assert route_class("GET", "/health") is None
+    assert route_class("GET", "/metrics") is None
+    assert route_class("OPTIONS", "/b/acme/widget/votes") is None
+
+
+async def test_gate_queues_then_sheds():
+    gate = Gate("write", ClassLimit(1, 1))
+    assert await gate.acquire(timeout=1)
+
+    queued = asyncio.create_task(gate.acquire(timeout=1))
+    await asyncio.sleep(0)
+    assert gate.queued == 1
+    # Slot busy and queue full: turned away without waiting
+    assert not await gate.acquire(timeout=1)
+    assert gate.shed == 1
+
+    gate.release()
+    assert await queued  # the slot went straight to the waiter
+    assert (gate.in_flight, gate.queued) == (1, 0)
+    gate.release()
+    assert gate.in_flight == 0
+    assert gate.admitted == 2
+
+
+async def test_gate_wait_times_out():
+    gate = Gate("read", ClassLimit(1, 5))
+    assert await gate.acquire(timeout=1)
+    assert not await gate.acquire(timeout=0.01)
+    assert (gate.timed_out, gate.queued) == (1, 0)
+    assert gate.wait_seconds > 0
+    gate.release()
+    assert gate.in_flight == 0
+
+
+async def test_cancelled_waiter_gives_up_its_place():
+    gate = Gate("read", ClassLimit(1, 5))
+    await gate.acquire(timeout=1)
+    first = asyncio.create_task(gate.acquire(timeout=1))
+    second = asyncio.create_task(gate.acquire(timeout=1))
+    await asyncio.sleep(0)
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert gate.queued == 1
+
+    gate.release()
+    assert await second
+    gate.release()
+    assert gate.in_flight == 0
+
+
+@pytest.fixture
+def saturated(monkeypatch):
+    """A controller whose write slots are all taken and whose queue is disabled."""
+    controller = AdmissionController(parse_class_limits("read=4/4, write=1/0"), queue_timeout=0.05)
+    controller.gates["write"].in_flight = 1
+    monkeypatch.setattr(admission, "controller", controller)
+    return controller
+
+
+async def test_overloaded_writes_get_503_while_reads_are_served(client: AsyncClient, db_session, saturated):
+    board = await create_board(db_session, "Viral", "", "#4F46E5", "owner")
+    await db_session.commit()
+
+    response = await client.post(f"/b/{board.slug}/submit", data={"title": "Me too"}, follow_redirects=False)
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert response.json() == {"detail": "Server is busy, please retry shortly"}
+
+    response = await client.post(
+        f"/b/{board.slug}/vote/missing", headers={"Accept": "text/html"}, follow_redirects=False
+    )
+    assert response.status_code == 503
+    assert "try again" in response.text
+
+    assert (await client.get(f"/b/{board.slug}/widget.json")).status_code == 200
+    assert (await client.get(f"/b/{board.slug}")).status_code == 200
+    assert (await client.get("/health")).status_code == 200
+
+    stats = saturated.stats()
+    assert stats["write"]["shed"] == 2
+    assert stats["read"]["admitted"] == 2
+    assert stats["read"]["in_flight"] == 0
+
+
+async def test_metrics_endpoint(client: AsyncClient, saturated, monkeypatch):
+    assert (await client.get("/metrics")).status_code == 404  # off without a token
+
+    monkeypatch.setattr(get_settings(), "metrics_token", "scrape-me")
+    assert (await client.get("/metrics")).status_code == 401
+    assert (await client.get("/metrics", headers={"Authorization": "Bearer wrong"})).status_code == 401
+
+    await client.post("/b/anything/submit", data={"title": "x"})
+    response = await client.get("/metrics", headers={"Authorization": "Bearer scrape-me"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    lines = response.text.splitlines()
+    assert "# TYPE feedbackcue_admission_queued gauge" in lines
+    assert 'feedbackcue_admission_in_flight{class="write"} 1' in lines
+    assert 'feedbackcue_admission_requests_total{class="write",outcome="shed"} 1' in lines
+    assert 'feedbackcue_admission_queue_limit{class="read"} 4' in lines
@@ -0,0 +1,154 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, insert, select, update
+
+from app.models.archive import ArchivedFeedbackItem, ArchivedVote
+from app.models.feedback import FeedbackItem, FeedbackStatus
+from app.models.vote import Vote
+from app.services.archive import archive_items, get_archived_item, restore_item
+from app.services.board import create_board
+from app.services.feedback import create_feedback, get_feedback_by_id, get_listing_summary, list_feedback_rows
+from app.services.merge import merge_feedback, resolve_merged
+from tests.conftest import async_session_test
+
+
+async def _seed(db, board_id: str, title: str, status: FeedbackStatus, age_days: int, votes: int = 0) -> str:
+    item = await create_feedback(db, board_id, title, "", "feature", None, "T")
+    if votes:
+        await db.execute(insert(Vote), [{"feedback_item_id": item.id, "voter_key": n} for n in range(votes)])
+    await db.execute(
+        update(FeedbackItem)
+        .where(FeedbackItem.id == item.id)
+        .values(status=status, vote_count=votes, updated_at=datetime.now(timezone.utc) - timedelta(days=age_days))
+    )
+    await db.commit()
+    return item.id
+
+
+async def _count(db, column) -> int:
+    return (await db.execute(select(func.count(column)))).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_archive_moves_old_terminal_items_with_votes(db_session):
+    board = await create_board(db_session, "Archive", "", "#4F46E5", "owner")
+    old_closed = await _seed(db_session, board.id, "old closed", FeedbackStatus.CLOSED, 400, votes=2)
+    old_shipped = await _seed(db_session, board.id, "old shipped", FeedbackStatus.SHIPPED, 400, votes=1)
+    recent = await _seed(db_session, board.id, "recent closed", FeedbackStatus.CLOSED, 10, votes=1)
+    old_open = await _seed(db_session, board.id, "old open", FeedbackStatus.OPEN, 400)
+
+    archived = await archive_items(async_session_test, older_than_days=365, batch_size=1)
+
+    assert archived == 2
+    async with async_session_test() as db:
+        assert await get_feedback_by_id(db, old_closed) is None
+        assert await get_feedback_by_id(db, old_shipped) is None
+        assert await get_feedback_by_id(db, recent) is not None
+        assert await get_feedback_by_id(db, old_open) is not None
+        assert await _count(db, Vote.id) == 1
+        assert await _count(db, ArchivedVote.id) == 3
+        assert await _count(db, ArchivedFeedbackItem.id) == 2
+
+
+@pytest.mark.asyncio
+async def test_listing_includes_archived_only_when_asked(db_session):
+    board = await create_board(db_session, "Listing", "", "#4F46E5", "owner")
+    await _seed(db_session, board.id, "old closed", FeedbackStatus.CLOSED, 400, votes=5)
+    await _seed(db_session, board.id, "live", FeedbackStatus.OPEN, 1, votes=1)
+    await archive_items(async_session_test, older_than_days=365)
+
+    async with async_session_test() as db:
+        live = await list_feedback_rows(db, board.id)
+        assert [row.title for row in live] == ["live"]
+
+        combined = await list_feedback_rows(db, board.id, include_archived=True)
+        assert [(row.title, row.archived) for row in combined] == [("old closed", True), ("live", False)]
+
+        closed = await list_feedback_rows(db, board.id, status=FeedbackStatus.CLOSED, include_archived=True)
+        assert [row.title for row in closed] == ["old closed"]
+
+        summary = await get_listing_summary(db, board.id, include_archived=True)
+        assert summary["item_count"] == 2
+        assert summary["total_votes"] == 6
+
+
+@pytest.mark.asyncio
+async def test_restore_item_moves_it_back(db_session):
+    board = await create_board(db_session, "Restore", "", "#4F46E5", "owner")
+    item_id = await _seed(db_session, board.id, "old shipped", FeedbackStatus.SHIPPED, 400, votes=2)
+    await archive_items(async_session_test, older_than_days=365)
+
+    async with async_session_test() as db:
+        restored = await restore_item(db, await get_archived_item(db, item_id))
+        assert restored.vote_count == 2
+        assert restored.status == FeedbackStatus.SHIPPED
+        assert await get_archived_item(db, item_id) is None
+        assert await _count(db, Vote.id) == 2
+        assert await _count(db, ArchivedVote.id) == 0
+
+
+@pytest.mark.asyncio
+async def test_merge_stubs_are_archived_and_restored_with_their_target(db_session):
+    board = await create_board(db_session, "Stubs", "", "#4F46E5", "owner")
+    target_id = await _seed(db_session, board.id, "target", FeedbackStatus.SHIPPED, 1)
+    stub_id = await _seed(db_session, board.id, "duplicate", FeedbackStatus.OPEN, 1, votes=2)
+    await merge_feedback(db_session, target_id, [stub_id])
+    await db_session.execute(
+        update(FeedbackItem)
+        .where(FeedbackItem.id == target_id)
+        .values(updated_at=datetime.now(timezone.utc) - timedelta(days=400))
+    )
+    await db_session.commit()
+
+    assert await archive_items(async_session_test, older_than_days=365) == 1
+    async with async_session_test() as db:
+        assert await get_feedback_by_id(db, stub_id) is None
+        assert await _count(db, FeedbackItem.id) == 0
+        assert await _count(db, ArchivedVote.id) == 2
+        archived = await list_feedback_rows(db, board.id, include_archived=True)
+        assert [row.title for row in archived] == ["target"]
+
+        # Restoring through the stub brings back the target, the stub and the votes
+        restored = await restore_item(db, await get_archived_item(db, stub_id))
+        await db.commit()
+        assert restored.id == target_id and restored.vote_count == 2
+        assert (await resolve_merged(db, await get_feedback_by_id(db, stub_id))).id == target_id
+        assert await _count(db, ArchivedFeedbackItem.id) == 0
+        assert await _count(db, Vote.id) == 2
+
+
+@pytest.mark.asyncio
+async def test_dashboard_archived_toggle_and_restore(authenticated_client: AsyncClient):
+    create_resp = await authenticated_client.post("/api/boards", json={"name": "Archive UI"})
+    board_id = create_resp.json()["id"]
+    slug = create_resp.json()["slug"]
+    async with async_session_test() as db:
+        item_id = await _seed(db, board_id, "Long gone", FeedbackStatus.CLOSED, 400)
+    await archive_items(async_session_test, older_than_days=365)
+
+    response = await authenticated_client.get(f"/dashboard/boards/{board_id}")
+    assert "Long gone" not in response.text
+    response = await authenticated_client.get(f"/dashboard/boards/{board_id}?archived=true")
+    assert "Long gone" in response.text
+    assert f"/feedback/{item_id}/restore" in response.text
+
+    public = await authenticated_client.get(f"/b/{slug}?archived=true")
+    assert "Long gone" in public.text
+    assert f"/b/{slug}/vote/{item_id}" not in public.text
+
+    response = await authenticated_client.post(
+        f"/dashboard/boards/{board_id}/feedback/{item_id}/restore", follow_redirects=False
+    )
+    assert response.status_code == 302
+    response = await authenticated_client.get(f"/dashboard/boards/{board_id}")
+    assert "Long gone" in response.text
+
+
+@pytest.mark.asyncio
+async def test_restore_unknown_item_404(authenticated_client: AsyncClient):
+    create_resp = await authenticated_client.post("/api/boards", json={"name": "Archive 404"})
+    board_id = create_resp.json()["id"]
+    response = await authenticated_client.post(f"/dashboard/boards/{board_id}/feedback/nope/restore")
+    assert response.status_code == 404
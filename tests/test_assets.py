@@ -0,0 +1,69 @@
+import re
+
+from httpx import AsyncClient
+
+from app import assets
+from app.services.board import create_board, update_board
+from tests.conftest import async_session_test
+
+
+async def _board(accent: str = "#10B981"):
+    async with async_session_test() as db:
+        board = await create_board(db, "Launch", "Big day", accent, "owner")
+        await db.commit()
+        return board
+
+
+async def test_board_page_links_a_hashed_theme(client: AsyncClient):
+    board = await _board()
+    html = (await client.get(f"/b/{board.slug}")).text
+    assert "<style>" not in html and "#10B981" not in html
+    theme_path = re.search(r'href="(/b/launch/theme\.[0-9a-f]{12}\.css)"', html).group(1)
+    assert f'src="{assets.asset_url("board.js")}"' in html
+    assert theme_path in (await client.get(f"/b/{board.slug}/roadmap")).text
+
+    response = await client.get(theme_path)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/css")
+    assert response.headers["cache-control"] == assets.IMMUTABLE
+    assert ".accent-bg { background-color: #10B981; }" in response.text
+    assert ".vote-btn.voted { background-color: #10B98115;" in response.text
+
+    revalidated = await client.get(theme_path, headers={"If-None-Match": response.headers["etag"]})
+    assert revalidated.status_code == 304
+
+
+async def test_rebranding_changes_the_theme_url(client: AsyncClient):
+    board = await _board()
+    old_path = assets.theme_url(board)
+    async with async_session_test() as db:
+        board = await update_board(db, await db.merge(board), accent_color="#EF4444")
+        await db.commit()
+    new_path = assets.theme_url(board)
+    assert new_path != old_path
+    assert new_path in (await client.get(f"/b/{board.slug}")).text
+
+    # Pages rendered before the change still get the current colours
+    response = await client.get(old_path, follow_redirects=False)
+    assert response.status_code == 302
+    assert response.headers["location"] == new_path
+    assert response.headers["cache-control"] == "no-store"
+    assert (await client.get("/b/nope/theme.000000000000.css")).status_code == 404
+
+
+def test_theme_accepts_only_hex_colours():
+    assert b"#aabbcc15" in assets.theme_css("#abc").body
+    assert b"</style>" not in assets.theme_css("red;}</style>").body
+    assert assets.theme_css("red;}").digest == assets.theme_css(assets.DEFAULT_ACCENT).digest
+
+
+async def test_static_assets_are_immutable(client: AsyncClient):
+    url = assets.asset_url("board.js")
+    assert re.fullmatch(r"/assets/board\.[0-9a-f]{12}\.js", url)
+    response = await client.get(url)
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == assets.IMMUTABLE
+    assert response.content == (assets.STATIC_DIR / "board.js").read_bytes()
+    assert (await client.get(assets.asset_url("app.css"))).headers["content-type"].startswith("text/css")
+    assert (await client.get("/assets/board.000000000000.js")).status_code == 404
+    assert (await client.get("/assets/widget.js")).status_code == 404
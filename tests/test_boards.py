@@ -270,3 +270,178 @@ async def test_delete_nonexistent_board(authenticated_client: AsyncClient):
         follow_redirects=False,
     )
     assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_deleted_board_disappears_from_public_routes(client: AsyncClient, authenticated_client: AsyncClient):
+    data = (await authenticated_client.post("/api/boards", json={"name": "Vanishing"})).json()
+    await client.post(f"/b/{data['slug']}/submit", data={"title": "Lost idea", "category": "feature"})
+
+    await authenticated_client.post(f"/dashboard/boards/{data['id']}/delete", follow_redirects=False)
+
+    assert (await client.get(f"/b/{data['slug']}")).status_code == 404
+    assert (await authenticated_client.get(f"/dashboard/boards/{data['id']}")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_purge_board_deletes_votes_and_items_in_chunks(db_session):
+    from sqlalchemy import func, insert, select
+
+    from tests.conftest import async_session_test
+    from app.models.board import Board
+    from app.models.feedback import FeedbackItem
+    from app.models.vote import Vote
+    from app.services.board import create_board, delete_board, purge_board
+    from app.services.feedback import create_feedback
+
+    board = await create_board(db_session, "Purge Me", "", "#4F46E5", "owner")
+    keep = await create_board(db_session, "Keep Me", "", "#4F46E5", "owner")
+    items = [await create_feedback(db_session, board.id, f"Item {i}", "", "feature", None, "T") for i in range(5)]
+    kept_item = await create_feedback(db_session, keep.id, "Kept", "", "feature", None, "T")
+    await db_session.execute(
+        insert(Vote),
+        [{"feedback_item_id": item.id, "voter_key": v} for item in items + [kept_item] for v in range(7)],
+    )
+    await delete_board(db_session, board)
+    await db_session.commit()
+
+    deleted = await purge_board(async_session_test, board.id, chunk_size=4)
+    assert deleted == 5 * 7 + 5 + 1
+
+    async with async_session_test() as db:
+        assert await db.scalar(select(func.count(Vote.id))) == 7
+        assert await db.scalar(select(func.count(FeedbackItem.id))) == 1
+        assert await db.scalar(select(func.count(Board.id))) == 1
+
+
+@pytest.mark.asyncio
+async def test_purge_skips_live_boards(db_session):
+    from tests.conftest import async_session_test
+    from app.services.board import create_board, get_board_by_id, purge_board, purge_deleted_boards
+
+    board = await create_board(db_session, "Still Here", "", "#4F46E5", "owner")
+    await db_session.commit()
+
+    await purge_board(async_session_test, board.id)
+    assert await purge_deleted_boards(async_session_test) == 0
+    assert await get_board_by_id(db_session, board.id) is not None
+
+
+@pytest.mark.asyncio
+async def test_delete_account_soft_deletes_boards(authenticated_client: AsyncClient, db_session):
+    from sqlalchemy import select
+
+    from app.models.board import Board
+
+    data = (await authenticated_client.post("/api/boards", json={"name": "Owner Gone"})).json()
+    response = await authenticated_client.delete("/api/auth/me")
+    assert response.status_code == 204
+
+    board = await db_session.scalar(select(Board).where(Board.id == data["id"]))
+    assert board.deleted_at is not None
+    assert (await authenticated_client.get(f"/b/{data['slug']}")).status_code == 404
+    assert (await authenticated_client.get("/api/boards")).status_code == 401
+
+
+async def _board_with_feedback(authenticated_client: AsyncClient, name: str, titles: list[str]) -> tuple[str, list[str]]:
+    from app.services.feedback import create_feedback
+    from tests.conftest import async_session_test
+
+    board_id = (await authenticated_client.post("/api/boards", json={"name": name})).json()["id"]
+    async with async_session_test() as db:
+        items = [await create_feedback(db, board_id, title, "", "feature", None, "T") for title in titles]
+        await db.commit()
+    return board_id, [item.id for item in items]
+
+
+@pytest.mark.asyncio
+async def test_bulk_moderation_api_updates_in_constant_queries(authenticated_client: AsyncClient, db_session):
+    from sqlalchemy import event
+
+    from app.models.feedback import FeedbackCategory, FeedbackStatus
+    from app.services.feedback import get_feedback_by_id
+    from tests.conftest import engine_test
+
+    board_id, item_ids = await _board_with_feedback(authenticated_client, "Bulk", [f"Item {n}" for n in range(40)])
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("UPDATE FEEDBACK_ITEMS"):
+            statements.append(statement)
+
+    event.listen(engine_test.sync_engine, "before_cursor_execute", count)
+    try:
+        response = await authenticated_client.post(
+            f"/api/boards/{board_id}/feedback/bulk",
+            json={"item_ids": item_ids + ["missing"], "status": "planned", "category": "bug"},
+        )
+    finally:
+        event.remove(engine_test.sync_engine, "before_cursor_execute", count)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["updated"], data["not_found"]) == (40, 1)
+    assert data["results"][-1] == {"id": "missing", "result": "not_found"}
+    assert len(statements) == 1
+    item = await get_feedback_by_id(db_session, item_ids[0])
+    assert (item.status, item.category) == (FeedbackStatus.PLANNED, FeedbackCategory.BUG)
+
+
+@pytest.mark.asyncio
+async def test_bulk_moderation_ignores_other_owners_items(client: AsyncClient, authenticated_client: AsyncClient):
+    from app.services.board import create_board
+    from app.services.feedback import create_feedback, get_feedback_by_id
+    from tests.conftest import async_session_test
+
+    async with async_session_test() as db:
+        foreign = await create_board(db, "Not Mine", "", "#4F46E5", "someone-else")
+        item = await create_feedback(db, foreign.id, "Hands off", "", "feature", None, "T")
+        await db.commit()
+
+    response = await authenticated_client.post(
+        f"/api/boards/{foreign.id}/feedback/bulk", json={"item_ids": [item.id], "delete": True}
+    )
+    assert response.json()["results"] == [{"id": item.id, "result": "not_found"}]
+    async with async_session_test() as db:
+        assert await get_feedback_by_id(db, item.id) is not None
+
+
+@pytest.mark.asyncio
+async def test_bulk_moderation_form_deletes_items_and_votes(authenticated_client: AsyncClient):
+    from sqlalchemy import func, select
+
+    from app.models.vote import Vote
+    from app.services.feedback import get_feedback_by_id, toggle_vote
+    from tests.conftest import async_session_test
+
+    board_id, item_ids = await _board_with_feedback(authenticated_client, "Bulk Form", ["Keep", "Drop 1", "Drop 2"])
+    async with async_session_test() as db:
+        for item_id in item_ids:
+            await toggle_vote(db, item_id, "voter")
+        await db.commit()
+
+    detail = await authenticated_client.get(f"/dashboard/boards/{board_id}")
+    assert 'id="bulk-form"' in detail.text
+    response = await authenticated_client.post(
+        f"/dashboard/boards/{board_id}/feedback/bulk",
+        data={"action": "delete", "item_ids": item_ids[1:]},
+        follow_redirects=False,
+    )
+    assert response.status_code == 302
+    async with async_session_test() as db:
+        assert await get_feedback_by_id(db, item_ids[0]) is not None
+        assert await get_feedback_by_id(db, item_ids[1]) is None
+        assert await db.scalar(select(func.count(Vote.id))) == 1
+
+
+@pytest.mark.asyncio
+async def test_bulk_moderation_rejects_ambiguous_request(authenticated_client: AsyncClient):
+    board_id, item_ids = await _board_with_feedback(authenticated_client, "Bulk Bad", ["One"])
+    response = await authenticated_client.post(
+        f"/api/boards/{board_id}/feedback/bulk", json={"item_ids": item_ids, "status": "open", "delete": True}
+    )
+    assert response.status_code == 422
+    response = await authenticated_client.post(
+        f"/dashboard/boards/{board_id}/feedback/bulk", data={"action": "status:bogus", "item_ids": item_ids}
+    )
+    assert response.status_code == 422
@@ -0,0 +1,175 @@
+import asyncio
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from app.bus import BOARD_CHANGED, ITEM_VOTED, EventBus, MemoryBus, Message, SQLiteBus, bus
+from app.cache import LocalCache, get_cache
+
+SRC_DIR = str(Path(__file__).parent.parent / "src")
+
+LISTENER = textwrap.dedent(
+    """
+    import asyncio, sys
+    from app.bus import SQLiteBus
+
+    async def main():
+        b = SQLiteBus(sys.argv[1], poll_interval=0.05)
+        got = asyncio.Event()
+        b.subscribe("board.changed", lambda m: (print(m.key, flush=True), got.set()))
+        await b.start()
+        print("ready", flush=True)
+        await asyncio.wait_for(got.wait(), timeout=15)
+        await b.stop()
+
+    asyncio.run(main())
+    """
+)
+
+PUBLISHER = textwrap.dedent(
+    """
+    import asyncio, sys
+    from app.bus import SQLiteBus
+
+    async def main():
+        b = SQLiteBus(sys.argv[1])
+        await b.start()
+        await b.publish("board.changed", sys.argv[2])
+        await b.stop()
+
+    asyncio.run(main())
+    """
+)
+
+
+def _spawn(script: str, *args: str) -> subprocess.Popen:
+    env = {**os.environ, "PYTHONPATH": SRC_DIR, "ENVIRONMENT": "test"}
+    return subprocess.Popen(
+        [sys.executable, "-c", script, *args], stdout=subprocess.PIPE, text=True, env=env
+    )
+
+
+def test_local_cache_lru_eviction():
+    cache = LocalCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert len(cache) == 2
+
+
+def test_local_cache_ttl():
+    cache = LocalCache(ttl=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+
+
+def test_local_cache_invalidate_tag():
+    cache = LocalCache()
+    cache.set("x", 1, tags=("board-1",))
+    cache.set("y", 2, tags=("board-1", "board-2"))
+    cache.set("z", 3, tags=("board-2",))
+    cache.invalidate("board-1")
+    assert cache.get("x") is None
+    assert cache.get("y") is None
+    assert cache.get("z") == 3
+
+
+@pytest.mark.asyncio
+async def test_memory_bus_dispatches_locally():
+    local = MemoryBus()
+    received: list[Message] = []
+    local.subscribe(BOARD_CHANGED, received.append)
+    await local.start()
+    await local.publish(BOARD_CHANGED, "board-1")
+    await local.publish(ITEM_VOTED, "item-1")
+    await local.stop()
+    assert [m.key for m in received] == ["board-1"]
+
+
+@pytest.mark.asyncio
+async def test_board_change_invalidates_cache_after_commit(db_session):
+    from app.services.board import create_board, get_board_by_id, update_board
+
+    board = await create_board(db_session, "Cached", "", "#4F46E5", "owner")
+    await db_session.commit()
+
+    cache = get_cache("test-boards")
+    cache.set(board.id, "rendered", tags=(board.id,))
+
+    board = await get_board_by_id(db_session, board.id)
+    await update_board(db_session, board, name="Renamed")
+    assert cache.get(board.id) == "rendered"  # not yet committed
+    await db_session.commit()
+    assert cache.get(board.id) is None
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_change_is_not_published(db_session):
+    from app.services.board import create_board, get_board_by_id, update_board
+
+    board = await create_board(db_session, "Rollback", "", "#4F46E5", "owner")
+    await db_session.commit()
+    board_id = board.id
+
+    received: list[Message] = []
+    bus.subscribe(BOARD_CHANGED, received.append)
+    try:
+        board = await get_board_by_id(db_session, board_id)
+        await update_board(db_session, board, name="Never")
+        await db_session.rollback()
+    finally:
+        bus.unsubscribe(BOARD_CHANGED, received.append)
+    assert board_id not in [m.key for m in received]
+
+
+def test_incomplete_backend_fails_when_constructed():
+    class NoBroadcast(EventBus):
+        pass
+
+    with pytest.raises(TypeError):
+        NoBroadcast()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_bus_skips_own_messages(tmp_path):
+    path = str(tmp_path / "bus.db")
+    a, b = SQLiteBus(path, poll_interval=0.01), SQLiteBus(path, poll_interval=0.01)
+    seen_a: list[str] = []
+    seen_b: list[str] = []
+    a.subscribe(BOARD_CHANGED, lambda m: seen_a.append(m.key))
+    b.subscribe(BOARD_CHANGED, lambda m: seen_b.append(m.key))
+    await a.start()
+    await b.start()
+    await a.publish(BOARD_CHANGED, "board-1")
+    for _ in range(100):
+        if seen_b:
+            break
+        await asyncio.sleep(0.01)
+    await a.stop()
+    await b.stop()
+    assert seen_a == ["board-1"]
+    assert seen_b == ["board-1"]
+
+
+def test_sqlite_bus_broadcasts_across_worker_processes(tmp_path):
+    path = str(tmp_path / "bus.db")
+    listeners = [_spawn(LISTENER, path) for _ in range(2)]
+    try:
+        for proc in listeners:
+            assert proc.stdout.readline().strip() == "ready"
+        publisher = _spawn(PUBLISHER, path, "board-42")
+        assert publisher.wait(timeout=15) == 0
+        for proc in listeners:
+            assert proc.stdout.readline().strip() == "board-42"
+            assert proc.wait(timeout=15) == 0
+    finally:
+        for proc in listeners:
+            if proc.poll() is None:
+                proc.kill()
@@ -0,0 +1,124 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from app import compression
+from app.compression import CompressionMiddleware, choose_encoding
+
+BIG_TEXT = "feedback " * 500
+
+
+async def big_text(request):
+    return PlainTextResponse(BIG_TEXT)
+
+
+async def small_text(request):
+    return PlainTextResponse("tiny")
+
+
+async def big_png(request):
+    return Response(b"\x89PNG" + b"\x00" * 5000, media_type="image/png")
+
+
+async def big_json(request):
+    return JSONResponse({"items": [{"title": "same"} for _ in range(500)]}, headers={"etag": '"v1"'})
+
+
+async def streamed(request):
+    async def chunks():
+        for i in range(5):
+            yield f"chunk {i} ".encode() * 200
+
+    return StreamingResponse(chunks(), media_type="text/html")
+
+
+def make_client() -> AsyncClient:
+    app = Starlette(
+        routes=[
+            Route("/big", big_text),
+            Route("/small", small_text),
+            Route("/png", big_png),
+            Route("/json", big_json),
+            Route("/stream", streamed),
+        ]
+    )
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+def test_choose_encoding_respects_preference_and_q_values():
+    available = {"br": None, "gzip": None}
+    assert choose_encoding("gzip, br", available) == "br"
+    assert choose_encoding("gzip, br;q=0", available) == "gzip"
+    assert choose_encoding("identity", available) is None
+    assert choose_encoding("*", available) == "br"
+    assert choose_encoding("", available) is None
+
+
+@pytest.mark.asyncio
+async def test_large_text_is_gzipped():
+    async with make_client() as client:
+        response = await client.get("/big", headers={"accept-encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(BIG_TEXT)
+    assert response.text == BIG_TEXT
+
+
+@pytest.mark.asyncio
+async def test_small_and_binary_responses_pass_through():
+    async with make_client() as client:
+        small = await client.get("/small", headers={"accept-encoding": "gzip"})
+        png = await client.get("/png", headers={"accept-encoding": "gzip"})
+        plain = await client.get("/big", headers={"accept-encoding": "identity"})
+    assert "content-encoding" not in small.headers
+    assert "content-encoding" not in png.headers
+    assert "content-encoding" not in plain.headers
+    # Compressible types vary by Accept-Encoding even when this response wasn't encoded
+    assert small.headers["vary"] == "Accept-Encoding"
+    assert plain.headers["vary"] == "Accept-Encoding"
+    assert "vary" not in png.headers
+
+
+@pytest.mark.asyncio
+async def test_etag_becomes_weak_when_compressed():
+    async with make_client() as client:
+        response = await client.get("/json", headers={"accept-encoding": "gzip"})
+    assert response.headers["etag"] == 'W/"v1"'
+
+
+@pytest.mark.asyncio
+async def test_streaming_body_is_compressed_incrementally():
+    async with make_client() as client:
+        response = await client.get("/stream", headers={"accept-encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.text == "".join(f"chunk {i} " * 200 for i in range(5))
+
+
+@pytest.mark.asyncio
+async def test_identical_bodies_are_compressed_once(monkeypatch):
+    calls = []
+    compress, stream = compression.ENCODERS["gzip"]
+
+    def counting(body):
+        calls.append(len(body))
+        return compress(body)
+
+    monkeypatch.setitem(compression.ENCODERS, "gzip", (counting, stream))
+    async with make_client() as client:
+        first = await client.get("/big", headers={"accept-encoding": "gzip"})
+        second = await client.get("/big", headers={"accept-encoding": "gzip"})
+    assert first.content == second.content
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_public_board_is_compressed(client: AsyncClient, authenticated_client: AsyncClient):
+    slug = (await authenticated_client.post("/api/boards", json={"name": "Compressed"})).json()["slug"]
+    response = await client.get(f"/b/{slug}", headers={"accept-encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Compressed" in response.text
+    assert int(response.headers["content-length"]) < len(response.content)
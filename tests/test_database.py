@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import func, literal, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+from app.database import upsert
+from app.models.event import ProjectionCounter
+from app.models.vote import Vote
+from app.models.voter import Voter
+
+
+def _session(dialect):
+    bind = SimpleNamespace(dialect=dialect)
+    return SimpleNamespace(get_bind=lambda: bind)
+
+
+@pytest.mark.parametrize("dialect", [sqlite.dialect(), postgresql.dialect()], ids=["sqlite", "postgresql"])
+def test_upserts_compile_for_each_database(dialect):
+    db = _session(dialect)
+
+    voter = upsert(db, Voter).values(identity="x", email="a@example.com")
+    voter = voter.on_conflict_do_update(index_elements=[Voter.identity], set_={"email": "a@example.com"})
+
+    votes = (
+        upsert(db, Vote)
+        .values([{"feedback_item_id": "a", "voter_key": 1}])
+        .on_conflict_do_nothing(index_elements=[Vote.feedback_item_id, Vote.voter_key])
+        .returning(Vote.feedback_item_id)
+    )
+
+    moved = upsert(db, Vote).from_select(
+        ["feedback_item_id", "voter_key", "created_at"],
+        select(literal("a"), Vote.voter_key, func.min(Vote.created_at)).group_by(Vote.voter_key),
+    ).on_conflict_do_nothing(index_elements=["feedback_item_id", "voter_key"])
+
+    counters = upsert(db, ProjectionCounter).values([{"projection": "p", "key": "k", "value": 1}])
+    counters = counters.on_conflict_do_update(
+        index_elements=[ProjectionCounter.projection, ProjectionCounter.key],
+        set_={"value": ProjectionCounter.value + counters.excluded.value},
+    )
+
+    for statement in (voter, votes, moved, counters):
+        assert "ON CONFLICT" in str(statement.compile(dialect=dialect))
+
+
+def test_upsert_rejects_other_databases():
+    with pytest.raises(ValueError, match="mysql"):
+        upsert(_session(mysql.dialect()), Voter)
@@ -184,3 +184,43 @@ async def test_public_board_form_collapsed_with_items(client: AsyncClient, authe
     # Form should have "hidden" class when items exist
     assert 'id="feedback-form"' in response.text
     assert 'class="space-y-4 mt-4 hidden"' in response.text
+
+
+@pytest.mark.asyncio
+async def test_items_fragment_filters(client: AsyncClient, authenticated_client: AsyncClient):
+    create_resp = await authenticated_client.post("/api/boards", json={"name": "Fragment Filter"})
+    slug = create_resp.json()["slug"]
+    await client.post(f"/b/{slug}/submit", data={"title": "A bug report", "category": "bug"})
+    await client.post(f"/b/{slug}/submit", data={"title": "A feature idea", "category": "feature"})
+
+    response = await client.get(f"/b/{slug}/items?category_filter=bug", headers={"X-Fragment": "1"})
+    assert response.status_code == 200
+    assert "<html" not in response.text
+    assert 'data-count="1"' in response.text
+    assert "A bug report" in response.text
+    assert "A feature idea" not in response.text
+
+
+@pytest.mark.asyncio
+async def test_items_fragment_404(client: AsyncClient):
+    response = await client.get("/b/nonexistent/items")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_list_feedback_rows_projects_and_truncates(db_session):
+    from app.services.board import create_board
+    from app.services.feedback import FeedbackRow, create_feedback, list_feedback_rows
+
+    board = await create_board(db_session, "Rows Board", "", "#4F46E5", "owner")
+    await create_feedback(db_session, board.id, "Long one", "x" * 1000, "feature", None, "Tester")
+    await create_feedback(db_session, board.id, "Bug one", "short", "bug", "a@b.com", "Tester")
+    await db_session.commit()
+
+    rows = await list_feedback_rows(db_session, board.id, sort_by="oldest", description_chars=50)
+    assert [type(r) for r in rows] == [FeedbackRow, FeedbackRow]
+    assert rows[0].title == "Long one"
+    assert rows[0].description == "x" * 50
+    assert rows[1].author_email == "a@b.com"
+    assert rows[1].category.value == "bug"
+    assert not hasattr(rows[0], "__dict__")
@@ -0,0 +1,149 @@
+import asyncio
+import re
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+
+from app import idempotency
+from app.idempotency import (
+    DatabaseIdempotencyStore,
+    MemoryIdempotencyStore,
+    StoredResponse,
+    prune_idempotency_keys,
+)
+from app.models.feedback import FeedbackItem
+from app.models.idempotency import IdempotencyKey
+from app.services.board import create_board
+from app.services.feedback import create_feedback, get_feedback_by_id
+from tests.conftest import async_session_test
+
+
+@pytest.fixture(params=["memory", "database"])
+def store(request, monkeypatch):
+    if request.param == "memory":
+        backend = MemoryIdempotencyStore(maxsize=100, ttl=60)
+    else:
+        backend = DatabaseIdempotencyStore(ttl=60)
+    monkeypatch.setattr(idempotency, "store", backend)
+    return backend
+
+
+async def _board(db):
+    board = await create_board(db, "Idempotent", "", "#4F46E5", "owner")
+    item = await create_feedback(db, board.id, "Existing", "", "feature", None, "T")
+    await db.commit()
+    return board, item
+
+
+async def _item_count(db) -> int:
+    return await db.scalar(select(func.count(FeedbackItem.id)))
+
+
+@pytest.mark.asyncio
+async def test_repeated_submit_creates_one_item(client: AsyncClient, db_session, store):
+    board, _ = await _board(db_session)
+    form = {"title": "Offline mode", "category": "feature", "idempotency_key": "submit-1"}
+
+    first = await client.post(f"/b/{board.slug}/submit", data=form, follow_redirects=False)
+    again = await client.post(f"/b/{board.slug}/submit", data=form, follow_redirects=False)
+
+    assert first.status_code == again.status_code == 302
+    assert again.headers["location"] == first.headers["location"]
+    assert again.headers["idempotent-replayed"] == "true"
+    assert await _item_count(db_session) == 2
+
+    # A new key is a new submission
+    await client.post(f"/b/{board.slug}/submit", data={**form, "idempotency_key": "submit-2"}, follow_redirects=False)
+    assert await _item_count(db_session) == 3
+
+
+@pytest.mark.asyncio
+async def test_repeated_vote_does_not_toggle_back(client: AsyncClient, db_session, store):
+    board, item = await _board(db_session)
+    url = f"/b/{board.slug}/vote/{item.id}"
+
+    first = await client.post(url, data={"idempotency_key": "vote-1"}, headers={"X-Fragment": "1"})
+    again = await client.post(url, data={"idempotency_key": "vote-1"}, headers={"X-Fragment": "1"})
+    assert first.text == again.text
+    assert "set-cookie" in first.headers and "set-cookie" not in again.headers
+    async with async_session_test() as db:
+        assert (await get_feedback_by_id(db, item.id)).vote_count == 1
+
+    # The returned button carries a fresh key, so the next click does toggle
+    next_key = re.search(r'name="idempotency_key" value="([^"]+)"', first.text).group(1)
+    assert next_key != "vote-1"
+    await client.post(url, data={"idempotency_key": next_key}, headers={"X-Fragment": "1"})
+    async with async_session_test() as db:
+        assert (await get_feedback_by_id(db, item.id)).vote_count == 0
+
+
+@pytest.mark.asyncio
+async def test_keys_are_not_shared_between_voters(client: AsyncClient, db_session, store):
+    board, item = await _board(db_session)
+    url = f"/b/{board.slug}/vote/{item.id}"
+
+    first = await client.post(url, data={"idempotency_key": "shared"}, headers={"X-Fragment": "1"})
+    first_voter = client.cookies["voter_id"]
+    client.cookies.clear()
+    client.cookies.set("voter_id", "someone-else")
+    other = await client.post(url, data={"idempotency_key": "shared"}, headers={"X-Fragment": "1"})
+
+    assert first.status_code == other.status_code == 200
+    assert "idempotent-replayed" not in other.headers
+    assert first_voter not in other.headers.get("set-cookie", "")
+    async with async_session_test() as db:
+        assert (await get_feedback_by_id(db, item.id)).vote_count == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_requests_are_not_remembered(client: AsyncClient, db_session, store):
+    board, _ = await _board(db_session)
+    response = await client.post(
+        f"/b/{board.slug}/vote/missing", headers={"X-Fragment": "1", "Idempotency-Key": "retry-me"}
+    )
+    assert response.status_code == 404
+    async with async_session_test() as db:
+        assert await db.scalar(select(func.count()).select_from(IdempotencyKey)) == 0
+
+    response = await client.post(
+        f"/b/{board.slug}/submit", data={"title": "x"}, headers={"Idempotency-Key": "k" * 256}
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_board_forms_carry_keys(client: AsyncClient, db_session):
+    board, _ = await _board(db_session)
+    page = (await client.get(f"/b/{board.slug}")).text
+    keys = re.findall(r'name="idempotency_key" value="([^"]+)"', page)
+    assert len(keys) == 2  # the submit form and the one vote button
+    assert len(set(keys)) == 2
+
+
+@pytest.mark.asyncio
+async def test_memory_store_waits_for_running_request(db_session):
+    store = MemoryIdempotencyStore(maxsize=10, ttl=60)
+    assert await store.claim(db_session, "key") is None
+    waiter = asyncio.create_task(store.claim(db_session, "key"))
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    stored = StoredResponse(302, [("location", "/b/x")], b"")
+    await store.record(db_session, "key", stored)
+    await db_session.commit()
+    store.release("key")
+    assert await waiter == stored
+
+
+@pytest.mark.asyncio
+async def test_database_keys_expire(client: AsyncClient, db_session, monkeypatch):
+    monkeypatch.setattr(idempotency, "store", DatabaseIdempotencyStore(ttl=0))
+    board, _ = await _board(db_session)
+    form = {"title": "Again", "idempotency_key": "expiring"}
+
+    await client.post(f"/b/{board.slug}/submit", data=form, follow_redirects=False)
+    await client.post(f"/b/{board.slug}/submit", data=form, follow_redirects=False)
+    assert await _item_count(db_session) == 3
+
+    assert await prune_idempotency_keys(async_session_test, ttl=0) == 1
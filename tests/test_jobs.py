@@ -0,0 +1,256 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app import jobs
+from app.jobs import JobWorker, Schedule, enqueue, enqueue_due_schedules, job_handler, prune_jobs, sync_schedules
+from app.database import Base
+from app.models.job import Job, JobSchedule, JobStatus
+from tests.conftest import async_session_test
+
+calls: list[dict] = []
+
+
+@job_handler("test-flaky")
+async def flaky(ctx):
+    calls.append(ctx.payload)
+    if ctx.attempt == 1:
+        raise RuntimeError("transient")
+
+
+@job_handler("test-progress")
+async def progress(ctx):
+    await ctx.checkpoint(step=ctx.payload.get("step", 0) + 1)
+
+
+running_now = 0
+peak = 0
+release = asyncio.Event()
+
+
+@job_handler("test-serial", concurrency=1)
+async def serial(ctx):
+    pass
+
+
+@job_handler("test-parallel")
+async def parallel(ctx):
+    global running_now, peak
+    running_now += 1
+    peak = max(peak, running_now)
+    try:
+        await release.wait()
+    finally:
+        running_now -= 1
+
+
+@job_handler("test-slow")
+async def slow(ctx):
+    await asyncio.sleep(0.5)
+
+
+@pytest.fixture
+async def file_sessions(tmp_path):
+    """A file database: the in-memory test engine shares one connection, which can't interleave transactions."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def _job(job_id: int) -> Job:
+    async with async_session_test() as db:
+        return await db.scalar(select(Job).where(Job.id == job_id))
+
+
+@pytest.mark.asyncio
+async def test_failed_job_is_retried_with_backoff(db_session):
+    calls.clear()
+    job = enqueue(db_session, "test-flaky", {"n": 1})
+    await db_session.commit()
+    worker = JobWorker(async_session_test)
+
+    assert await worker.run_until_idle() == 1
+    stored = await _job(job.id)
+    assert (stored.status, stored.attempts, stored.last_error) == (JobStatus.QUEUED, 1, "RuntimeError('transient')")
+    assert stored.run_after.replace(tzinfo=timezone.utc) > datetime.now(timezone.utc)
+
+    async with async_session_test() as db:
+        await db.execute(update(Job).where(Job.id == job.id).values(run_after=datetime.now(timezone.utc)))
+        await db.commit()
+    assert await worker.run_until_idle() == 1
+    stored = await _job(job.id)
+    assert (stored.status, stored.attempts) == (JobStatus.DONE, 2)
+    assert calls == [{"n": 1}, {"n": 1}]
+
+
+@pytest.mark.asyncio
+async def test_lease_keeps_other_workers_off_until_it_expires(db_session):
+    job = enqueue(db_session, "test-progress")
+    await db_session.commit()
+    first, second = JobWorker(async_session_test), JobWorker(async_session_test)
+
+    claimed = await first.claim()
+    assert claimed.id == job.id
+    assert await second.claim() is None
+
+    async with async_session_test() as db:
+        expired = datetime.now(timezone.utc) - timedelta(seconds=1)
+        await db.execute(update(Job).where(Job.id == job.id).values(locked_until=expired))
+        await db.commit()
+    assert await second.run_until_idle() == 1
+    stored = await _job(job.id)
+    assert (stored.status, stored.attempts, stored.payload) == (JobStatus.DONE, 2, {"step": 1})
+
+
+@pytest.mark.asyncio
+async def test_job_without_handler_fails(db_session):
+    job = enqueue(db_session, "no-such-kind")
+    await db_session.commit()
+    await JobWorker(async_session_test).run_until_idle()
+    assert (await _job(job.id)).status == JobStatus.FAILED
+
+
+@pytest.mark.asyncio
+async def test_kind_concurrency_limit_holds_across_workers(db_session):
+    for _ in range(2):
+        enqueue(db_session, "test-serial")
+    other = enqueue(db_session, "test-progress")
+    await db_session.commit()
+    first, second = JobWorker(async_session_test), JobWorker(async_session_test)
+
+    assert (await first.claim()).kind == "test-serial"
+    # The second serial job waits for the first; other kinds still flow
+    assert (await second.claim()).id == other.id
+    assert await second.claim() is None
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_jobs_concurrently(file_sessions):
+    global peak
+    peak = 0
+    release.clear()
+    async with file_sessions() as db:
+        for _ in range(3):
+            enqueue(db, "test-parallel")
+        await db.commit()
+
+    worker = JobWorker(file_sessions, poll_interval=0.05, concurrency=3)
+    await worker.start()
+    try:
+        for _ in range(100):
+            if peak == 3:
+                break
+            await asyncio.sleep(0.02)
+        release.set()
+        async with file_sessions() as db:
+            for _ in range(100):
+                if not await db.scalar(select(func.count(Job.id)).where(Job.status != JobStatus.DONE)):
+                    break
+                await asyncio.sleep(0.02)
+    finally:
+        await worker.stop()
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_keeps_long_job_leased(db_session):
+    job = enqueue(db_session, "test-slow")
+    await db_session.commit()
+    first, second = JobWorker(async_session_test, lease_seconds=0.3), JobWorker(async_session_test)
+
+    running = asyncio.create_task(first.run_once())
+    await asyncio.sleep(0.4)
+    assert await second.claim() is None
+    await running
+    assert (await _job(job.id)).status == JobStatus.DONE
+
+
+@pytest.mark.asyncio
+async def test_due_schedule_is_enqueued_exactly_once(file_sessions, monkeypatch):
+    monkeypatch.setattr(jobs, "_schedules", {"every-minute": Schedule("every-minute", "test-progress", interval=60)})
+    await sync_schedules(file_sessions)
+    async with file_sessions() as db:
+        row = await db.get(JobSchedule, "every-minute")
+        assert row.next_run_at.replace(tzinfo=timezone.utc) > datetime.now(timezone.utc)
+        await db.execute(update(JobSchedule).values(next_run_at=datetime.now(timezone.utc) - timedelta(seconds=1)))
+        await db.commit()
+
+    counts = await asyncio.gather(*(enqueue_due_schedules(file_sessions) for _ in range(3)))
+    assert sum(counts) == 1
+    assert await enqueue_due_schedules(file_sessions) == 0
+    async with file_sessions() as db:
+        assert await db.scalar(select(func.count(Job.id)).where(Job.kind == "test-progress")) == 1
+        before = (await db.get(JobSchedule, "every-minute")).next_run_at
+
+    # Restarting with the same definition keeps the timetable; a changed one resets it
+    await sync_schedules(file_sessions)
+    async with file_sessions() as db:
+        assert (await db.get(JobSchedule, "every-minute")).next_run_at == before
+    jobs._schedules["every-minute"] = Schedule("every-minute", "test-progress", cron="0 * * * *")
+    await sync_schedules(file_sessions)
+    async with file_sessions() as db:
+        row = await db.get(JobSchedule, "every-minute")
+        assert (row.cron, row.interval, row.next_run_at.minute) == ("0 * * * *", None, 0)
+
+
+def test_cron_schedule_next_run():
+    nightly = Schedule("nightly", "x", cron="30 3 * * *")
+    at = datetime(2026, 5, 1, 3, 30, tzinfo=timezone.utc)
+    assert nightly.next_run(at) == datetime(2026, 5, 2, 3, 30, tzinfo=timezone.utc)
+    assert nightly.next_run(at - timedelta(minutes=1)) == at
+    with pytest.raises(ValueError):
+        jobs.schedule("broken", "x", cron="every day")
+    with pytest.raises(ValueError):
+        jobs.schedule("both", "x", cron="* * * * *", interval=60)
+
+
+@pytest.mark.asyncio
+async def test_prune_removes_only_old_finished_jobs(db_session):
+    old = datetime.now(timezone.utc) - timedelta(days=30)
+    for status, finished_at in [
+        (JobStatus.DONE, old),
+        (JobStatus.FAILED, old),
+        (JobStatus.DONE, datetime.now(timezone.utc)),
+        (JobStatus.QUEUED, None),
+    ]:
+        db_session.add(Job(kind="test-progress", status=status, finished_at=finished_at))
+    await db_session.commit()
+
+    assert await prune_jobs(async_session_test, older_than_days=7, batch_size=1) == 2
+    assert await db_session.scalar(select(func.count(Job.id))) == 2
+
+
+@pytest.mark.asyncio
+async def test_admin_job_stats(authenticated_client: AsyncClient, monkeypatch):
+    assert (await authenticated_client.get("/api/admin/jobs")).status_code == 404
+    monkeypatch.setattr(jobs.settings, "admin_emails", "ops@example.com, Test@Example.com")
+
+    async with async_session_test() as db:
+        enqueue(db, "test-progress")
+        enqueue(db, "test-progress")
+        enqueue(db, "test-progress", delay=3600)
+        failed = enqueue(db, "no-such-kind")
+        await db.commit()
+    worker = JobWorker(async_session_test)
+    await worker.run_once()
+    await worker.run_once()
+    await worker.run_once()
+
+    stats = (await authenticated_client.get("/api/admin/jobs")).json()
+    by_kind = {row["kind"]: row for row in stats["kinds"]}
+    assert (by_kind["test-progress"]["done"], by_kind["test-progress"]["scheduled"]) == (2, 1)
+    assert by_kind["test-progress"]["wait_p50"] is not None
+    assert [job["id"] for job in stats["failures"]] == [failed.id]
+
+    page = await authenticated_client.get("/admin/jobs")
+    assert page.status_code == 200 and "test-progress" in page.text
+
+    response = await authenticated_client.post(f"/admin/jobs/{failed.id}/retry", follow_redirects=False)
+    assert response.status_code == 302
+    assert (await _job(failed.id)).status == JobStatus.QUEUED
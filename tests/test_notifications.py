@@ -0,0 +1,130 @@
+import socket
+
+import pytest
+from aiosmtpd.controller import Controller
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app.jobs import JobWorker
+from app.mailer import SMTPPool
+from app.models.feedback import FeedbackStatus
+from app.models.job import Job, JobStatus
+from app.services import notifications
+from app.services.board import create_board
+from app.services.feedback import create_feedback, toggle_vote, update_feedback_status
+from app.services.notifications import STATUS_CHANGE_JOB
+from tests.conftest import async_session_test
+
+
+class Inbox:
+    def __init__(self) -> None:
+        self.recipients: list[str] = []
+        self.subjects: list[str] = []
+
+    async def handle_DATA(self, server, session, envelope):
+        self.recipients.extend(envelope.rcpt_tos)
+        for line in envelope.content.decode().splitlines():
+            if line.startswith("Subject: "):
+                self.subjects.append(line.removeprefix("Subject: "))
+        return "250 OK"
+
+
+@pytest.fixture
+def inbox(monkeypatch):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    handler = Inbox()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    pool = SMTPPool("127.0.0.1", port, size=2)
+    monkeypatch.setattr(notifications, "get_mailer", lambda: pool)
+    yield handler
+    pool.close()
+    controller.stop()
+
+
+async def _voted_item(db, voters: dict[str, str | None], board_id: str | None = None, title: str = "Dark mode"):
+    if board_id is None:
+        board_id = (await create_board(db, "Notify", "", "#4F46E5", "owner")).id
+    item = await create_feedback(db, board_id, title, "", "feature", None, "T")
+    await db.commit()
+    for voter_id, email in voters.items():
+        await toggle_vote(db, item.id, voter_id, email)
+    await db.commit()
+    return item
+
+
+@pytest.mark.asyncio
+async def test_status_change_emails_each_voter_once(db_session, inbox, monkeypatch):
+    monkeypatch.setattr(notifications.settings, "notify_batch_size", 2)
+    item = await _voted_item(
+        db_session,
+        {"a": "ann@example.com", "b": "bob@example.com", "c": "ANN@example.com", "d": None, "e": "eve@example.com"},
+    )
+
+    await update_feedback_status(db_session, item, FeedbackStatus.PLANNED)
+    await db_session.commit()
+    assert await JobWorker(async_session_test).run_until_idle() == 1
+
+    assert sorted(inbox.recipients) == ["ann@example.com", "bob@example.com", "eve@example.com"]
+    assert inbox.subjects == ['"Dark mode" is now Planned'] * 3
+    job = await db_session.scalar(select(Job).where(Job.kind == STATUS_CHANGE_JOB))
+    assert job.status == JobStatus.DONE
+    assert job.payload["sent"] == 3
+
+
+@pytest.mark.asyncio
+async def test_multi_line_title_is_flattened_in_the_subject(db_session, inbox):
+    item = await _voted_item(db_session, {"a": "ann@example.com"}, title="Dark mode\r\nBcc: everyone@example.com")
+
+    await update_feedback_status(db_session, item, FeedbackStatus.SHIPPED)
+    await db_session.commit()
+    assert await JobWorker(async_session_test).run_until_idle() == 1
+
+    assert inbox.recipients == ["ann@example.com"]
+    assert inbox.subjects == ['"Dark mode Bcc: everyone@example.com" is now Shipped']
+
+
+@pytest.mark.asyncio
+async def test_only_notifying_statuses_queue_jobs(db_session):
+    item = await _voted_item(db_session, {"a": "ann@example.com"})
+    await update_feedback_status(db_session, item, FeedbackStatus.UNDER_REVIEW)
+    await update_feedback_status(db_session, item, FeedbackStatus.SHIPPED)
+    await update_feedback_status(db_session, item, FeedbackStatus.SHIPPED)
+    await db_session.commit()
+
+    jobs = (await db_session.scalars(select(Job))).all()
+    assert [job.payload["status"] for job in jobs] == ["shipped"]
+
+
+@pytest.mark.asyncio
+async def test_unreachable_smtp_retries_later(db_session, monkeypatch):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    monkeypatch.setattr(notifications, "get_mailer", lambda: SMTPPool("127.0.0.1", port, timeout=1))
+    item = await _voted_item(db_session, {"a": "ann@example.com"})
+    await update_feedback_status(db_session, item, FeedbackStatus.SHIPPED)
+    await db_session.commit()
+
+    await JobWorker(async_session_test).run_until_idle()
+    async with async_session_test() as db:
+        job = await db.scalar(select(Job))
+    assert (job.status, job.attempts) == (JobStatus.QUEUED, 1)
+    assert "ConnectionRefusedError" in job.last_error
+
+
+@pytest.mark.asyncio
+async def test_status_route_only_enqueues(authenticated_client: AsyncClient, inbox):
+    board_id = (await authenticated_client.post("/api/boards", json={"name": "Notify API"})).json()["id"]
+    async with async_session_test() as db:
+        item = await _voted_item(db, {"a": "ann@example.com"}, board_id=board_id)
+
+    response = await authenticated_client.post(
+        f"/dashboard/boards/{board_id}/feedback/{item.id}/status", data={"status": "planned"}, follow_redirects=False
+    )
+    assert response.status_code == 302
+    assert inbox.recipients == []
+    async with async_session_test() as db:
+        assert (await db.scalar(select(Job))).status == JobStatus.QUEUED
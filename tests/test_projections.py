@@ -0,0 +1,162 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, update
+
+from app.models.event import BoardEvent, ProjectionCheckpoint
+from app.models.feedback import FeedbackItem, FeedbackStatus
+from app.projections import (
+    BoardStats,
+    DailyActivity,
+    ItemVotes,
+    catch_up,
+    fold_next_batch,
+    get_board_stats,
+    get_board_stats_at,
+    get_daily_activity,
+    rebuild,
+)
+from app.services import events
+from app.services.board import create_board
+from app.services.feedback import (
+    bulk_moderate,
+    create_feedback,
+    get_listing_summary,
+    set_votes,
+    toggle_vote,
+    update_feedback_status,
+)
+from app.services.merge import merge_feedback
+from tests.conftest import async_session_test
+
+
+async def _busy_board(db_session):
+    """A board with votes, a status change, a bulk change, a merge and a delete."""
+    board = await create_board(db_session, "Launch", "Big day", "#4F46E5", "owner")
+    first = await create_feedback(db_session, board.id, "Dark mode", "Please", "feature", None, "Ann")
+    second = await create_feedback(db_session, board.id, "Night theme", "Same", "feature", None, "Bob")
+    third = await create_feedback(db_session, board.id, "Crash", "On save", "bug", None, "Cy")
+    doomed = await create_feedback(db_session, board.id, "Spam", "Buy", "improvement", None, "Dee")
+    await db_session.commit()
+
+    for voter in ("v1", "v2", "v3"):
+        await toggle_vote(db_session, first.id, voter)
+    await toggle_vote(db_session, first.id, "v3")  # removed again
+    await set_votes(db_session, board.id, "v1", {second.id: True, third.id: True, doomed.id: True})
+    await toggle_vote(db_session, second.id, "v4")
+    await update_feedback_status(db_session, third, FeedbackStatus.PLANNED)
+    await bulk_moderate(db_session, "owner", board.id, [first.id, third.id], status=FeedbackStatus.PLANNED)
+    await bulk_moderate(db_session, "owner", board.id, [doomed.id], delete_items=True)
+    await db_session.commit()
+    await merge_feedback(db_session, first.id, [second.id])
+    await db_session.commit()
+    return board, first, second, third
+
+
+async def test_writes_are_logged_with_the_change(db_session):
+    board, first, second, third = await _busy_board(db_session)
+
+    kinds = list((await db_session.execute(select(BoardEvent.kind).order_by(BoardEvent.id))).scalars())
+    assert kinds.count(events.ITEM_CREATED) == 4
+    assert kinds.count(events.VOTE_ADDED) == 7
+    assert kinds.count(events.VOTE_REMOVED) == 1
+    # third was already planned when the bulk change ran: only first is logged
+    assert kinds.count(events.ITEM_STATUS_CHANGED) == 2
+    assert kinds[-2:] == [events.ITEM_MERGED, events.VOTES_MERGED]
+    assert events.ITEM_DELETED in kinds
+
+    rows = await events.get_board_events(db_session, board.id, limit=3)
+    assert [row.kind for row in rows] == [events.ITEM_CREATED] * 3
+    later = await events.get_board_events(db_session, board.id, after_id=rows[-1].id)
+    assert len(rows) + len(later) == len(kinds)
+
+
+async def test_rebuild_restores_vote_counts(db_session):
+    _, first, second, third = await _busy_board(db_session)
+    expected = dict((await db_session.execute(select(FeedbackItem.id, FeedbackItem.vote_count))).all())
+    assert expected[first.id] == 3  # v1, v2 and v4 (v1 backed both)
+
+    await db_session.execute(update(FeedbackItem).values(vote_count=99))
+    await db_session.commit()
+
+    report = await rebuild(async_session_test, ItemVotes(), batch_size=4)
+    assert report["projection"] == "item_votes"
+    assert report["last_event_id"] == await db_session.scalar(select(BoardEvent.id).order_by(BoardEvent.id.desc()))
+    db_session.expire_all()
+    assert dict((await db_session.execute(select(FeedbackItem.id, FeedbackItem.vote_count))).all()) == expected
+    checkpoint = await db_session.get(ProjectionCheckpoint, "item_votes")
+    assert checkpoint.finished_at is not None
+
+
+async def test_catch_up_resumes_from_its_checkpoint(db_session):
+    board, first, _, _ = await _busy_board(db_session)
+    total = await db_session.scalar(select(BoardEvent.id).order_by(BoardEvent.id.desc()))
+
+    assert await catch_up(async_session_test, BoardStats(), batch_size=5) == total
+    assert await catch_up(async_session_test, BoardStats(), batch_size=5) == 0
+
+    await toggle_vote(db_session, first.id, "late")
+    await db_session.commit()
+    assert await catch_up(async_session_test, BoardStats(), batch_size=5) == 1
+
+    summary = await get_listing_summary(db_session, board.id)
+    stats = await get_board_stats(db_session, board.id)
+    assert stats["items"] == summary["item_count"] == 2
+    assert stats["votes"] == summary["total_votes"]
+    assert stats["statuses"] == {status.value: count for status, count in summary["status_counts"].items()}
+
+    # Starting over replays the same log to the same counters
+    report = await rebuild(async_session_test, BoardStats(), batch_size=3, restart=True)
+    assert report["events_applied"] == report["total_events_applied"] == total + 1
+    assert await get_board_stats(db_session, board.id) == stats
+
+
+async def test_board_stats_at_a_past_moment(db_session):
+    board = await create_board(db_session, "Launch", "Big day", "#4F46E5", "owner")
+    item = await create_feedback(db_session, board.id, "Dark mode", "Please", "feature", None, "Ann")
+    await db_session.commit()
+    before_votes = datetime.now(timezone.utc)
+    await toggle_vote(db_session, item.id, "v1")
+    await toggle_vote(db_session, item.id, "v2")
+    await update_feedback_status(db_session, item, FeedbackStatus.SHIPPED)
+    await db_session.commit()
+
+    assert await get_board_stats_at(db_session, board.id, before_votes, batch_size=1) == {
+        "items": 1,
+        "votes": 0,
+        "statuses": {"open": 1},
+    }
+    now = await get_board_stats_at(db_session, board.id, datetime.now(timezone.utc) + timedelta(seconds=1))
+    assert now == {"items": 1, "votes": 2, "statuses": {FeedbackStatus.SHIPPED.value: 1}}
+    assert await get_board_stats_at(db_session, board.id, before_votes - timedelta(days=1)) == {
+        "items": 0,
+        "votes": 0,
+        "statuses": {},
+    }
+
+
+async def test_daily_activity(db_session):
+    board, *_ = await _busy_board(db_session)
+    await catch_up(async_session_test, DailyActivity())
+
+    today = datetime.now(timezone.utc).date().isoformat()
+    assert await get_daily_activity(db_session, board.id) == {
+        today: {"items": 4, "votes_added": 7, "votes_removed": 1, "status_changes": 2}
+    }
+
+
+async def test_fold_next_batch_is_bounded(db_session):
+    board = await create_board(db_session, "Bounded", "", "#4F46E5", "owner")
+    item = await create_feedback(db_session, board.id, "Idea", "", "feature", None, "Ann")
+    await db_session.commit()
+    await catch_up(async_session_test, ItemVotes())
+    for voter in ("v1", "v2", "v3"):
+        await toggle_vote(db_session, item.id, voter)
+    await db_session.commit()
+
+    async with async_session_test() as db:
+        assert await fold_next_batch(db, ItemVotes(), batch_size=2) is False
+        await db.commit()
+    async with async_session_test() as db:
+        assert await fold_next_batch(db, ItemVotes(), batch_size=2) is True
+        checkpoint = await db.get(ProjectionCheckpoint, ItemVotes.name)
+        assert checkpoint.events_applied == 3
@@ -0,0 +1,133 @@
+from datetime import datetime, timedelta, timezone
+
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app.models.event import RankingSnapshot
+from app.services.board import create_board
+from app.services.feedback import bulk_moderate, create_feedback, toggle_vote
+from app.services.ranking import (
+    get_item_history,
+    get_item_standing_at,
+    get_ranking_at,
+    snapshot_board,
+    take_ranking_snapshots,
+    thin_ranking_snapshots,
+)
+from tests.conftest import async_session_test
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+async def _vote(db, item, voters):
+    for voter in voters:
+        await toggle_vote(db, item.id, voter)
+    await db.commit()
+
+
+async def test_counts_and_ranks_as_of_a_moment(db_session):
+    board = await create_board(db_session, "Launch", "Big day", "#4F46E5", "owner")
+    older = await create_feedback(db_session, board.id, "Dark mode", "Please", "feature", None, "Ann")
+    newer = await create_feedback(db_session, board.id, "Export", "CSV", "feature", None, "Bob")
+    await db_session.commit()
+    await _vote(db_session, older, ["v1", "v2"])
+    before_push = _now()
+
+    assert await take_ranking_snapshots(async_session_test) == 1
+    assert await take_ranking_snapshots(async_session_test) == 0  # nothing new
+
+    await _vote(db_session, newer, ["v3", "v4", "v5"])
+    await _vote(db_session, older, ["v2"])  # removed
+    after_push = _now()
+    spam = await create_feedback(db_session, board.id, "Spam", "Buy", "bug", None, "Cy")
+    await db_session.commit()
+    await _vote(db_session, spam, ["v6"])
+    await bulk_moderate(db_session, "owner", board.id, [spam.id], delete_items=True)
+    await db_session.commit()
+
+    assert await get_item_standing_at(db_session, board.id, older.id, before_push) == {"votes": 2, "rank": 1, "of": 2}
+    assert await get_item_standing_at(db_session, board.id, older.id, after_push) == {"votes": 1, "rank": 2, "of": 2}
+    assert await get_item_standing_at(db_session, board.id, newer.id, after_push) == {"votes": 3, "rank": 1, "of": 2}
+    assert await get_item_standing_at(db_session, board.id, spam.id, after_push) is None
+    assert await get_item_standing_at(db_session, board.id, spam.id, _now()) is None
+
+    # Same answers with or without a snapshot in between
+    async with async_session_test() as db:
+        await snapshot_board(db, board.id)
+        await db.commit()
+    assert await get_ranking_at(db_session, board.id, after_push) == [
+        {"item_id": newer.id, "votes": 3, "rank": 1},
+        {"item_id": older.id, "votes": 1, "rank": 2},
+    ]
+    assert await get_ranking_at(db_session, board.id, before_push - timedelta(days=1)) == []
+
+
+async def test_ties_rank_newest_first(db_session):
+    board = await create_board(db_session, "Launch", "Big day", "#4F46E5", "owner")
+    older = await create_feedback(db_session, board.id, "Dark mode", "Please", "feature", None, "Ann")
+    newer = await create_feedback(db_session, board.id, "Export", "CSV", "feature", None, "Bob")
+    await db_session.commit()
+
+    ranking = await get_ranking_at(db_session, board.id, _now())
+    assert [entry["item_id"] for entry in ranking] == [newer.id, older.id]
+
+
+async def test_item_history_reads_snapshots_then_the_present(db_session):
+    board = await create_board(db_session, "Launch", "Big day", "#4F46E5", "owner")
+    item = await create_feedback(db_session, board.id, "Dark mode", "Please", "feature", None, "Ann")
+    other = await create_feedback(db_session, board.id, "Export", "CSV", "feature", None, "Bob")
+    await db_session.commit()
+    start = _now()
+    await _vote(db_session, other, ["v1", "v2"])
+    await take_ranking_snapshots(async_session_test)
+    await _vote(db_session, item, ["v3", "v4", "v5"])
+    await take_ranking_snapshots(async_session_test)
+    await _vote(db_session, item, ["v6"])
+
+    points = await get_item_history(db_session, board.id, item.id, start, _now())
+    assert [(p["votes"], p["rank"]) for p in points] == [(0, 2), (3, 1), (4, 1)]
+    assert points[0]["at"] < points[1]["at"] < points[2]["at"]
+
+
+async def test_old_snapshots_are_thinned_to_one_a_day(db_session):
+    day = datetime(2026, 1, 10, tzinfo=timezone.utc)
+    for hours in (1, 2, 3, 25):
+        db_session.add(
+            RankingSnapshot(
+                board_id="b1", taken_at=day + timedelta(hours=hours), last_event_id=hours,
+                item_ids=[], votes=[], ranks=[],
+            )
+        )
+    db_session.add(RankingSnapshot(board_id="b1", taken_at=_now(), last_event_id=99, item_ids=[], votes=[], ranks=[]))
+    await db_session.commit()
+
+    assert await thin_ranking_snapshots(async_session_test, keep_all_days=14) == 2
+    kept = (await db_session.execute(select(RankingSnapshot.last_event_id).order_by(RankingSnapshot.id))).scalars()
+    assert list(kept) == [1, 25, 99]
+
+
+async def test_ranking_api(authenticated_client: AsyncClient):
+    board_id = (await authenticated_client.post("/api/boards", json={"name": "History"})).json()["id"]
+    async with async_session_test() as db:
+        item = await create_feedback(db, board_id, "Dark mode", "Please", "feature", None, "Ann")
+        await db.commit()
+        await _vote(db, item, ["v1", "v2"])
+
+    response = await authenticated_client.get(f"/api/boards/{board_id}/ranking", params={"limit": 5})
+    assert response.status_code == 200
+    assert response.json()["items"] == [{"item_id": item.id, "votes": 2, "rank": 1}]
+
+    response = await authenticated_client.get(f"/api/boards/{board_id}/feedback/{item.id}/votes")
+    body = response.json()
+    assert (body["item_id"], body["votes"], body["rank"], body["of"]) == (item.id, 2, 1, 1)
+    response = await authenticated_client.get(
+        f"/api/boards/{board_id}/feedback/{item.id}/votes", params={"at": "2020-01-01T00:00:00"}
+    )
+    assert response.status_code == 404
+
+    response = await authenticated_client.get(f"/api/boards/{board_id}/feedback/{item.id}/history")
+    assert [(p["votes"], p["rank"]) for p in response.json()["points"]] == [(2, 1)]
+
+    assert (await authenticated_client.get("/api/boards/nope/ranking")).status_code == 404
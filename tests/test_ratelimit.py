@@ -0,0 +1,71 @@
+import pytest
+from httpx import AsyncClient
+
+from app import ratelimit
+from app.ratelimit import Limit, RateLimiter, parse_limits
+from app.services.board import create_board
+from app.services.feedback import create_feedback
+
+
+def test_parse_limits():
+    assert parse_limits("ip=10/minute, board=2/second") == {"ip": Limit(10, 60), "board": Limit(2, 1)}
+    assert parse_limits("") == {}
+    with pytest.raises(ValueError):
+        parse_limits("user=10/minute")
+    with pytest.raises(ValueError):
+        parse_limits("ip=10/fortnight")
+
+
+def test_bucket_refills_and_charges_all_or_nothing(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ratelimit.time, "monotonic", lambda: now[0])
+    limiter = RateLimiter()
+    strict, loose = Limit(2, 60), Limit(100, 60)
+    checks = [("voter", strict), ("board", loose)]
+
+    assert limiter.hit(checks) == 0
+    assert limiter.hit(checks) == 0
+    assert limiter.hit(checks) == pytest.approx(30)  # one token back every 30s
+    # The rejected request took nothing from the board bucket
+    assert limiter.hit([("board", loose)], cost=98) == 0
+
+    now[0] += 30
+    assert limiter.hit([("voter", strict)]) == 0
+    assert limiter.hit([("voter", strict)]) == pytest.approx(30)
+
+
+def test_idle_buckets_are_evicted_first():
+    limiter = RateLimiter(max_keys=2)
+    limit = Limit(1, 60)
+    limiter.hit([("a", limit)])
+    limiter.hit([("b", limit)])
+    limiter.hit([("c", limit)])
+    assert len(limiter) == 2
+    assert limiter.hit([("a", limit)]) == 0  # forgotten, so it starts full again
+    assert limiter.hit([("c", limit)]) > 0
+
+
+@pytest.mark.asyncio
+async def test_submit_and_vote_get_429(client: AsyncClient, db_session, monkeypatch):
+    monkeypatch.setitem(ratelimit.ROUTE_LIMITS, "submit", parse_limits("ip=2/minute"))
+    monkeypatch.setitem(ratelimit.ROUTE_LIMITS, "vote", parse_limits("voter=1/minute"))
+    board = await create_board(db_session, "Limited", "", "#4F46E5", "owner")
+    item = await create_feedback(db_session, board.id, "Item", "", "feature", None, "T")
+    await db_session.commit()
+
+    for _ in range(2):
+        response = await client.post(f"/b/{board.slug}/submit", data={"title": "Spam"}, follow_redirects=False)
+        assert response.status_code == 302
+    # A fresh voter cookie doesn't reset the IP bucket
+    client.cookies.clear()
+    response = await client.post(f"/b/{board.slug}/submit", data={"title": "Spam"}, headers={"Accept": "text/html"})
+    assert response.status_code == 429
+    assert 0 < int(response.headers["retry-after"]) <= 30
+    assert "Slow down" in response.text
+
+    client.cookies.set("voter_id", "a4b1f3a0-0000-4000-8000-000000000000")
+    assert (await client.post(f"/b/{board.slug}/vote/{item.id}", follow_redirects=False)).status_code == 302
+    response = await client.post(f"/b/{board.slug}/vote/{item.id}")
+    assert response.status_code == 429
+    assert response.json() == {"detail": "Too many requests, please slow down"}
+    assert "retry-after" in response.headers
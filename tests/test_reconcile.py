@@ -0,0 +1,100 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import insert, update
+
+from app.models.feedback import FeedbackItem
+from app.models.vote import Vote
+from app.projections import ItemVotes, rebuild
+from app.services.board import create_board
+from app.services.feedback import create_feedback, get_feedback_by_id
+from app.services import reconcile
+from app.services.ranking import get_counts_at
+from app.services.reconcile import reconcile_vote_counts
+from tests.conftest import async_session_test
+
+
+async def _seed(db, counts: dict[str, tuple[int, int]]) -> dict[str, str]:
+    """counts maps title -> (stored vote_count, real votes)."""
+    board = await create_board(db, "Recount", "", "#4F46E5", "owner")
+    ids = {}
+    for title, (stored, real) in counts.items():
+        item = await create_feedback(db, board.id, title, "", "feature", None, "T")
+        ids[title] = item.id
+        if real:
+            await db.execute(insert(Vote), [{"feedback_item_id": item.id, "voter_key": n} for n in range(real)])
+        await db.execute(update(FeedbackItem).where(FeedbackItem.id == item.id).values(vote_count=stored))
+    await db.commit()
+    return ids
+
+
+@pytest.mark.asyncio
+async def test_reconcile_repairs_drift(db_session):
+    ids = await _seed(db_session, {"ok": (3, 3), "high": (10, 4), "low": (0, 2)})
+
+    report = await reconcile_vote_counts(async_session_test, batch_size=2, pause=0)
+
+    assert report.scanned == 3
+    assert report.mismatched == 2
+    assert report.repaired == 2
+    assert report.total_drift == 6 + 2
+    assert report.max_drift == 6
+    async with async_session_test() as db:
+        assert (await get_feedback_by_id(db, ids["high"])).vote_count == 4
+        assert (await get_feedback_by_id(db, ids["low"])).vote_count == 2
+        assert (await get_feedback_by_id(db, ids["ok"])).vote_count == 3
+
+
+@pytest.mark.asyncio
+async def test_reconcile_dry_run_only_reports(db_session):
+    ids = await _seed(db_session, {"high": (5, 1)})
+
+    report = await reconcile_vote_counts(async_session_test, pause=0, repair=False)
+
+    assert report.mismatched == 1
+    assert report.repaired == 0
+    async with async_session_test() as db:
+        assert (await get_feedback_by_id(db, ids["high"])).vote_count == 5
+
+
+@pytest.mark.asyncio
+async def test_reconcile_consistent_table(db_session):
+    await _seed(db_session, {"a": (1, 1), "b": (0, 0)})
+    report = await reconcile_vote_counts(async_session_test, pause=0)
+    assert report.as_dict()["mismatched"] == 0
+    assert report.as_dict()["boards_affected"] == 0
+
+
+@pytest.mark.asyncio
+async def test_repairs_survive_a_projection_rebuild(db_session):
+    # Votes inserted directly never reached the event log
+    ids = await _seed(db_session, {"high": (10, 4), "unlogged": (3, 3)})
+
+    report = await reconcile_vote_counts(async_session_test, pause=0)
+    assert report.repaired == 1
+    assert report.log_corrected == 2
+
+    await rebuild(async_session_test, ItemVotes())
+    async with async_session_test() as db:
+        assert (await get_feedback_by_id(db, ids["high"])).vote_count == 4
+        assert (await get_feedback_by_id(db, ids["unlogged"])).vote_count == 3
+        board_id = (await get_feedback_by_id(db, ids["high"])).board_id
+        counts = await get_counts_at(db, board_id, datetime.now(timezone.utc))
+    assert counts == {ids["high"]: 4, ids["unlogged"]: 3}
+
+    again = await reconcile_vote_counts(async_session_test, pause=0)
+    assert again.mismatched == 0 and again.log_corrected == 0
+
+
+@pytest.mark.asyncio
+async def test_log_check_waits_when_events_outpace_the_fold(db_session, monkeypatch):
+    async def still_behind(db, projection):
+        return False
+
+    await _seed(db_session, {"high": (10, 4)})
+    monkeypatch.setattr(reconcile, "fold_next_batch", still_behind)
+
+    report = await reconcile_vote_counts(async_session_test, pause=0)
+    assert report.repaired == 1
+    assert report.log_corrected == 0
+    assert report.log_deferred == 1
@@ -0,0 +1,93 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import update
+
+from app.models.feedback import FeedbackItem, FeedbackStatus
+from app.services.board import create_board
+from app.services.feedback import create_feedback, update_feedback_status
+from app.services.merge import merge_feedback
+from app.services.roadmap import get_roadmap
+
+
+async def _board_with_items(db, slug_name: str, specs: list[tuple[str, FeedbackStatus, int]]):
+    board = await create_board(db, slug_name, "", "#4F46E5", "owner")
+    items = []
+    for title, status, votes in specs:
+        item = await create_feedback(db, board.id, title, "", "feature", None, "T")
+        item.status = status
+        item.vote_count = votes
+        items.append(item)
+    await db.commit()
+    return board, items
+
+
+@pytest.mark.asyncio
+async def test_roadmap_top_items_per_status(db_session):
+    board, items = await _board_with_items(
+        db_session,
+        "Roadmap",
+        [
+            ("Planned low", FeedbackStatus.PLANNED, 1),
+            ("Planned high", FeedbackStatus.PLANNED, 9),
+            ("Planned mid", FeedbackStatus.PLANNED, 5),
+            ("Building", FeedbackStatus.IN_PROGRESS, 3),
+            ("Open idea", FeedbackStatus.OPEN, 50),
+            ("Dup", FeedbackStatus.SHIPPED, 2),
+            ("Shipped", FeedbackStatus.SHIPPED, 4),
+        ],
+    )
+    await merge_feedback(db_session, items[6].id, [items[5].id])
+    await db_session.commit()
+
+    planned, in_progress, shipped = await get_roadmap(db_session, board.id, limit=2)
+
+    assert planned.status == FeedbackStatus.PLANNED
+    assert [item.title for item in planned.items] == ["Planned high", "Planned mid"]
+    assert planned.total == 3
+    assert [item.title for item in in_progress.items] == ["Building"]
+    # Merged stubs drop out; open items never appear
+    assert [item.title for item in shipped.items] == ["Shipped"]
+    assert shipped.total == 1
+
+
+@pytest.mark.asyncio
+async def test_roadmap_cache_invalidated_on_status_change(db_session):
+    board, (item,) = await _board_with_items(db_session, "Cached roadmap", [("Idea", FeedbackStatus.PLANNED, 2)])
+    before = await get_roadmap(db_session, board.id)
+
+    # Writes that bypass the service aren't seen until the entry expires
+    await db_session.execute(update(FeedbackItem).where(FeedbackItem.id == item.id).values(vote_count=99))
+    await db_session.commit()
+    assert await get_roadmap(db_session, board.id) is before
+
+    await update_feedback_status(db_session, item, FeedbackStatus.SHIPPED)
+    await db_session.commit()
+    planned, _, shipped = await get_roadmap(db_session, board.id)
+    assert planned.items == ()
+    assert [(i.title, i.vote_count) for i in shipped.items] == [("Idea", 99)]
+
+
+@pytest.mark.asyncio
+async def test_roadmap_pages(client: AsyncClient, db_session):
+    board, _ = await _board_with_items(
+        db_session, "Public roadmap", [("Ship it", FeedbackStatus.IN_PROGRESS, 7), ("Later", FeedbackStatus.OPEN, 1)]
+    )
+
+    response = await client.get(f"/b/{board.slug}/roadmap")
+    assert response.status_code == 200
+    assert "Ship it" in response.text
+    assert "Later" not in response.text
+
+    response = await client.get(f"/b/{board.slug}/roadmap.json")
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == "*"
+    assert response.headers["cache-control"].startswith("public, max-age=")
+    data = response.json()
+    assert data["board"]["slug"] == board.slug
+    assert [column["status"] for column in data["columns"]] == ["planned", "in_progress", "shipped"]
+    assert data["columns"][1]["items"] == [
+        {"id": data["columns"][1]["items"][0]["id"], "title": "Ship it", "category": "feature", "votes": 7}
+    ]
+
+    assert (await client.get("/b/no-such-board/roadmap")).status_code == 404
+    assert (await client.get("/b/no-such-board/roadmap.json")).status_code == 404
@@ -0,0 +1,163 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app.serve import warm_templates
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+# Preloads like app.serve, then forks a reader and a writer that each run the app's
+# lifespan. The reader caches a board's widget feed; the writer adds an item.
+FORKED_WORKERS = textwrap.dedent(
+    """
+    import asyncio, os, sys
+
+    from app.serve import preload
+
+    app = preload()
+
+    from app.bus import bus
+    from app.database import async_session, dispose_inherited_pool, engine
+    from app.main import job_worker, lifespan, webhook_dispatcher
+    from app.services.board import create_board
+    from app.services.feedback import create_feedback
+    from app.services.widget import build_feed, cached_feed
+
+    async def setup():
+        async with async_session() as db:
+            board = await create_board(db, "Shared", "", "#4F46E5", "owner")
+            await db.commit()
+        await engine.dispose()
+        return board
+
+    async def reader(board, ready):
+        async with lifespan(app):
+            print("ids", bus.worker_id, job_worker.worker_id, webhook_dispatcher.worker_id, flush=True)
+            async with async_session() as db:
+                await build_feed(db, board)
+            assert cached_feed(board.slug) is not None
+            os.write(ready, b"1")
+            for _ in range(200):
+                if cached_feed(board.slug) is None:
+                    print("invalidated", flush=True)
+                    return 0
+                await asyncio.sleep(0.05)
+            return 1
+
+    async def writer(board, ready):
+        async with lifespan(app):
+            print("ids", bus.worker_id, job_worker.worker_id, webhook_dispatcher.worker_id, flush=True)
+            await asyncio.to_thread(os.read, ready, 1)
+            async with async_session() as db:
+                await create_feedback(db, board.id, "Written elsewhere", "", "feature", None, "W")
+                await db.commit()
+            await asyncio.sleep(0.5)
+        return 0
+
+    board = asyncio.run(setup())
+    ready_r, ready_w = os.pipe()
+    pids = []
+    for role in (reader, writer):
+        pid = os.fork()
+        if pid == 0:
+            dispose_inherited_pool()
+            os._exit(asyncio.run(role(board, ready_w if role is reader else ready_r)))
+        pids.append(pid)
+    sys.exit(max(os.waitstatus_to_exitcode(os.waitpid(pid, 0)[1]) for pid in pids))
+    """
+)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _children(pid: int) -> set[int]:
+    return {int(child) for child in Path(f"/proc/{pid}/task/{pid}/children").read_text().split()}
+
+
+def _wait_healthy(port: int, timeout: float = 20) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise AssertionError("server did not become healthy")
+
+
+def test_templates_are_compiled_once_up_front():
+    assert warm_templates() > 0
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_forked_workers_invalidate_each_others_caches(tmp_path):
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(SRC),
+        "ENVIRONMENT": "test",
+        "DATABASE_URL": f"sqlite+aiosqlite:///{tmp_path / 'app.db'}",
+        "EVENT_BUS_PATH": str(tmp_path / "bus.db"),
+        "EVENT_BUS_POLL_INTERVAL": "0.05",
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", FORKED_WORKERS], env=env, cwd=tmp_path, capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "invalidated" in result.stdout
+    ids = [line.split()[1:] for line in result.stdout.splitlines() if line.startswith("ids ")]
+    assert len(ids) == 2
+    assert not set(ids[0]) & set(ids[1])
+
+
+@pytest.mark.skipif(not Path(f"/proc/{os.getpid()}/task").exists(), reason="needs /proc to find worker pids")
+def test_workers_share_a_socket_restart_and_drain(tmp_path):
+    port = _free_port()
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(SRC),
+        "ENVIRONMENT": "test",
+        "DATABASE_URL": f"sqlite+aiosqlite:///{tmp_path / 'app.db'}",
+        "EVENT_BUS_PATH": str(tmp_path / "bus.db"),
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.serve", "--workers", "2", "--host", "127.0.0.1", "--port", str(port),
+         "--drain-timeout", "5"],
+        env=env, cwd=tmp_path, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+    )
+    try:
+        _wait_healthy(port)
+        workers = _children(server.pid)
+        assert len(workers) == 2
+
+        crashed = workers.pop()
+        os.kill(crashed, signal.SIGKILL)
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline and (len(_children(server.pid)) < 2 or crashed in _children(server.pid)):
+            time.sleep(0.1)
+        assert len(_children(server.pid) - {crashed}) == 2
+        _wait_healthy(port)
+
+        server.send_signal(signal.SIGTERM)
+        output, _ = server.communicate(timeout=20)
+    finally:
+        if server.poll() is None:
+            server.kill()
+            server.communicate()
+    assert server.returncode == 0
+    assert "Preloaded app" in output
+    assert f"Worker {crashed} exited" in output
+    assert "All workers stopped" in output
+    assert (tmp_path / "app.db").exists()  # tables created once, in the parent
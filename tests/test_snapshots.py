@@ -0,0 +1,96 @@
+import asyncio
+import json
+
+from app import snapshots
+from app.services.board import create_board, update_board
+from app.services.feedback import create_feedback, toggle_vote
+from app.snapshots import VERSION_FILE, SnapshotPublisher, board_dir, publish_boards
+from tests.conftest import async_session_test
+
+
+async def _board_with_item(db_session):
+    board = await create_board(db_session, "Launch", "Big day", "#4F46E5", "owner")
+    item = await create_feedback(db_session, board.id, "Dark mode", "Please", "feature", None, "Ann")
+    await db_session.commit()
+    return board, item
+
+
+async def test_publish_writes_page_and_feed(db_session, tmp_path):
+    board, item = await _board_with_item(db_session)
+
+    assert await publish_boards(async_session_test, tmp_path, ["launch", "nope"]) == {
+        "launch": "written",
+        "nope": "missing",
+    }
+    directory = board_dir(tmp_path, "launch")
+    html = (directory / "index.html").read_text()
+    assert "Dark mode" in html
+    # Shared by every visitor, so no baked-in idempotency key
+    assert 'name="idempotency_key" value=""' in html
+    assert json.loads((directory / "widget.json").read_bytes())["items"][0]["id"] == item.id
+    assert not list(directory.glob(".*.tmp"))
+
+    # Nothing changed: no render at all
+    assert await publish_boards(async_session_test, tmp_path, ["launch"]) == {"launch": "unchanged"}
+
+    await toggle_vote(db_session, item.id, "voter-1")
+    await db_session.commit()
+    feed_mtime = (directory / "widget.json").stat().st_mtime_ns
+    assert await publish_boards(async_session_test, tmp_path, ["launch"]) == {"launch": "written"}
+    assert json.loads((directory / "widget.json").read_bytes())["items"][0]["votes"] == 1
+    assert (directory / "widget.json").stat().st_mtime_ns != feed_mtime
+    assert (directory / VERSION_FILE).read_text().startswith(f"{snapshots.SNAPSHOT_FORMAT}:")
+
+
+async def test_only_dirty_boards_are_checked_and_renamed_boards_are_removed(db_session, tmp_path):
+    board, _ = await _board_with_item(db_session)
+    await publish_boards(async_session_test, tmp_path, ["launch"])
+
+    assert await publish_boards(async_session_test, tmp_path, ["launch"], board_ids={"other"}) == {}
+
+    await update_board(db_session, board, slug="launch-day")
+    await db_session.commit()
+    assert await publish_boards(async_session_test, tmp_path, ["launch"], board_ids=set()) == {"launch": "removed"}
+    assert not (board_dir(tmp_path, "launch") / "index.html").exists()
+
+
+async def test_publisher_coalesces_a_vote_storm(db_session, tmp_path, monkeypatch):
+    board, item = await _board_with_item(db_session)
+    renders = []
+    render_board = snapshots.render_board
+
+    async def counting_render(db, board):
+        renders.append(board.slug)
+        return await render_board(db, board)
+
+    monkeypatch.setattr(snapshots, "render_board", counting_render)
+    publisher = SnapshotPublisher(async_session_test, tmp_path, ["launch"], interval=0.2)
+    await publisher.start()
+    try:
+        await asyncio.sleep(0.05)
+        assert renders == ["launch"]  # startup pass
+
+        for n in range(5):
+            await toggle_vote(db_session, item.id, f"voter-{n}")
+            await db_session.commit()
+        await asyncio.sleep(0.4)
+        assert renders == ["launch", "launch"]
+        feed = json.loads((board_dir(tmp_path, "launch") / "widget.json").read_bytes())
+        assert feed["items"][0]["votes"] == 5
+    finally:
+        await publisher.stop()
+
+
+async def test_one_publisher_per_snapshot_dir(db_session, tmp_path):
+    await _board_with_item(db_session)
+    first = SnapshotPublisher(async_session_test, tmp_path, ["launch"])
+    second = SnapshotPublisher(async_session_test, tmp_path, ["launch"])
+    try:
+        assert await first.run_once() == {"launch": "written"}
+        assert await second.run_once() == {}
+        first._release_lock()
+        # Taking over republishes everything
+        assert await second.run_once() == {"launch": "written"}
+    finally:
+        first._release_lock()
+        second._release_lock()
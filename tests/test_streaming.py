@@ -0,0 +1,124 @@
+import re
+
+import pytest
+from httpx import AsyncClient
+
+from app.config import get_settings
+
+
+@pytest.fixture
+def always_stream(monkeypatch):
+    monkeypatch.setattr(get_settings(), "stream_min_items", 1)
+
+
+async def _board_with_items(client: AsyncClient, authenticated_client: AsyncClient, name: str, titles: list[str]):
+    data = (await authenticated_client.post("/api/boards", json={"name": name})).json()
+    for title in titles:
+        await client.post(f"/b/{data['slug']}/submit", data={"title": title, "category": "feature"})
+    return data
+
+
+@pytest.mark.asyncio
+async def test_public_board_streams_large_boards(client: AsyncClient, authenticated_client: AsyncClient, always_stream):
+    board = await _board_with_items(client, authenticated_client, "Streamed", ["First idea", "Second idea"])
+
+    response = await client.get(f"/b/{board['slug']}")
+    assert response.status_code == 200
+    assert "content-length" not in response.headers
+    assert "First idea" in response.text and "Second idea" in response.text
+    assert "2 items" in response.text
+    assert response.text.rstrip().endswith("</html>")
+
+
+@pytest.mark.asyncio
+async def test_header_is_flushed_before_items_are_fetched():
+    from datetime import datetime
+    from types import SimpleNamespace
+
+    from starlette.requests import Request
+
+    from app.models.feedback import FeedbackCategory, FeedbackStatus
+    from app.services.feedback import FeedbackRow
+    from app.streaming import stream_template
+
+    fetched = []
+
+    async def rows():
+        fetched.append(True)
+        yield FeedbackRow(
+            "item-1", "Lazy item", "", FeedbackStatus.OPEN, FeedbackCategory.BUG, 3, None, None, datetime(2026, 1, 1)
+        )
+
+    board = SimpleNamespace(id="b1", name="Chunked", slug="chunked", description="", accent_color="#4F46E5")
+    response = stream_template(
+        Request({"type": "http", "method": "GET", "headers": []}),
+        "public/board.html",
+        {
+            "board": board,
+            "items": rows(),
+            "item_count": 1,
+            "voted_items": set(),
+            "statuses": FeedbackStatus,
+            "categories": FeedbackCategory,
+            "sort": "votes",
+        },
+    )
+    iterator = response.body_iterator
+    first = (await iterator.__anext__()).decode()
+    assert "Filter" in first
+    assert not fetched
+    rest = "".join([chunk.decode() async for chunk in iterator])
+    assert "Lazy item" in rest
+    assert "<!-- flush -->" not in first + rest
+
+
+@pytest.mark.asyncio
+async def test_streamed_board_marks_voted_items(client: AsyncClient, authenticated_client: AsyncClient, always_stream):
+    board = await _board_with_items(client, authenticated_client, "Streamed Votes", ["Vote on me"])
+    page = await client.get(f"/b/{board['slug']}")
+    item_id = re.search(r"/vote/([a-f0-9\-]+)", page.text).group(1)
+    await client.post(f"/b/{board['slug']}/vote/{item_id}", data={})
+
+    page = await client.get(f"/b/{board['slug']}")
+    assert "Remove vote" in page.text
+
+
+@pytest.mark.asyncio
+async def test_dashboard_detail_streams_large_boards(
+    client: AsyncClient, authenticated_client: AsyncClient, always_stream
+):
+    board = await _board_with_items(client, authenticated_client, "Streamed Dash", ["Dash item"])
+    response = await authenticated_client.get(f"/dashboard/boards/{board['id']}")
+    assert response.status_code == 200
+    assert "content-length" not in response.headers
+    assert "Dash item" in response.text
+
+
+@pytest.mark.asyncio
+async def test_small_boards_render_normally(client: AsyncClient, authenticated_client: AsyncClient):
+    board = await _board_with_items(client, authenticated_client, "Small", ["Only one"])
+    response = await client.get(f"/b/{board['slug']}")
+    assert "content-length" in response.headers
+    assert "<!-- flush -->" not in response.text
+
+
+@pytest.mark.asyncio
+async def test_failure_mid_stream_closes_page_with_notice(
+    client: AsyncClient, authenticated_client: AsyncClient, always_stream, monkeypatch
+):
+    from app.api import feedback as feedback_api
+
+    board = await _board_with_items(client, authenticated_client, "Broken Stream", ["Survivor"])
+    real_stream = feedback_api.stream_feedback_rows
+
+    async def failing_stream(*args, **kwargs):
+        async for row in real_stream(*args, **kwargs):
+            yield row
+        raise RuntimeError("cursor died")
+
+    monkeypatch.setattr(feedback_api, "stream_feedback_rows", failing_stream)
+    response = await client.get(f"/b/{board['slug']}")
+    assert response.status_code == 200
+    assert "Survivor" in response.text
+    assert 'role="alert"' in response.text
+    assert response.text.rstrip().endswith("</html>")
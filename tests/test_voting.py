@@ -137,3 +137,81 @@ async def test_has_voted_returns_false_for_no_vote(db_session):
 
     result = await has_voted(db_session, "nonexistent-id", "voter-1")
     assert result is False
+
+
+@pytest.mark.asyncio
+async def test_vote_fragment_returns_single_button(client: AsyncClient, authenticated_client: AsyncClient):
+    create_resp = await authenticated_client.post("/api/boards", json={"name": "Fragment Vote Board"})
+    slug = create_resp.json()["slug"]
+    await client.post(f"/b/{slug}/submit", data={"title": "Fragment item", "category": "feature"})
+
+    board_resp = await client.get(f"/b/{slug}")
+    item_id = re.search(r'/vote/([a-f0-9\-]+)', board_resp.text).group(1)
+
+    response = await client.post(f"/b/{slug}/vote/{item_id}", data={}, headers={"X-Fragment": "1"})
+    assert response.status_code == 200
+    assert "<html" not in response.text
+    assert f"/vote/{item_id}" in response.text
+    assert "Remove vote" in response.text
+    assert re.search(r">\s*1\s*</span>", response.text)
+
+    response = await client.post(f"/b/{slug}/vote/{item_id}", data={}, headers={"X-Fragment": "1"})
+    assert "Upvote" in response.text
+    assert re.search(r">\s*0\s*</span>", response.text)
+
+
+@pytest.mark.asyncio
+async def test_vote_fragment_rejects_item_from_other_board(client: AsyncClient, authenticated_client: AsyncClient):
+    slug_a = (await authenticated_client.post("/api/boards", json={"name": "Board A"})).json()["slug"]
+    slug_b = (await authenticated_client.post("/api/boards", json={"name": "Board B"})).json()["slug"]
+    await client.post(f"/b/{slug_a}/submit", data={"title": "Only on A", "category": "feature"})
+    item_id = re.search(r'/vote/([a-f0-9\-]+)', (await client.get(f"/b/{slug_a}")).text).group(1)
+
+    response = await client.post(f"/b/{slug_b}/vote/{item_id}", data={}, headers={"X-Fragment": "1"})
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_public_board_marks_voted_items(client: AsyncClient, authenticated_client: AsyncClient):
+    slug = (await authenticated_client.post("/api/boards", json={"name": "Voted Marks"})).json()["slug"]
+    await client.post(f"/b/{slug}/submit", data={"title": "Mark me", "category": "feature"})
+    await client.get(f"/b/{slug}")  # receive voter cookie
+    item_id = re.search(r'/vote/([a-f0-9\-]+)', (await client.get(f"/b/{slug}")).text).group(1)
+    await client.post(f"/b/{slug}/vote/{item_id}", data={})
+
+    response = await client.get(f"/b/{slug}")
+    assert "Remove vote" in response.text
+
+
+def test_voter_identity_encoding_round_trips():
+    from app.models.voter import decode_identity, encode_identity
+
+    cookie_id = "0b9c6f5e-3f4a-4d8e-9a51-2f0c1c9b7e42"
+    assert len(encode_identity(cookie_id)) == 17
+    assert decode_identity(encode_identity(cookie_id)) == cookie_id
+    assert decode_identity(encode_identity("voter@example.com")) == "voter@example.com"
+    # Non-canonical UUID spellings stay text so they decode back unchanged
+    assert decode_identity(encode_identity(cookie_id.upper())) == cookie_id.upper()
+
+
+@pytest.mark.asyncio
+async def test_votes_share_one_voter_key(db_session):
+    from sqlalchemy import func, select
+
+    from app.models.vote import Vote
+    from app.models.voter import Voter
+    from app.services.board import create_board
+    from app.services.feedback import create_feedback, get_voted_item_ids, toggle_vote
+
+    board = await create_board(db_session, "Voter Keys", "", "#4F46E5", "owner")
+    first = await create_feedback(db_session, board.id, "First", "", "feature", None, "T")
+    second = await create_feedback(db_session, board.id, "Second", "", "feature", None, "T")
+    await toggle_vote(db_session, first.id, "voter@example.com")
+    await toggle_vote(db_session, second.id, "voter@example.com", "voter@example.com")
+    await db_session.commit()
+
+    assert await db_session.scalar(select(func.count(Voter.id))) == 1
+    assert await db_session.scalar(select(Voter.email)) == "voter@example.com"
+    assert len(set((await db_session.execute(select(Vote.voter_key))).scalars())) == 1
+    assert await get_voted_item_ids(db_session, [first.id, second.id], "voter@example.com") == {first.id, second.id}
+    assert await get_voted_item_ids(db_session, [first.id], "someone-else") == set()
@@ -0,0 +1,184 @@
+import json
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select, update
+
+from app.models.feedback import FeedbackStatus
+from app.models.webhook import Webhook, WebhookDelivery
+from app.services.board import create_board
+from app.services.feedback import create_feedback, toggle_vote, update_feedback_status
+from app.services.webhooks import create_webhook
+from app.webhooks import SIGNATURE_HEADER, WebhookDispatcher, sign
+from tests.conftest import async_session_test
+
+
+class Receiver(ThreadingHTTPServer):
+    """Local stand-in endpoint: records each POST and answers with `status`."""
+
+    def __init__(self) -> None:
+        self.requests: list[tuple[dict, str, dict]] = []
+        self.status = 200
+        super().__init__(("127.0.0.1", 0), _Handler)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/hook"
+
+    @property
+    def events(self) -> list[dict]:
+        return [event for body, _, _ in self.requests for event in body["events"]]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        raw = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.requests.append((json.loads(raw), raw.decode(), dict(self.headers)))
+        self.send_response(self.server.status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def receiver():
+    server = Receiver()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+async def _board_with_hook(db, url: str, events: list[str] = ()):
+    board = await create_board(db, "Hooks", "", "#4F46E5", "owner")
+    webhook = await create_webhook(db, board.id, url, list(events))
+    await db.commit()
+    return board, webhook
+
+
+@pytest.mark.asyncio
+async def test_events_are_batched_per_endpoint_and_signed(db_session, receiver):
+    board, webhook = await _board_with_hook(db_session, receiver.url)
+    item = await create_feedback(db_session, board.id, "Dark mode", "", "feature", None, "T")
+    await db_session.commit()
+    for voter in ("a", "b", "c"):
+        await toggle_vote(db_session, item.id, voter)
+    await toggle_vote(db_session, item.id, "a")
+    await update_feedback_status(db_session, item, FeedbackStatus.PLANNED)
+    await db_session.commit()
+
+    dispatcher = WebhookDispatcher(async_session_test, batch_size=4)
+    try:
+        await dispatcher.run_until_idle()
+    finally:
+        await dispatcher.stop()
+
+    assert [len(body["events"]) for body, _, _ in receiver.requests] == [4, 2]
+    assert [event["event"] for event in receiver.events] == [
+        "feedback.created",
+        *["feedback.voted"] * 4,
+        "feedback.status_changed",
+    ]
+    assert [event["data"]["vote_count"] for event in receiver.events[1:5]] == [1, 2, 3, 2]
+    assert receiver.events[-1]["data"]["previous_status"] == "open"
+    _, raw, headers = receiver.requests[0]
+    assert headers[SIGNATURE_HEADER] == sign(webhook.secret, raw.encode())
+    assert await db_session.scalar(select(func.count(WebhookDelivery.id))) == 0
+
+
+@pytest.mark.asyncio
+async def test_event_filter_and_boards_without_hooks(db_session, receiver):
+    board, _ = await _board_with_hook(db_session, receiver.url, ["feedback.status_changed"])
+    other = await create_board(db_session, "Quiet", "", "#4F46E5", "owner")
+    item = await create_feedback(db_session, board.id, "Filtered", "", "feature", None, "T")
+    quiet = await create_feedback(db_session, other.id, "No hooks", "", "feature", None, "T")
+    await db_session.commit()
+    await toggle_vote(db_session, item.id, "a")
+    await toggle_vote(db_session, quiet.id, "a")
+    await update_feedback_status(db_session, item, FeedbackStatus.SHIPPED)
+    await db_session.commit()
+
+    deliveries = (await db_session.scalars(select(WebhookDelivery))).all()
+    assert [delivery.event for delivery in deliveries] == ["feedback.status_changed"]
+
+
+@pytest.mark.asyncio
+async def test_failing_endpoint_backs_off_then_catches_up(db_session, receiver):
+    receiver.status = 503
+    board, webhook = await _board_with_hook(db_session, receiver.url)
+    await create_feedback(db_session, board.id, "Retry me", "", "feature", None, "T")
+    await db_session.commit()
+
+    dispatcher = WebhookDispatcher(async_session_test, max_attempts=3)
+    try:
+        assert await dispatcher.run_until_idle() == 1
+        async with async_session_test() as db:
+            stored = await db.get(Webhook, webhook.id)
+            delivery = await db.scalar(select(WebhookDelivery))
+        assert stored.failures == 1
+        assert stored.retry_after.replace(tzinfo=timezone.utc) > datetime.now(timezone.utc)
+        assert "503" in stored.last_error
+        assert (delivery.attempts, delivery.failed_at) == (1, None)
+
+        receiver.status = 200
+        async with async_session_test() as db:
+            await db.execute(update(Webhook).values(retry_after=datetime.now(timezone.utc)))
+            await db.commit()
+        await dispatcher.run_until_idle()
+    finally:
+        await dispatcher.stop()
+
+    assert len(receiver.requests) == 2
+    async with async_session_test() as db:
+        stored = await db.get(Webhook, webhook.id)
+        assert (stored.failures, stored.retry_after, stored.locked_by) == (0, None, None)
+        assert await db.scalar(select(func.count(WebhookDelivery.id))) == 0
+
+
+@pytest.mark.asyncio
+async def test_events_that_exhaust_attempts_are_set_aside(db_session):
+    board, webhook = await _board_with_hook(db_session, "http://127.0.0.1:9/unreachable")
+    await create_feedback(db_session, board.id, "Doomed", "", "feature", None, "T")
+    await db_session.commit()
+
+    dispatcher = WebhookDispatcher(async_session_test, max_attempts=1, timeout=1)
+    try:
+        await dispatcher.run_until_idle()
+    finally:
+        await dispatcher.stop()
+    async with async_session_test() as db:
+        delivery = await db.scalar(select(WebhookDelivery))
+    assert delivery.failed_at is not None
+
+
+@pytest.mark.asyncio
+async def test_webhook_api(authenticated_client: AsyncClient, receiver):
+    board_id = (await authenticated_client.post("/api/boards", json={"name": "Hook API"})).json()["id"]
+
+    response = await authenticated_client.post(
+        f"/api/boards/{board_id}/webhooks", json={"url": receiver.url, "events": ["feedback.voted"]}
+    )
+    assert response.status_code == 201
+    created = response.json()
+    assert len(created["secret"]) == 64
+
+    response = await authenticated_client.post(f"/api/boards/{board_id}/webhooks", json={"url": "not a url"})
+    assert response.status_code == 422
+
+    listed = (await authenticated_client.get(f"/api/boards/{board_id}/webhooks")).json()
+    assert [(hook["id"], hook["events"], hook["pending"]) for hook in listed] == [
+        (created["id"], ["feedback.voted"], 0)
+    ]
+    assert "secret" not in listed[0]
+
+    response = await authenticated_client.delete(f"/api/boards/{board_id}/webhooks/{created['id']}")
+    assert response.status_code == 204
+    assert (await authenticated_client.get(f"/api/boards/{board_id}/webhooks")).json() == []
+    response = await authenticated_client.delete(f"/api/boards/{board_id}/webhooks/{created['id']}")
+    assert response.status_code == 404
@@ -0,0 +1,145 @@
+import uuid
+
+import pytest
+from httpx import AsyncClient
+
+from app.models.feedback import FeedbackStatus
+from app.services.board import create_board
+from app.services.feedback import create_feedback, update_feedback_status
+from app.services.merge import merge_feedback
+from app.services.widget import cached_feed
+
+
+async def _board(db, *titles: str):
+    board = await create_board(db, "Widget", "", "#0EA5E9", "owner")
+    items = [await create_feedback(db, board.id, title, "", "feature", "a@example.com", "T") for title in titles]
+    await db.commit()
+    return board, items
+
+
+async def _vote(client: AsyncClient, board, item_id: str, voter_id: str):
+    return await client.post(f"/b/{board.slug}/widget/vote/{item_id}", json={"voter_id": voter_id})
+
+
+@pytest.mark.asyncio
+async def test_feed_is_compact_and_cacheable(client: AsyncClient, db_session):
+    board, (first, second) = await _board(db_session, "First", "Second")
+    await _vote(client, board, second.id, str(uuid.uuid4()))
+
+    response = await client.get(f"/b/{board.slug}/widget.json")
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == "*"
+    assert "stale-while-revalidate=" in response.headers["cache-control"]
+    data = response.json()
+    assert data["board"]["slug"] == board.slug
+    assert data["counts"] == {"items": 2, "votes": 1, "statuses": {"open": 2}}
+    assert [(item["title"], item["votes"]) for item in data["items"]] == [("Second", 1), ("First", 0)]
+    assert "a@example.com" not in response.text
+
+    etag = response.headers["etag"]
+    assert cached_feed(board.slug).etag == etag
+    response = await client.get(f"/b/{board.slug}/widget.json", headers={"If-None-Match": f"W/{etag}"})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+@pytest.mark.asyncio
+async def test_feed_etag_changes_with_the_board(client: AsyncClient, db_session):
+    board, (item,) = await _board(db_session, "Only")
+    etag = (await client.get(f"/b/{board.slug}/widget.json")).headers["etag"]
+
+    await update_feedback_status(db_session, item, FeedbackStatus.PLANNED)
+    await db_session.commit()
+    assert cached_feed(board.slug) is None
+
+    response = await client.get(f"/b/{board.slug}/widget.json", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["items"][0]["status"] == "planned"
+
+
+@pytest.mark.asyncio
+async def test_widget_vote_toggles(client: AsyncClient, db_session):
+    board, (target, dup) = await _board(db_session, "Target", "Dup")
+    await merge_feedback(db_session, target.id, [dup.id])
+    await db_session.commit()
+    voter = str(uuid.uuid4())
+
+    preflight = await client.options(
+        f"/b/{board.slug}/widget/vote/{target.id}",
+        headers={"Origin": "https://app.example.com", "Access-Control-Request-Method": "POST"},
+    )
+    assert preflight.status_code == 204
+    assert preflight.headers["access-control-allow-headers"] == "Content-Type, Idempotency-Key"
+
+    response = await _vote(client, board, target.id, voter)
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == "*"
+    assert response.json() == {"id": target.id, "voted": True, "votes": 1}
+    assert "set-cookie" not in response.headers
+
+    # Votes on a merged stub land on the target
+    assert (await _vote(client, board, dup.id, voter)).json() == {"id": target.id, "voted": False, "votes": 0}
+
+    assert (await _vote(client, board, target.id, "not-a-uuid")).status_code == 422
+    assert (await _vote(client, board, "missing", voter)).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_widget_script_and_unknown_board(client: AsyncClient):
+    response = await client.get("/widget.js")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/javascript")
+    assert "data-feedbackcue-board" in response.text
+    response = await client.get("/widget.js", headers={"If-None-Match": response.headers["etag"]})
+    assert response.status_code == 304
+
+    assert (await client.get("/b/no-such-board/widget.json")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_batch_votes_are_idempotent(client: AsyncClient, db_session):
+    board, (first, second, dup) = await _board(db_session, "First", "Second", "Dup")
+    await merge_feedback(db_session, second.id, [dup.id])
+    await db_session.commit()
+    voter = str(uuid.uuid4())
+    batch = {
+        "voter_id": voter,
+        "votes": [
+            {"item_id": first.id, "voted": True},
+            {"item_id": dup.id, "voted": True},
+            {"item_id": "missing", "voted": True},
+        ],
+    }
+
+    for _ in range(2):  # a retried batch changes nothing
+        response = await client.post(f"/b/{board.slug}/widget/votes", json=batch)
+        assert response.status_code == 200
+        assert response.headers["access-control-allow-origin"] == "*"
+        assert response.json() == {
+            "votes": [
+                {"item_id": first.id, "id": first.id, "voted": True, "votes": 1},
+                {"item_id": dup.id, "id": second.id, "voted": True, "votes": 1},
+            ],
+            "not_found": ["missing"],
+        }
+
+    response = await client.post(
+        f"/b/{board.slug}/widget/votes",
+        json={"voter_id": voter, "votes": [{"item_id": first.id, "voted": False}, {"item_id": second.id, "voted": True}]},
+    )
+    assert response.json()["votes"] == [
+        {"item_id": first.id, "id": first.id, "voted": False, "votes": 0},
+        {"item_id": second.id, "id": second.id, "voted": True, "votes": 1},
+    ]
+    feed = (await client.get(f"/b/{board.slug}/widget.json")).json()
+    assert feed["counts"]["votes"] == 1
+
+    # Votes only count on the board they were sent to
+    other, _ = await _board(db_session, "Elsewhere")
+    response = await client.post(
+        f"/b/{other.slug}/widget/votes", json={"voter_id": voter, "votes": [{"item_id": first.id, "voted": True}]}
+    )
+    assert response.json() == {"votes": [], "not_found": [first.id]}
+    assert (await client.post(f"/b/{board.slug}/widget/votes", json={"voter_id": voter, "votes": []})).status_code == 422